@@ -0,0 +1,419 @@
+"""
+Local HTTP/JSON query service over the review store.
+
+Serves the numbers the dashboard shows (movie metadata, sentiment counts,
+trend series, top movies, the most positive and negative movies, review pages
+and search) from the same ReviewStore the Streamlit pages use, so consumers do
+not have to scrape the UI. Runs offline against the files in the working
+directory, like the pages.
+
+Every response body is JSON-encoded once and kept in an in-process LRU cache
+keyed by the request path and query string. The cache is tied to the data
+version (the size and mtime of the source files): when a file is replaced,
+the next request reopens the store (rebuilding it if needed) and starts an
+empty cache. Each HTTP/1.1 keep-alive connection is served by its own thread
+(ThreadingHTTPServer), and each thread gets its own SQLite connection.
+
+    python API/QueryAPI.py --port 8765
+
+    GET /health
+    GET /movies?limit=50&offset=0
+    GET /movies/<id>
+    GET /movies/<id>/sentiment
+    GET /movies/<id>/series?grain=year
+    GET /movies/<id>/reviews?order=date&descending=1&limit=10&after=<cursor>
+    GET /top?by=user_score&limit=10
+    GET /extremes
+    GET /genres
+    GET /search?q=<terms>&movie=<id>&label=Positive&limit=50
+"""
+import argparse
+import base64
+import binascii
+import json
+import math
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "streamlit"))
+sys.path.insert(0, os.path.join(REPO_ROOT, "Pipeline"))
+
+import Tracing  # noqa: E402
+from review_store import (MOVIES_SOURCES, RANKABLE_COLUMNS, REVIEWS_SOURCES, SERIES_GRAINS,  # noqa: E402
+                          first_existing, open_review_store)
+
+# ------------------- CONFIG -------------------
+
+HOST = "127.0.0.1"
+PORT = 8765
+CACHE_SIZE = 4096               # Cached responses
+VERSION_CHECK_INTERVAL = 1.0    # Seconds between checks of the source files
+MAX_LIMIT = 500                 # Largest page a client can ask for
+
+# ----------------------------------------------
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def encode_cursor(cursor):
+    """An opaque, URL-safe token for a review_page cursor (None stays None)."""
+    if cursor is None:
+        return None
+    return base64.urlsafe_b64encode(json.dumps(list(cursor)).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token, order):
+    """The review_page cursor in a token from encode_cursor(); ValueError if it is not one."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(str(e))
+    if order == 'date' and len(values) == 1:
+        return (int(values[0]),)
+    if order == 'score' and len(values) == 2:
+        return (float(values[0]), int(values[1]))
+    raise ValueError(f"not a {order} cursor")
+
+
+def data_version():
+    """(mtime_ns, size) of the source files; changes whenever one is replaced."""
+    signature = []
+    for path in (first_existing(REVIEWS_SOURCES), first_existing(MOVIES_SOURCES)):
+        try:
+            stat = os.stat(path)
+        except (OSError, TypeError):
+            signature.append(None)
+        else:
+            signature.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def _json_default(value):
+    if isinstance(value, pd.Timestamp):
+        return value.date().isoformat() if value == value.normalize() else value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _clean(value):
+    # NaN is not valid JSON
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if value is pd.NaT:
+        return None
+    return value
+
+
+def records(df):
+    """DataFrame rows as JSON-ready dicts, with missing values as null."""
+    return [{key: _clean(value) for key, value in row.items()} for row in df.to_dict('records')]
+
+
+class ResponseCache:
+    """Thread-safe LRU of encoded response bodies, emptied when the data version changes."""
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            body = self.entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key, body):
+        with self.lock:
+            self.entries[key] = body
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses}
+
+
+class QueryService:
+    """The store, its response cache and the route handlers, reloaded together on a new data version."""
+
+    def __init__(self, cache_size=CACHE_SIZE):
+        self.cache = ResponseCache(cache_size)
+        self.lock = threading.Lock()
+        self.store = None
+        self.version = None
+        self.checked = 0.0
+        self.routes = [
+            (re.compile(r"^/health$"), self.health),
+            (re.compile(r"^/movies$"), self.movies),
+            (re.compile(r"^/movies/([^/]+)$"), self.movie),
+            (re.compile(r"^/movies/([^/]+)/sentiment$"), self.movie_sentiment),
+            (re.compile(r"^/movies/([^/]+)/series$"), self.movie_series),
+            (re.compile(r"^/movies/([^/]+)/reviews$"), self.movie_reviews),
+            (re.compile(r"^/top$"), self.top),
+            (re.compile(r"^/extremes$"), self.extremes),
+            (re.compile(r"^/genres$"), self.genres),
+            (re.compile(r"^/search$"), self.search),
+        ]
+        self.refresh(force=True)
+
+    # === Data version ===
+
+    def refresh(self, force=False):
+        """Reopen the store and drop every cached response if a source file changed."""
+        now = time.monotonic()
+        if not force and now - self.checked < VERSION_CHECK_INTERVAL:
+            return
+        with self.lock:
+            self.checked = now
+            version = data_version()
+            if force or version != self.version:
+                if None in version:
+                    raise FileNotFoundError("Reviews or movie info not found in the working directory")
+                self.store = open_review_store()
+                self.version = version
+                self.cache.clear()
+                print(f"✅ Loaded data version {version}")
+
+    # === Requests ===
+
+    def handle(self, target):
+        """
+        Answer one GET request.
+        Args:
+            target (str): Request path including the query string
+        Returns:
+            tuple: (HTTP status, encoded JSON body, whether the cache answered)
+        """
+        self.refresh()
+        version = self.version
+        body = self.cache.get(target)
+        if body is not None:
+            return 200, body, True
+
+        url = urlsplit(target)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        for pattern, handler in self.routes:
+            match = pattern.match(url.path)
+            if match:
+                break
+        else:
+            return 404, self.encode({'error': f"Unknown endpoint {url.path}"}), False
+
+        try:
+            # Only uncached requests reach the store, so only they are traced
+            with Tracing.span(handler.__name__, category="api") as span:
+                payload = handler(*match.groups(), params=params)
+                span.add(1)
+        except ApiError as e:
+            return e.status, self.encode({'error': str(e)}), False
+        body = self.encode(payload)
+        # A response computed from the previous store must not outlive the reload
+        if handler != self.health and version == self.version:
+            self.cache.put(target, body)
+        return 200, body, False
+
+    @staticmethod
+    def encode(payload):
+        return json.dumps(payload, default=_json_default, separators=(',', ':')).encode('utf-8')
+
+    # === Parameters ===
+
+    @staticmethod
+    def int_param(params, name, default, minimum=1, maximum=MAX_LIMIT):
+        try:
+            value = int(params.get(name, default))
+        except ValueError:
+            raise ApiError(400, f"{name} must be an integer")
+        if value < minimum or value > maximum:
+            raise ApiError(400, f"{name} must be between {minimum} and {maximum}")
+        return value
+
+    def require_movie(self, movie_id):
+        movie = self.store.movie(movie_id)
+        if movie is None:
+            raise ApiError(404, f"Unknown movie {movie_id}")
+        return movie
+
+    # === Endpoints ===
+
+    def health(self, params):
+        return {'status': 'ok', 'version': self.version, 'cache': self.cache.stats()}
+
+    def movies(self, params):
+        limit = self.int_param(params, 'limit', 50)
+        offset = self.int_param(params, 'offset', 0, minimum=0, maximum=sys.maxsize)
+        df = self.store.query(
+            "SELECT id, title, release_year, user_score, revenue FROM movies ORDER BY rowid LIMIT ? OFFSET ?",
+            (limit, offset)
+        )
+        return {'total': self.store.movie_count(), 'offset': offset, 'movies': records(df)}
+
+    def movie(self, movie_id, params):
+        return {key: _clean(value) for key, value in self.require_movie(movie_id).items()}
+
+    def movie_sentiment(self, movie_id, params):
+        self.require_movie(movie_id)
+        df = self.store.query(
+            "SELECT sentiment_label, n, score_sum / n AS mean_score FROM movie_sentiment WHERE id = ?",
+            (movie_id,)
+        )
+        total = int(df['n'].sum())
+        mean = float((df['n'] * df['mean_score']).sum() / total) if total else None
+        return {'id': movie_id, 'reviews': total, 'mean_score': mean, 'labels': records(df)}
+
+    def movie_series(self, movie_id, params):
+        self.require_movie(movie_id)
+        grain = params.get('grain', 'year')
+        if grain not in SERIES_GRAINS:
+            raise ApiError(400, f"grain must be one of {', '.join(SERIES_GRAINS)}")
+        df = self.store.sentiment_series(movie_id, grain)
+        df['mean'] = df['score_sum'] / df['n'].where(df['n'] > 0)
+        return {'id': movie_id, 'grain': grain, 'series': records(df[['period', 'n', 'mean']])}
+
+    def movie_reviews(self, movie_id, params):
+        self.require_movie(movie_id)
+        order = params.get('order', 'date')
+        if order not in ('date', 'score'):
+            raise ApiError(400, "order must be date or score")
+        descending = params.get('descending', '0') in ('1', 'true')
+        limit = self.int_param(params, 'limit', 10)
+        after = None
+        if params.get('after'):
+            # Cursors are the "next" value of the previous page
+            try:
+                after = decode_cursor(params['after'], order)
+            except (ValueError, TypeError):
+                raise ApiError(400, "after must be a cursor returned by the previous page")
+        page, cursor = self.store.review_page(movie_id, order, descending, after, limit)
+        return {
+            'id': movie_id,
+            'reviews': records(page),
+            'next': encode_cursor(cursor),
+        }
+
+    def top(self, params):
+        by = params.get('by', 'user_score')
+        if by not in RANKABLE_COLUMNS:
+            raise ApiError(400, f"by must be one of {', '.join(RANKABLE_COLUMNS)}")
+        limit = self.int_param(params, 'limit', 10)
+        df = self.store.top_movies(by, limit, ['id', 'title', by])
+        return {'by': by, 'movies': records(df)}
+
+    def extremes(self, params):
+        result = {}
+        for label, key in (('Positive', 'most_positive'), ('Negative', 'most_negative')):
+            top = self.store.top_label_movie(label)
+            if top is None:
+                result[key] = None
+                continue
+            movie_id, n_reviews = top
+            movie = self.store.movie(movie_id)
+            sample = self.store.first_review(movie_id, label)
+            result[key] = {
+                'id': movie_id,
+                'title': movie['title'],
+                'director': movie['director'],
+                'reviews': n_reviews,
+                'sample_review': sample['review'] if sample else None,
+            }
+        return result
+
+    def genres(self, params):
+        return {'genres': records(self.store.genres()), 'sentiment': records(self.store.genre_sentiment())}
+
+    def search(self, params):
+        text = params.get('q', '')
+        if not text.strip():
+            raise ApiError(400, "q is required")
+        labels = params.get('label')
+        df = self.store.search_reviews(
+            text, movie_id=params.get('movie'), sentiment_labels=labels.split(',') if labels else None,
+            start=params.get('start'), end=params.get('end'), limit=self.int_param(params, 'limit', 50)
+        )
+        return {'q': text, 'reviews': records(df)}
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, so a client reuses its connection
+    disable_nagle_algorithm = True  # Headers and body go out as two writes; do not wait for an ACK between them
+    service = None
+
+    def do_GET(self):
+        try:
+            status, body, cached = self.service.handle(self.path)
+        except Exception as e:
+            status, body, cached = 500, QueryService.encode({'error': str(e)}), False
+            print(f"❌ {self.path}: {e}")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-Cache", "hit" if cached else "miss")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # One line per request would cost more than serving a cached response
+
+
+def make_server(host=HOST, port=PORT, cache_size=CACHE_SIZE):
+    """
+    Create the HTTP server (not yet serving).
+    Args:
+        host (str): Interface to bind
+        port (int): Port to bind (0 picks a free one)
+        cache_size (int): Number of cached responses
+    Returns:
+        ThreadingHTTPServer: Server whose handler answers from a QueryService
+    """
+    handler = type("BoundQueryHandler", (QueryHandler,), {'service': QueryService(cache_size)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--cache-size", type=int, default=CACHE_SIZE)
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.cache_size)
+    print(f"✅ Serving on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,13 @@
+import os
+import sys
 import requests
 import pandas as pd
 import time
 import re
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Pipeline"))
+import Tracing  # noqa: E402
+
 API_KEY = ''  # <-- Replace with your actual TMDB API key
 SEARCH_URL = 'https://api.themoviedb.org/3/search/movie'
 DETAILS_URL = 'https://api.themoviedb.org/3/movie/{}'
@@ -66,29 +71,44 @@ def get_movie_info(title, year):
     return {
         'title': title + f" ({year})" if year else title,
         'poster_url': IMAGE_BASE_URL + movie['poster_path'] if movie.get('poster_path') else None,
-        'genres': [genre['name'] for genre in details.get('genres', [])],
+        'genres': '|'.join(genre['name'] for genre in details.get('genres', [])),  # e.g. "Drama|Romance"
         'release_year': details.get('release_date', '')[:4],
         'runtime': details.get('runtime', ''),
         'director': director,
         'user_score': details.get('vote_average', None),          # TMDB user score
         'original_language': details.get('original_language', ''), # Original language ISO code
-        'overview': details.get('overview', '')                    # Movie summary/description
+        'overview': details.get('overview', ''),                   # Movie summary/description
+        'revenue': details.get('revenue') or None                  # Worldwide box office in USD (0 = unknown)
     }
 
-# Fetch info for all movies
-data = []
-for raw_title in raw_movies:
-    try:
-        title, year = extract_title_year(raw_title)
-        info = get_movie_info(title, year)
-        data.append(info)
-        print(f"✅ Retrieved: {raw_title}")
-        time.sleep(0.3)  # polite pause to avoid hitting rate limits
-    except Exception as e:
-        print(f"❌ Error with {raw_title}: {str(e)}")
-        data.append({'title': raw_title, 'error': str(e)})
-
-# Save to CSV
-df = pd.DataFrame(data)
-df.to_csv("movie_info_1.csv", index=False)
-print("✅ Movie data retrieval complete. CSV file saved as 'movie_info_1.csv'.")
+def fetch_all_movies(movie_titles):
+    """Fetch TMDB info for every 'Title (Year)' string, one row per movie."""
+    data = []
+    for raw_title in movie_titles:
+        try:
+            title, year = extract_title_year(raw_title)
+            with Tracing.span("tmdb request", category="io", movie=raw_title) as span:
+                info = get_movie_info(title, year)
+                span.add(1)
+            data.append(info)
+            print(f"✅ Retrieved: {raw_title}")
+            with Tracing.span("rate limit wait", category="wait"):
+                time.sleep(0.3)  # polite pause to avoid hitting rate limits
+        except Exception as e:
+            print(f"❌ Error with {raw_title}: {str(e)}")
+            data.append({'title': raw_title, 'error': str(e)})
+    return data
+
+def main(output_csv="movie_info_1.csv"):
+    # Fetch info for all movies
+    df = pd.DataFrame(fetch_all_movies(raw_movies))
+    # Movie ids are the 1-based position in raw_movies; reviews are joined on them
+    df['id'] = range(1, len(df) + 1)
+
+    # Save to CSV
+    with Tracing.span("csv write", category="io"):
+        df.to_csv(output_csv, index=False)
+    print(f"✅ Movie data retrieval complete. CSV file saved as '{output_csv}'.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import ast
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Pipeline"))
+import Tracing  # noqa: E402
+
+# ------------------- CONFIG -------------------
+
+ROW_GROUP_SIZE = 256_000        # Reviews per Parquet row group
+COMPRESSION = "zstd"
+
+# ----------------------------------------------
+
+
+def parse_genres(value):
+    """
+    Turn the "Drama|Romance" genres written by TMDB_API.py into a real list
+    (older files hold a stringified list instead).
+    """
+    if isinstance(value, list):
+        return value
+    if not isinstance(value, str) or not value.strip():
+        return []
+    if not value.startswith('['):
+        return [genre.strip() for genre in value.split('|') if genre.strip()]
+    try:
+        genres = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return []
+    return [str(genre) for genre in genres] if isinstance(genres, (list, tuple)) else []
+
+
+def compact_reviews(df):
+    """
+    Convert analyzed reviews to compact dtypes.
+    Categorical id/title/label, float32 scores and native timestamps,
+    sorted by movie and date so one movie's reviews share row groups.
+    """
+    df = df.copy()
+    df['id'] = df['id'].astype(str).astype('category')
+    df['title'] = df['title'].astype('category')
+    df['sentiment_label'] = df['sentiment_label'].astype('category')
+    df['sentiment_score'] = pd.to_numeric(df['sentiment_score'], errors='coerce').astype('float32')
+    df['date'] = pd.to_datetime(df['date'], errors='coerce', format='mixed')
+    return df.sort_values(['id', 'date'], kind='stable').reset_index(drop=True)
+
+
+def compact_movie_info(df):
+    """Convert movie metadata to compact dtypes with a list-typed genres column."""
+    df = df.copy()
+    df['id'] = df['id'].astype(str).astype('category')
+    df['title'] = df['title'].str.strip().astype('category')
+    df['genres'] = df['genres'].apply(parse_genres)
+    df['release_year'] = pd.to_numeric(df['release_year'], errors='coerce').astype('Int16')
+    df['runtime'] = pd.to_numeric(df['runtime'], errors='coerce').astype('Int16')
+    df['user_score'] = pd.to_numeric(df['user_score'], errors='coerce').astype('float32')
+    if 'revenue' in df:
+        df['revenue'] = pd.to_numeric(df['revenue'], errors='coerce').astype('Int64')
+    df['original_language'] = df['original_language'].astype('category')
+    return df
+
+
+def export_columnar(reviews_csv, movie_info_csv, reviews_parquet, movie_info_parquet):
+    """
+    Write Parquet copies of the analyzed reviews and movie info.
+    Args:
+        reviews_csv (str): analyzed_reviews_with_id.csv
+        movie_info_csv (str): movie_info_1.csv
+        reviews_parquet (str): Output path for the reviews
+        movie_info_parquet (str): Output path for the movie info
+    """
+    with Tracing.span("csv read", category="io"):
+        reviews = pd.read_csv(reviews_csv)
+    with Tracing.span("compact reviews") as span:
+        reviews = compact_reviews(reviews)
+        span.add(len(reviews))
+    with Tracing.span("parquet write", category="io"):
+        reviews.to_parquet(reviews_parquet, engine='pyarrow', compression=COMPRESSION,
+                           index=False, row_group_size=ROW_GROUP_SIZE)
+    print(f"✅ Saved {len(reviews)} reviews to {reviews_parquet}")
+
+    with Tracing.span("movie info"):
+        movies = compact_movie_info(pd.read_csv(movie_info_csv))
+        movies.to_parquet(movie_info_parquet, engine='pyarrow', compression=COMPRESSION, index=False)
+    print(f"✅ Saved {len(movies)} movies to {movie_info_parquet}")
+
+
+if __name__ == "__main__":
+    export_columnar(
+        reviews_csv="analyzed_reviews_with_id.csv",
+        movie_info_csv="movie_info_1.csv",
+        reviews_parquet="analyzed_reviews_with_id.parquet",
+        movie_info_parquet="movie_info_1.parquet"
+    )
@@ -1,41 +1,46 @@
-import pandas as pd
-from nltk.sentiment.vader import SentimentIntensityAnalyzer
-import nltk
+import os
+import sys
 
+import pandas as pd
 
-nltk.download('vader_lexicon')
+from SentimentScorers import DEFAULT_BACKEND, DEFAULT_BATCH_SIZE, get_scorer
 
-def classify_sentiment(score):
-    if score >= 0.05:
-        return 'Positive'
-    elif score <= -0.05:
-        return 'Negative'
-    else:
-        return 'Neutral'
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Pipeline"))
+import Tracing  # noqa: E402
 
-def analyze_sentiments(input_csv, output_csv):
-    df = pd.read_csv(input_csv)
-    analyzer = SentimentIntensityAnalyzer()
 
-    results = []
+def analyze_sentiments(input_csv, output_csv, backend=DEFAULT_BACKEND, batch_size=DEFAULT_BATCH_SIZE):
+    with Tracing.span("csv read", category="io"):
+        df = pd.read_csv(input_csv)
+    with Tracing.span("load scorer", backend=backend):
+        scorer = get_scorer(backend, batch_size=batch_size)
 
+    movies = []
+    rows = []
+    reviews = []
     for movie in df.columns:
-        for review in df[movie].dropna():
-            score = analyzer.polarity_scores(str(review))['compound']
-            label = classify_sentiment(score)
-            results.append({
-                'movie': movie,
-                'review': review,
-                'sentiment_score': score,
-                'sentiment_label': label
-            })
-
-    result_df = pd.DataFrame(results)
-    result_df.to_csv(output_csv, index=False, encoding='utf-8')
+        for row, review in df[movie].dropna().items():
+            movies.append(movie)
+            rows.append(row)
+            reviews.append(review)
+
+    with Tracing.span("sentiment scoring", backend=backend) as span:
+        scores = scorer.score(reviews)
+        span.add(len(reviews))
+
+    result_df = pd.DataFrame({
+        'movie': movies,
+        'row': rows,  # Row of the review in the input file, used to join its date
+        'review': reviews,
+        'sentiment_score': scores,
+        'sentiment_label': [scorer.classify(score) for score in scores]
+    })
+    with Tracing.span("csv write", category="io"):
+        result_df.to_csv(output_csv, index=False, encoding='utf-8')
     print(f"Sentiment results saved to {output_csv}")
 
 
-if _name_ == "_main_":
+if __name__ == "__main__":
     analyze_sentiments(
         input_csv="C:/Users/User/Desktop/scrape/emptyscrapingsira3.csv",
         output_csv="C:/Users/User/Desktop/scrape/sentisira1.csv"
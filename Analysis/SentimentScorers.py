@@ -0,0 +1,158 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# ------------------- CONFIG -------------------
+
+DEFAULT_BACKEND = "vader"
+DEFAULT_BATCH_SIZE = 256
+POSITIVE_THRESHOLD = 0.05
+NEGATIVE_THRESHOLD = -0.05
+TRANSFORMER_MODEL = "distilbert-base-uncased-finetuned-sst-2-english"
+
+# ----------------------------------------------
+
+
+def classify_sentiment(score, positive_threshold=POSITIVE_THRESHOLD, negative_threshold=NEGATIVE_THRESHOLD):
+    if score >= positive_threshold:
+        return 'Positive'
+    elif score <= negative_threshold:
+        return 'Negative'
+    else:
+        return 'Neutral'
+
+
+def load_vader():
+    """Create a VADER analyzer, downloading the lexicon only if it is missing."""
+    import nltk
+    from nltk.sentiment.vader import SentimentIntensityAnalyzer
+
+    try:
+        nltk.data.find('sentiment/vader_lexicon.zip')
+    except LookupError:
+        nltk.download('vader_lexicon')
+    return SentimentIntensityAnalyzer()
+
+
+class SentimentScorer:
+    """
+    Base class for sentiment backends.
+    Subclasses implement score_batch(), returning one score in [-1, 1] per text.
+    """
+    name = None
+    positive_threshold = POSITIVE_THRESHOLD
+    negative_threshold = NEGATIVE_THRESHOLD
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE):
+        self.batch_size = batch_size
+
+    def score_batch(self, texts):
+        raise NotImplementedError
+
+    def batches(self, texts):
+        """Yield the input texts in lists of at most batch_size."""
+        texts = [str(text) for text in texts]
+        for start in range(0, len(texts), self.batch_size):
+            yield texts[start:start + self.batch_size]
+
+    def score(self, texts):
+        """Score every text, batch by batch."""
+        scores = []
+        for batch in self.batches(texts):
+            scores.extend(self.score_batch(batch))
+        return scores
+
+    def classify(self, score):
+        return classify_sentiment(score, self.positive_threshold, self.negative_threshold)
+
+
+class VaderScorer(SentimentScorer):
+    """NLTK VADER compound score, one review at a time (the original backend)."""
+    name = "vader"
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE):
+        super().__init__(batch_size)
+        self.analyzer = load_vader()
+
+    def score_batch(self, texts):
+        return [self.analyzer.polarity_scores(text)['compound'] for text in texts]
+
+
+class LexiconScorer(SentimentScorer):
+    """
+    Vectorized VADER-lexicon scorer.
+    Sums word valences for a whole batch with one lookup and one bincount,
+    then normalizes the sum the same way VADER builds its compound score.
+    Skips VADER's negation, booster and punctuation rules, so labels differ
+    slightly from the VADER backend.
+    """
+    name = "lexicon"
+    TOKEN_PATTERN = re.compile(r"[\w']+")
+    ALPHA = 15  # VADER's compound normalization constant
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE):
+        super().__init__(batch_size)
+        self.lexicon = pd.Series(load_vader().lexicon, dtype='float64')
+
+    def score_batch(self, texts):
+        tokens = [self.TOKEN_PATTERN.findall(text.lower()) for text in texts]
+        lengths = np.fromiter((len(t) for t in tokens), dtype=np.int64, count=len(tokens))
+        flat = pd.Series([token for review in tokens for token in review], dtype='object')
+
+        valences = flat.map(self.lexicon).fillna(0.0).to_numpy()
+        owners = np.repeat(np.arange(len(texts)), lengths)
+        sums = np.bincount(owners, weights=valences, minlength=len(texts))
+
+        return (sums / np.sqrt(sums * sums + self.ALPHA)).tolist()
+
+
+class TransformerScorer(SentimentScorer):
+    """
+    Local CPU transformer classifier (requires the optional `transformers` and `torch` packages).
+    The score is the signed probability of the predicted class.
+    """
+    name = "transformer"
+    # Model confidences rarely fall near zero, so use a wider neutral band
+    positive_threshold = 0.5
+    negative_threshold = -0.5
+
+    def __init__(self, batch_size=32, model=TRANSFORMER_MODEL):
+        super().__init__(batch_size)
+        try:
+            from transformers import pipeline
+        except ImportError as e:
+            raise ImportError("The transformer backend needs `pip install transformers torch`") from e
+
+        self.pipeline = pipeline("sentiment-analysis", model=model, device=-1)
+
+    def score_batch(self, texts):
+        predictions = self.pipeline(texts, batch_size=self.batch_size, truncation=True)
+        return [
+            p['score'] if p['label'].upper().startswith('POS') else -p['score']
+            for p in predictions
+        ]
+
+
+SCORERS = {
+    VaderScorer.name: VaderScorer,
+    LexiconScorer.name: LexiconScorer,
+    TransformerScorer.name: TransformerScorer,
+}
+
+
+def get_scorer(backend=DEFAULT_BACKEND, **kwargs):
+    """
+    Build a scorer by backend name.
+    Args:
+        backend (str): One of SCORERS ('vader', 'lexicon', 'transformer')
+        **kwargs: Passed to the scorer, e.g. batch_size
+    Returns:
+        SentimentScorer: Ready-to-use scorer
+    """
+    try:
+        scorer_cls = SCORERS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown sentiment backend '{backend}'. Choose from: {', '.join(SCORERS)}")
+    return scorer_cls(**kwargs)
+
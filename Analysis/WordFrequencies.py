@@ -0,0 +1,122 @@
+import os
+import re
+import sys
+from collections import Counter, defaultdict
+
+import pandas as pd
+from wordcloud import WordCloud, STOPWORDS
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Pipeline"))
+import Tracing  # noqa: E402
+
+# ------------------- CONFIG -------------------
+
+MAX_WORDS = 200                 # Same cap WordCloud applies by default
+CHUNK_SIZE = 50_000             # Reviews read per CSV chunk
+CLOUD_SIZES = [(600, 400)]      # (width, height) pairs the dashboard renders
+
+# ----------------------------------------------
+
+# Same token pattern WordCloud uses internally, so clouds look the same
+TOKEN_PATTERN = re.compile(r"\w[\w']+")
+
+
+def tokenize(text, stopwords=STOPWORDS):
+    """
+    Split a cleaned review into lowercase word tokens.
+    Drops stopwords, pure numbers and trailing possessives like WordCloud does.
+    """
+    if not isinstance(text, str):
+        return []
+
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        if token.endswith("'s"):
+            token = token[:-2]
+        if token in stopwords or token.isdigit():
+            continue
+        tokens.append(token)
+    return tokens
+
+
+def build_word_frequencies(reviews_csv, output_csv, max_words=MAX_WORDS, chunk_size=CHUNK_SIZE):
+    """
+    Build a per-movie term-frequency table from the analyzed reviews.
+    Args:
+        reviews_csv (str): CSV with 'id' and 'review' columns
+        output_csv (str): Where to save the long-format (id, word, count) table
+        max_words (int): Most frequent words kept per movie
+        chunk_size (int): Number of reviews read per chunk
+    Returns:
+        pd.DataFrame: The saved frequency table
+    """
+    counters = defaultdict(Counter)
+
+    with Tracing.span("count words") as span:
+        for chunk in pd.read_csv(reviews_csv, usecols=['id', 'review'], chunksize=chunk_size):
+            for movie_id, review in zip(chunk['id'].astype(str), chunk['review']):
+                counters[movie_id].update(tokenize(review))
+            span.add(len(chunk))
+
+    rows = []
+    for movie_id, counter in counters.items():
+        for word, count in counter.most_common(max_words):
+            rows.append({'id': movie_id, 'word': word, 'count': count})
+
+    freq_df = pd.DataFrame(rows, columns=['id', 'word', 'count'])
+    with Tracing.span("csv write", category="io"):
+        freq_df.to_csv(output_csv, index=False, encoding='utf-8')
+    print(f"✅ Saved word frequencies for {len(counters)} movies to {output_csv}")
+    return freq_df
+
+
+def load_word_frequencies(freq_csv):
+    """Load the frequency table as {movie_id: {word: count}}."""
+    freq_df = pd.read_csv(freq_csv, dtype={'id': str, 'word': str})
+    return {
+        movie_id: dict(zip(group['word'], group['count']))
+        for movie_id, group in freq_df.groupby('id', sort=False)
+    }
+
+
+def wordcloud_cache_path(cache_dir, movie_id, width, height):
+    """Path of the cached cloud image for a movie rendered at a given size."""
+    return os.path.join(cache_dir, f"{movie_id}_{width}x{height}.png")
+
+
+def render_wordcloud(frequencies, width, height):
+    """Render a word cloud image straight from a {word: count} mapping."""
+    return WordCloud(width=width, height=height, background_color='white').generate_from_frequencies(frequencies)
+
+
+def prerender_wordclouds(freq_csv, cache_dir, sizes=CLOUD_SIZES):
+    """
+    Render and cache a cloud image for every movie at every configured size.
+    Images that already exist in the cache are left untouched.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    frequencies = load_word_frequencies(freq_csv)
+
+    rendered = 0
+    for movie_id, movie_freqs in frequencies.items():
+        if not movie_freqs:
+            continue
+        for width, height in sizes:
+            path = wordcloud_cache_path(cache_dir, movie_id, width, height)
+            if os.path.exists(path):
+                continue
+            with Tracing.span("render word cloud", movie=movie_id) as span:
+                render_wordcloud(movie_freqs, width, height).to_file(path)
+                span.add(1)
+            rendered += 1
+
+    print(f"✅ Rendered {rendered} word cloud images into {cache_dir}")
+
+
+if __name__ == "__main__":
+    REVIEWS_CSV = "analyzed_reviews_with_id.csv"
+    FREQ_CSV = "word_frequencies.csv"
+    CACHE_DIR = "wordcloud_cache"
+
+    build_word_frequencies(REVIEWS_CSV, FREQ_CSV)
+    prerender_wordclouds(FREQ_CSV, CACHE_DIR)
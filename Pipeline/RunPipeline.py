@@ -0,0 +1,373 @@
+"""
+End-to-end pipeline runner.
+
+Declares every step from scraping to the dashboard-ready files as a stage with
+input and output files, derives the dependency graph from them and runs the
+stages in dependency order, independent stages concurrently.
+
+A stage is skipped when the hash of its code, its input files and its
+parameters matches the last successful run and its outputs are unchanged.
+Outputs that already exist the first time a stage is seen are adopted
+rather than rebuilt; use --force to rebuild them.
+
+    python Pipeline/RunPipeline.py                          # bring everything up to date
+    python Pipeline/RunPipeline.py --targets review_store   # only what review_store needs
+    python Pipeline/RunPipeline.py --force sentiment        # rerun sentiment and whatever changes downstream
+    python Pipeline/RunPipeline.py --trace trace.json --profile   # timeline, summary table and hot functions
+"""
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import Tracing
+
+# ------------------- CONFIG -------------------
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(REPO_ROOT, "data")
+MANIFEST_FILE = ".pipeline_manifest.json"
+MAX_WORKERS = 4
+
+MOVIES_CSV = "Movies.csv"                  # One column per movie (review scraper)
+MOVIE_LIST_CSV = "MovieList.csv"           # One movie per row (date scraper)
+RAW_REVIEWS_CSV = "all_reviews.csv"
+RAW_DATES_CSV = "all_dates.csv"
+CLEAN_REVIEWS_CSV = "CleanedReviews.csv"
+CLEAN_DATES_CSV = "CleanedDates.csv"
+DEDUPED_REVIEWS_CSV = "DedupedReviews.csv"
+DUPLICATES_CSV = "ReviewDuplicates.csv"
+SENTIMENT_CSV = "SentimentReviews.csv"
+MOVIE_INFO_CSV = "movie_info_1.csv"
+REVIEWS_CSV = "analyzed_reviews_with_id.csv"
+MOVIE_INFO_PARQUET = "movie_info_1.parquet"
+REVIEWS_PARQUET = "analyzed_reviews_with_id.parquet"
+WORD_FREQ_CSV = "word_frequencies.csv"
+WORDCLOUD_DIR = "wordcloud_cache"
+REVIEW_DB = "reviews.db"
+TEXT_STORE_PREFIX = "reviews_text"
+BITMAP_PREFIX = "reviews_bitmaps"
+
+# ----------------------------------------------
+
+
+class PipelineError(Exception):
+    pass
+
+
+def data_path(name):
+    return os.path.join(DATA_DIR, name)
+
+
+class Stage:
+    """
+    One pipeline step.
+    Args:
+        name (str): Stage name used on the command line and in the manifest
+        module (str): Repo-relative path of the script that implements it
+        run (callable): Called with the loaded module to do the work
+        inputs (list): Data files the stage reads
+        outputs (list): Data files (or directories) the stage writes
+        code (list): Extra repo-relative source files that affect the result
+        params (dict): Settings that affect the result, part of the hash
+    """
+
+    def __init__(self, name, module, run, inputs=(), outputs=(), code=(), params=None):
+        self.name = name
+        self.module = module
+        self.run = run
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.code = [module] + list(code)
+        self.params = params or {}
+
+
+STAGES = [
+    Stage("scrape_reviews", "Scraping/LetterboxdScraper.py",
+          lambda m: m.main(data_path(MOVIES_CSV), data_path(RAW_REVIEWS_CSV)),
+          inputs=[MOVIES_CSV], outputs=[RAW_REVIEWS_CSV]),
+    Stage("scrape_dates", "Scraping/ReviewDatesScrapper.py",
+          lambda m: m.main(data_path(MOVIE_LIST_CSV), data_path(RAW_DATES_CSV)),
+          inputs=[MOVIE_LIST_CSV], outputs=[RAW_DATES_CSV]),
+    Stage("tmdb", "API/TMDB_API.py",
+          lambda m: m.main(data_path(MOVIE_INFO_CSV)),
+          outputs=[MOVIE_INFO_CSV]),
+    Stage("preprocess_reviews", "Preprocessing/ReviewPreprocessor.py",
+          lambda m: m.main(data_path(RAW_REVIEWS_CSV), data_path(CLEAN_REVIEWS_CSV)),
+          inputs=[RAW_REVIEWS_CSV], outputs=[CLEAN_REVIEWS_CSV]),
+    Stage("preprocess_dates", "Preprocessing/DatePreprocessor.py",
+          lambda m: m.process_movie_dates(data_path(RAW_DATES_CSV), data_path(CLEAN_DATES_CSV)),
+          inputs=[RAW_DATES_CSV], outputs=[CLEAN_DATES_CSV]),
+    Stage("dedup", "Preprocessing/NearDuplicates.py",
+          lambda m: m.deduplicate_reviews(data_path(CLEAN_REVIEWS_CSV), data_path(DEDUPED_REVIEWS_CSV),
+                                          data_path(DUPLICATES_CSV)),
+          inputs=[CLEAN_REVIEWS_CSV], outputs=[DEDUPED_REVIEWS_CSV, DUPLICATES_CSV]),
+    Stage("sentiment", "Analysis/Sentiment Analysis.py",
+          lambda m: m.analyze_sentiments(data_path(DEDUPED_REVIEWS_CSV), data_path(SENTIMENT_CSV)),
+          inputs=[DEDUPED_REVIEWS_CSV], outputs=[SENTIMENT_CSV], code=["Analysis/SentimentScorers.py"]),
+    Stage("join", "Preprocessing/ReviewJoiner.py",
+          lambda m: m.join_reviews(data_path(SENTIMENT_CSV), data_path(CLEAN_DATES_CSV),
+                                   data_path(MOVIE_INFO_CSV), data_path(REVIEWS_CSV)),
+          inputs=[SENTIMENT_CSV, CLEAN_DATES_CSV, MOVIE_INFO_CSV], outputs=[REVIEWS_CSV]),
+    Stage("columnar", "Analysis/ColumnarExport.py",
+          lambda m: m.export_columnar(data_path(REVIEWS_CSV), data_path(MOVIE_INFO_CSV),
+                                      data_path(REVIEWS_PARQUET), data_path(MOVIE_INFO_PARQUET)),
+          inputs=[REVIEWS_CSV, MOVIE_INFO_CSV], outputs=[REVIEWS_PARQUET, MOVIE_INFO_PARQUET]),
+    Stage("word_frequencies", "Analysis/WordFrequencies.py",
+          lambda m: (m.build_word_frequencies(data_path(REVIEWS_CSV), data_path(WORD_FREQ_CSV)),
+                     m.prerender_wordclouds(data_path(WORD_FREQ_CSV), data_path(WORDCLOUD_DIR))),
+          inputs=[REVIEWS_CSV], outputs=[WORD_FREQ_CSV, WORDCLOUD_DIR]),
+    Stage("review_store", "streamlit/review_store.py",
+          lambda m: m.build_review_store(data_path(REVIEWS_PARQUET), data_path(MOVIE_INFO_PARQUET),
+                                         data_path(REVIEW_DB), data_path(TEXT_STORE_PREFIX),
+                                         data_path(BITMAP_PREFIX)),
+          inputs=[REVIEWS_PARQUET, MOVIE_INFO_PARQUET],
+          outputs=[REVIEW_DB, f"{TEXT_STORE_PREFIX}.bin", f"{TEXT_STORE_PREFIX}.offsets.npy",
+                   f"{TEXT_STORE_PREFIX}.movies.json", f"{BITMAP_PREFIX}.npy", f"{BITMAP_PREFIX}.json"],
+          code=["streamlit/review_text_store.py", "streamlit/review_bitmaps.py"]),
+]
+
+
+# === Hashing ===
+
+class Manifest:
+    """
+    Record of the last successful run of each stage plus a digest cache,
+    so unchanged files (same size and mtime) are not re-hashed on every run.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.data = {"stages": {}, "files": {}}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.data = json.load(f)
+
+    def file_digest(self, path):
+        if os.path.isdir(path):
+            # Directories of generated files: names, sizes and mtimes are enough
+            h = hashlib.sha256()
+            for entry in sorted(os.scandir(path), key=lambda e: e.name):
+                st = entry.stat()
+                h.update(f"{entry.name}:{st.st_size}:{st.st_mtime_ns};".encode())
+            return h.hexdigest()
+
+        st = os.stat(path)
+        with self.lock:
+            cached = self.data["files"].get(path)
+        if cached and cached["size"] == st.st_size and cached["mtime_ns"] == st.st_mtime_ns:
+            return cached["sha256"]
+
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        digest = h.hexdigest()
+        with self.lock:
+            self.data["files"][path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+        return digest
+
+    def stage_key(self, stage):
+        """Hash of the stage's code, parameters and input contents."""
+        h = hashlib.sha256(stage.name.encode())
+        for source in stage.code:
+            h.update(source.encode())
+            h.update(self.file_digest(os.path.join(REPO_ROOT, source)).encode())
+        h.update(json.dumps(stage.params, sort_keys=True).encode())
+        for name in stage.inputs:
+            h.update(name.encode())
+            h.update(self.file_digest(data_path(name)).encode())
+        return h.hexdigest()
+
+    def output_digests(self, stage):
+        return {name: self.file_digest(data_path(name)) for name in stage.outputs}
+
+    def get(self, stage):
+        with self.lock:
+            return self.data["stages"].get(stage.name)
+
+    def record(self, stage, key):
+        outputs = self.output_digests(stage)
+        with self.lock:
+            self.data["stages"][stage.name] = {"key": key, "outputs": outputs, "finished": time.time()}
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.data, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+
+# === Execution ===
+
+_module_lock = threading.Lock()
+_modules = {}
+
+
+def load_module(relative_path):
+    """Import a stage script by path (several have spaces or live in plain folders)."""
+    with _module_lock:
+        if relative_path in _modules:
+            return _modules[relative_path]
+        path = os.path.join(REPO_ROOT, relative_path)
+        folder = os.path.dirname(path)
+        if folder not in sys.path:
+            sys.path.insert(0, folder)
+        name = re.sub(r"\W", "_", os.path.splitext(os.path.basename(path))[0])
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _modules[relative_path] = module
+        return module
+
+
+def build_graph(stages):
+    """Map each stage name to the names of the stages that produce its inputs."""
+    producers = {}
+    for stage in stages:
+        for output in stage.outputs:
+            if output in producers:
+                raise PipelineError(f"'{output}' is produced by both {producers[output]} and {stage.name}")
+            producers[output] = stage.name
+    return {stage.name: {producers[i] for i in stage.inputs if i in producers} for stage in stages}
+
+
+def select_stages(stages, graph, targets):
+    """The target stages plus everything upstream of them."""
+    if not targets:
+        return stages
+    by_name = {stage.name: stage for stage in stages}
+    unknown = set(targets) - set(by_name)
+    if unknown:
+        raise PipelineError(f"Unknown stage(s): {', '.join(sorted(unknown))}")
+
+    needed = set()
+    pending = list(targets)
+    while pending:
+        name = pending.pop()
+        if name not in needed:
+            needed.add(name)
+            pending.extend(graph[name])
+    return [stage for stage in stages if stage.name in needed]
+
+
+def execute_stage(stage, manifest, force):
+    """Run one stage if it is out of date. Returns a short status string."""
+    outputs_exist = all(os.path.exists(data_path(name)) for name in stage.outputs)
+    missing_inputs = [name for name in stage.inputs if not os.path.exists(data_path(name))]
+    if missing_inputs:
+        # Nothing to rebuild from; downstream stages work from whatever outputs exist
+        if outputs_exist:
+            return "kept (inputs unavailable)"
+        return f"unavailable (missing {', '.join(missing_inputs)})"
+
+    key = manifest.stage_key(stage)
+    recorded = manifest.get(stage)
+    if outputs_exist and not force:
+        if recorded is None:
+            manifest.record(stage, key)
+            return "adopted existing outputs"
+        if recorded["key"] == key and recorded["outputs"] == manifest.output_digests(stage):
+            return "up to date"
+
+    start = time.perf_counter()
+    with Tracing.span(stage.name, category="pipeline"):
+        with Tracing.span("import", category="io"):
+            module = load_module(stage.module)
+        stage.run(module)
+    missing_outputs = [name for name in stage.outputs if not os.path.exists(data_path(name))]
+    if missing_outputs:
+        raise PipelineError(f"{stage.name} did not write: {', '.join(missing_outputs)}")
+
+    manifest.record(stage, key)
+    return f"ran in {time.perf_counter() - start:.1f}s"
+
+
+def run_pipeline(targets=None, force=(), max_workers=MAX_WORKERS, stages=STAGES):
+    """
+    Run the selected stages in dependency order.
+    Args:
+        targets (list): Stage names to bring up to date (default: all)
+        force (set): Stage names to rerun even if up to date ('all' for every stage)
+        max_workers (int): Stages allowed to run at the same time
+    Returns:
+        dict: Status of every selected stage
+    """
+    graph = build_graph(stages)
+    selected = select_stages(stages, graph, targets)
+    manifest = Manifest(data_path(MANIFEST_FILE))
+
+    selected_names = {stage.name for stage in selected}
+    pending = {stage.name: stage for stage in selected}
+    status = {}
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while pending or running:
+            for name, stage in list(pending.items()):
+                deps = graph[name] & selected_names
+                if any(status.get(dep, "").startswith(("failed", "skipped")) for dep in deps):
+                    status[name] = "skipped (upstream failed)"
+                    del pending[name]
+                elif all(dep in status for dep in deps):
+                    print(f"▶️ {name}")
+                    stage_forced = "all" in force or name in force
+                    running[pool.submit(execute_stage, stage, manifest, stage_forced)] = name
+                    del pending[name]
+
+            if not running:
+                if pending:
+                    raise PipelineError(f"Dependency cycle between: {', '.join(pending)}")
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    status[name] = future.result()
+                    print(f"✅ {name}: {status[name]}")
+                except Exception as e:
+                    status[name] = f"failed: {e}"
+                    print(f"❌ {name}: {e}")
+
+    return status
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--targets", nargs="+", help="Stages to bring up to date (default: all)")
+    parser.add_argument("--force", nargs="+", default=[], help="Stages to rerun regardless of hashes, or 'all'")
+    parser.add_argument("--jobs", type=int, default=MAX_WORKERS, help="Stages to run concurrently")
+    parser.add_argument("--list", action="store_true", help="Show the stages and their dependencies")
+    parser.add_argument("--trace", metavar="PATH", help="Record stage spans and save a Chrome trace to PATH")
+    parser.add_argument("--profile", action="store_true", help="Also run the sampling profiler")
+    args = parser.parse_args()
+
+    if args.list:
+        graph = build_graph(STAGES)
+        for stage in STAGES:
+            deps = ", ".join(sorted(graph[stage.name])) or "-"
+            print(f"{stage.name:20} after: {deps}")
+        return
+
+    if args.trace:
+        Tracing.enable()
+    if args.profile:
+        Tracing.start_profiler()
+    try:
+        status = run_pipeline(args.targets, set(args.force), args.jobs)
+    finally:
+        Tracing.finish(args.trace or Tracing.TRACE_PATH)
+    print("\n=== Pipeline summary ===")
+    for name, result in status.items():
+        print(f"{name:20} {result}")
+    if any(result.startswith(("failed", "skipped")) for result in status.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
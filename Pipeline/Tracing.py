@@ -0,0 +1,356 @@
+"""
+Tracing and sampling-profiler hooks shared by the batch scripts.
+
+Scraping, preprocessing, analysis and the API scripts wrap their phases in
+spans. Spans nest per thread, record how many items (reviews, pages, requests)
+they processed, and add up into a per-stage summary of calls, total and self
+time, items and items per second. The whole run can be exported as a Chrome
+trace (open it in chrome://tracing or https://ui.perfetto.dev) to see the
+timeline, including stages running side by side.
+
+Tracing is off unless it is enabled, by RunPipeline.py --trace or by setting
+MOVIEVIZ_TRACE to the trace file path when running a script on its own. When
+off, span() returns one shared no-op span, so instrumented code costs a
+function call per span and nothing else.
+
+The sampling profiler shows where the time goes inside a span (langdetect,
+ftfy, VADER, ...). Start it with RunPipeline.py --profile or MOVIEVIZ_PROFILE=1,
+or attach it to a run already in progress by sending the process SIGUSR1
+(a second SIGUSR1 stops it); the handler is installed when this module is
+imported, so this works on runs started without any tracing option. It samples
+the Python stack of every thread inside a span, prefixed with that thread's
+open spans, and writes them in the folded format read by flamegraph.pl and
+speedscope: next to the trace, or to PROFILE_PATH when there is no trace file.
+
+    with Tracing.span("translate", movie=movie) as span:
+        for review in reviews:
+            ...
+            span.add(1)
+"""
+import atexit
+import collections
+import json
+import os
+import signal
+import sys
+import threading
+import time
+
+# ------------------- CONFIG -------------------
+
+TRACE_PATH = os.environ.get("MOVIEVIZ_TRACE")
+PROFILE = os.environ.get("MOVIEVIZ_PROFILE", "") not in ("", "0")
+SAMPLE_INTERVAL = 0.005     # Seconds between profiler samples
+MAX_EVENTS = 500_000        # Timeline events kept; spans past this only count towards the summary
+TOP_FUNCTIONS = 15          # Rows of the profiler's function table
+PROFILE_PATH = "profile.folded"  # Folded samples of runs without a trace file
+
+# ----------------------------------------------
+
+_enabled = False
+_lock = threading.Lock()
+_epoch = time.perf_counter()
+_events = []
+_dropped = 0
+_stats = {}                 # span path -> [calls, seconds, child seconds, items]
+_stacks = {}                # thread id -> open spans, read by the profiler
+_profiler = None
+_finished = False
+
+
+class _NoOpSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def add(self, items=1):
+        pass
+
+
+_NO_OP = _NoOpSpan()
+
+
+class Span:
+    """One timed region; use span() rather than creating it directly."""
+
+    def __init__(self, name, category, args):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.items = 0
+        self.child_seconds = 0.0
+
+    def add(self, items=1):
+        """Count items processed in this span, for its throughput."""
+        self.items += items
+
+    def __enter__(self):
+        self.thread = threading.get_ident()
+        stack = _stacks.setdefault(self.thread, [])
+        self.parent = stack[-1] if stack else None
+        self.path = (self.parent.path if self.parent else ()) + (self.name,)
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self.start
+        _stacks[self.thread].pop()
+        if self.parent is not None:
+            self.parent.child_seconds += seconds
+
+        global _dropped
+        with _lock:
+            stats = _stats.setdefault(self.path, [0, 0.0, 0.0, 0])
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] += self.child_seconds
+            stats[3] += self.items
+            if len(_events) < MAX_EVENTS:
+                args = dict(self.args)
+                if self.items:
+                    args['items'] = self.items
+                _events.append({
+                    'name': self.name, 'cat': self.category, 'ph': 'X',
+                    'ts': round((self.start - _epoch) * 1e6, 1), 'dur': round(seconds * 1e6, 1),
+                    'pid': os.getpid(), 'tid': self.thread, 'args': args,
+                })
+            else:
+                _dropped += 1
+        return False
+
+
+def enabled():
+    return _enabled
+
+
+def span(name, category="stage", **args):
+    """
+    Time a block of code.
+    Args:
+        name (str): Span name; nested spans are summarized under their parent
+        category (str): Chrome trace category, e.g. "stage", "io" or "wait"
+        **args: Extra values shown with the span in the trace viewer
+    Returns:
+        Span: Context manager; call .add(n) on it to count processed items
+    """
+    if not _enabled:
+        return _NO_OP
+    return Span(name, category, args)
+
+
+def traced(name=None, category="stage"):
+    """Decorator form of span(), named after the function by default."""
+    def decorate(function):
+        def wrapper(*args, **kwargs):
+            with span(name or function.__name__, category):
+                return function(*args, **kwargs)
+        wrapper.__name__ = function.__name__
+        wrapper.__doc__ = function.__doc__
+        return wrapper
+    return decorate
+
+
+# === Sampling profiler ===
+
+class SamplingProfiler:
+    """
+    Samples the Python stack of every thread that is inside a span, from a
+    background thread.
+    Each sample is prefixed with the thread's open spans, so the folded output
+    shows which stage a hot function was called from.
+    With all_threads, threads outside any span are sampled too: spans opened
+    before tracing was switched on are no-ops, so a profiler attached to an
+    untraced run would otherwise miss the work already in progress.
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL, all_threads=False):
+        self.interval = interval
+        self.all_threads = all_threads
+        self.samples = collections.Counter()
+        self.started = None
+        self.seconds = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop.clear()
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self.seconds += time.perf_counter() - self.started
+            self._thread = None
+
+    def running(self):
+        return self._thread is not None
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread, frame in sys._current_frames().items():
+                spans = [f"[{s.name}]" for s in list(_stacks.get(thread, ()))]
+                # Threads outside any span are idle here (pool workers, the main thread waiting on them)
+                if thread == own or not (spans or self.all_threads):
+                    continue
+                frames = []
+                while frame is not None:
+                    code = frame.f_code
+                    frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                self.samples[tuple(spans + frames[::-1])] += 1
+
+    def write_folded(self, path):
+        """Write samples as 'frame;frame;frame count' lines (flamegraph.pl, speedscope)."""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{';'.join(frame.replace(';', ':') for frame in stack)} {count}\n")
+
+    def top_functions(self, limit=TOP_FUNCTIONS):
+        """(function, self samples, total samples) of the functions seen most often."""
+        own, total = collections.Counter(), collections.Counter()
+        for stack, count in self.samples.items():
+            frames = [frame for frame in stack if not frame.startswith("[")]
+            if frames:
+                own[frames[-1]] += count
+            for frame in set(frames):
+                total[frame] += count
+        return [(frame, count, total[frame]) for frame, count in own.most_common(limit)]
+
+
+def start_profiler(interval=SAMPLE_INTERVAL, all_threads=False):
+    """Start sampling (enables tracing too, so samples carry span names)."""
+    global _profiler
+    if not _enabled:
+        enable()
+    if _profiler is None:
+        _profiler = SamplingProfiler(interval, all_threads)
+    if not _profiler.running():
+        _profiler.start()
+        print(f"🔬 Sampling profiler started (every {interval * 1000:.0f} ms)")
+    return _profiler
+
+
+def stop_profiler():
+    if _profiler is not None and _profiler.running():
+        _profiler.stop()
+        print(f"🔬 Sampling profiler stopped ({sum(_profiler.samples.values())} samples)")
+
+
+def _toggle_profiler(signum, frame):
+    if _profiler is not None and _profiler.running():
+        stop_profiler()
+        return
+    if not _enabled:
+        # Attached to a run started without tracing: report when the process ends
+        atexit.register(finish)
+        start_profiler(all_threads=True)
+    else:
+        start_profiler()
+
+
+# === Output ===
+
+def enable():
+    """Start recording spans."""
+    global _enabled
+    _enabled = True
+
+
+def export_chrome_trace(path):
+    """
+    Write the recorded spans as a Chrome trace (JSON object format).
+    Args:
+        path (str): Output file, e.g. trace.json
+    """
+    with _lock:
+        events = list(_events)
+    threads = {thread.ident: thread.name for thread in threading.enumerate()}
+    for tid in {event['tid'] for event in events}:
+        events.append({'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid,
+                       'args': {'name': threads.get(tid, f"thread {tid}")}})
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+    os.replace(tmp_path, path)
+    print(f"✅ Trace with {len(events)} events saved to {path}")
+    if _dropped:
+        print(f"⚠️ {_dropped} spans past MAX_EVENTS were left out of the timeline (they are in the summary)")
+
+
+def summary_rows():
+    """
+    Per-span totals, parents before their children.
+    Returns:
+        list: dicts with span, depth, calls, total_s, self_s, items and items_per_s
+    """
+    with _lock:
+        stats = {path: list(values) for path, values in _stats.items()}
+    rows = []
+    for path in sorted(stats):
+        calls, seconds, child_seconds, items = stats[path]
+        rows.append({
+            'span': path[-1], 'depth': len(path) - 1, 'calls': calls,
+            'total_s': seconds, 'self_s': max(seconds - child_seconds, 0.0), 'items': items,
+            'items_per_s': items / seconds if items and seconds else None,
+        })
+    return rows
+
+
+def summary_table():
+    """The summary as aligned text, with the profiler's hottest functions if it ran."""
+    rows = summary_rows()
+    wall = sum(row['total_s'] for row in rows if row['depth'] == 0) or 1.0
+    lines = [f"{'span':40} {'calls':>8} {'total s':>10} {'self s':>10} {'% top':>6} {'items':>10} {'items/s':>10}"]
+    for row in rows:
+        name = "  " * row['depth'] + row['span']
+        rate = f"{row['items_per_s']:10.1f}" if row['items_per_s'] is not None else f"{'':>10}"
+        lines.append(f"{name[:40]:40} {row['calls']:8d} {row['total_s']:10.3f} {row['self_s']:10.3f} "
+                     f"{row['total_s'] / wall * 100:6.1f} {row['items'] or '':>10} {rate}")
+
+    if _profiler is not None and _profiler.samples:
+        n = sum(_profiler.samples.values())
+        lines.append(f"\nHottest functions ({n} samples over {_profiler.seconds:.1f}s)")
+        lines.append(f"{'self %':>7} {'total %':>8}  function")
+        for frame, own, total in _profiler.top_functions():
+            lines.append(f"{own / n * 100:7.1f} {total / n * 100:8.1f}  {frame}")
+    return "\n".join(lines)
+
+
+def finish(trace_path=TRACE_PATH):
+    """
+    Stop the profiler, print the summary and write the trace (and the folded
+    profiler samples next to it).
+    Args:
+        trace_path (str): Chrome trace output path (None: summary, plus the
+            profiler samples in PROFILE_PATH if it ran)
+    """
+    global _finished
+    if not _enabled or _finished:
+        return
+    _finished = True
+    stop_profiler()
+    print("\n=== Trace summary ===")
+    print(summary_table())
+    if trace_path:
+        export_chrome_trace(trace_path)
+    if _profiler is not None and _profiler.samples:
+        folded_path = f"{os.path.splitext(trace_path)[0]}.folded" if trace_path else PROFILE_PATH
+        _profiler.write_folded(folded_path)
+        print(f"✅ Profiler samples saved to {folded_path}")
+
+
+if hasattr(signal, "SIGUSR1") and threading.current_thread() is threading.main_thread():
+    signal.signal(signal.SIGUSR1, _toggle_profiler)
+
+if TRACE_PATH or PROFILE:
+    enable()
+    if PROFILE:
+        start_profiler()
+    atexit.register(finish)
@@ -1,7 +1,12 @@
+import os
+import sys
 import pandas as pd
 import re
 from datetime import datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Pipeline"))
+import Tracing  # noqa: E402
+
 def clean_date(date_str):
     """
     Clean and standardize date strings with various formats.
@@ -72,19 +77,23 @@ def process_movie_dates(input_file, output_file):
     """
     # Read the input CSV
     try:
-        df = pd.read_csv(input_file)
+        with Tracing.span("csv read", category="io"):
+            df = pd.read_csv(input_file)
     except Exception as e:
         print(f"Error reading input file: {e}")
         return
     
     # Clean each date in each column
     cleaned_df = df.copy()
-    for column in cleaned_df.columns:
-        cleaned_df[column] = cleaned_df[column].apply(clean_date)
+    with Tracing.span("clean dates") as span:
+        for column in cleaned_df.columns:
+            cleaned_df[column] = cleaned_df[column].apply(clean_date)
+        span.add(int(df.count().sum()))
     
     # Save the cleaned data
     try:
-        cleaned_df.to_csv(output_file, index=False)
+        with Tracing.span("csv write", category="io"):
+            cleaned_df.to_csv(output_file, index=False)
         print(f"Successfully processed and saved to {output_file}")
     except Exception as e:
         print(f"Error saving output file: {e}")
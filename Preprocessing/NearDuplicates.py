@@ -0,0 +1,296 @@
+"""
+Near-duplicate review detection with MinHash and locality-sensitive hashing.
+
+Copy-pasted and lightly edited reviews are common on Letterboxd. The scraper
+only drops exact repeats within one movie. This stage finds reviews whose
+word shingles overlap by at least THRESHOLD (estimated Jaccard similarity)
+anywhere in the corpus. It keeps the first copy of each group as the
+canonical one and blanks the others, so sentiment scoring skips them and
+they do not skew the charts.
+
+    shingles    every run of SHINGLE_SIZE words of the cleaned text, hashed
+    MinHash     NUM_PERM minimum hash values per review; two reviews agree on a
+                value with probability equal to their Jaccard similarity
+    LSH         the signature is cut into BANDS bands; reviews sharing any band
+                are candidates, checked against the signature estimate
+    groups      candidate pairs above the threshold are merged with a
+                union-find; the earliest review of a group is canonical
+
+All steps are vectorized per batch of reviews, so the cost grows linearly with
+the corpus instead of with the number of review pairs. Reviews shorter than
+MIN_TOKENS words ("great movie") are never marked: identical short reviews
+are usually written independently.
+
+The output keeps the input layout (one column per movie), with duplicates
+emptied so rows still line up with the scraped dates. A report lists every
+review in a group with its canonical copy.
+"""
+import os
+import string
+import sys
+import zlib
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Pipeline"))
+import Tracing  # noqa: E402
+
+# ------------------- CONFIG -------------------
+
+SHINGLE_SIZE = 3            # Words per shingle
+MIN_TOKENS = 5              # Shorter reviews are never treated as duplicates
+NUM_PERM = 64               # MinHash values per review
+BANDS = 16                  # LSH bands (NUM_PERM / BANDS rows each)
+THRESHOLD = 0.8             # Estimated Jaccard similarity for a duplicate
+ACROSS_MOVIES = True        # Also match copies posted under another movie
+BATCH_SIZE = 10_000         # Reviews hashed per batch
+BUCKET_ROUNDS = 4           # Heads tried per LSH bucket (see candidate_pairs)
+SEED = 1
+
+# ----------------------------------------------
+
+# Cleaned text keeps only !, ? and … besides words; splitting on them is far cheaper than a regex
+PUNCTUATION = str.maketrans({char: " " for char in string.punctuation + "…"})
+MIX = np.uint64(0x9E3779B97F4A7C15)
+SHIFT = np.uint64(32)
+
+
+def hash_functions(num_perm=NUM_PERM, seed=SEED):
+    """
+    Coefficients (a, b) of the multiply-shift hash functions (a * x + b) >> 32,
+    computed modulo 2**64 (odd a), which need no division.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    b = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64)
+    return a, b
+
+
+def shingle_hashes(texts, shingle_size=SHINGLE_SIZE, min_tokens=MIN_TOKENS):
+    """
+    Hash the word shingles of a batch of texts.
+    Args:
+        texts (list): Review texts (non-strings count as empty)
+        shingle_size (int): Words per shingle
+        min_tokens (int): Texts with fewer words get no shingles
+    Returns:
+        tuple: (64-bit shingle hashes, number of shingles per text)
+    """
+    tokens = [text.lower().translate(PUNCTUATION).split() if isinstance(text, str) else [] for text in texts]
+    lengths = np.fromiter((len(t) if len(t) >= min_tokens else 0 for t in tokens), dtype=np.int64, count=len(texts))
+    flat = [token for review, n in zip(tokens, lengths) if n for token in review]
+    if not flat:
+        return np.zeros(0, dtype=np.uint64), np.zeros(len(texts), dtype=np.int64)
+
+    # Each distinct word is hashed once per batch
+    codes, vocabulary = pd.factorize(pd.Series(flat, dtype=object))
+    word_hashes = np.fromiter((zlib.crc32(word.encode('utf-8')) for word in vocabulary),
+                              dtype=np.uint64, count=len(vocabulary))[codes]
+
+    # A shingle starts at every word with at least shingle_size - 1 words after it in the same review
+    counts = np.maximum(lengths - shingle_size + 1, 0)
+    ends = np.cumsum(lengths)
+    starts = np.repeat(ends - lengths, counts) + (np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts))
+    hashes = word_hashes[starts]
+    for offset in range(1, shingle_size):
+        hashes = hashes * MIX + word_hashes[starts + offset]  # Wraps modulo 2**64
+    hashes ^= hashes >> SHIFT
+    return hashes, counts
+
+
+def minhash_signatures(texts, num_perm=NUM_PERM, batch_size=BATCH_SIZE, seed=SEED):
+    """
+    MinHash signature of every text.
+    Args:
+        texts (list): Review texts
+        num_perm (int): Values per signature
+        batch_size (int): Texts hashed per batch
+        seed (int): Seed of the hash functions
+    Returns:
+        tuple: (uint32 signatures, one row per text; boolean mask of texts long enough to compare)
+    """
+    a, b = hash_functions(num_perm, seed)
+    signatures = np.zeros((len(texts), num_perm), dtype=np.uint32)
+    valid = np.zeros(len(texts), dtype=bool)
+    for start in range(0, len(texts), batch_size):
+        hashes, counts = shingle_hashes(texts[start:start + batch_size])
+        has_shingles = counts > 0
+        valid[start:start + len(counts)] = has_shingles
+        if not len(hashes):
+            continue
+        offsets = (np.cumsum(counts) - counts)[has_shingles]
+        rows = start + np.flatnonzero(has_shingles)
+        # One hash function at a time, in place: the batch's shingles stay in cache
+        values = np.empty_like(hashes)
+        for i in range(num_perm):
+            np.multiply(hashes, a[i], out=values)
+            values += b[i]
+            values >>= SHIFT
+            signatures[rows, i] = np.minimum.reduceat(values, offsets)
+    return signatures, valid
+
+
+def similarity(signatures, left, right):
+    """Estimated Jaccard similarity of each (left, right) pair of reviews."""
+    return (signatures[left] == signatures[right]).mean(axis=1)
+
+
+def candidate_pairs(signatures, valid, groups=None, bands=BANDS, threshold=THRESHOLD, rounds=BUCKET_ROUNDS):
+    """
+    Pairs of similar reviews found through LSH buckets.
+    Rather than comparing every pair in a bucket (quadratic in its size), each
+    member is compared with the bucket's first member; members that do not
+    match are compared with the first of the rest, for up to `rounds` heads.
+    Matches only need to connect a group, not list all of its pairs.
+    Args:
+        signatures (np.ndarray): MinHash signatures
+        valid (np.ndarray): Reviews to consider
+        groups (np.ndarray): Optional group code per review; pairs never cross groups
+        bands (int): Number of LSH bands
+        threshold (float): Minimum estimated similarity of a pair
+        rounds (int): Bucket heads tried per band
+    Returns:
+        np.ndarray: (n_pairs, 2) review indices
+    """
+    rows_per_band = signatures.shape[1] // bands
+    indices = np.flatnonzero(valid)
+    if len(indices) < 2:
+        return np.zeros((0, 2), dtype=np.int64)  # Nothing to pair (and no buckets to build)
+    multipliers = np.random.default_rng(SEED).integers(1, 1 << 62, size=rows_per_band + 1, dtype=np.uint64) | np.uint64(1)
+    pairs = []
+    for band in range(bands):
+        block = signatures[indices, band * rows_per_band:(band + 1) * rows_per_band].astype(np.uint64)
+        keys = block @ multipliers[:rows_per_band]  # Wraps modulo 2**64; collisions are filtered below
+        if groups is not None:
+            keys ^= groups[indices].astype(np.uint64) * multipliers[-1]
+        order = np.argsort(keys, kind='stable')
+        members, keys = indices[order], keys[order]
+        new_bucket = np.r_[True, keys[1:] != keys[:-1]]
+        bucket = np.cumsum(new_bucket) - 1
+        # Singleton buckets produce no pairs
+        size = np.bincount(bucket)
+        keep = size[bucket] > 1
+        members, bucket = members[keep], bucket[keep]
+
+        for _ in range(rounds):
+            if not len(members):
+                break
+            first = np.r_[True, bucket[1:] != bucket[:-1]]
+            heads = members[first][np.cumsum(first) - 1]
+            matched = similarity(signatures, members, heads) >= threshold
+            found = matched & ~first
+            pairs.append(np.column_stack([heads[found], members[found]]))
+            members, bucket = members[~matched], bucket[~matched]
+    if not pairs:
+        return np.zeros((0, 2), dtype=np.int64)
+    # The same pair is usually found in several bands; dedupe on one int64 key per pair
+    pairs = np.vstack(pairs).astype(np.int64)
+    keys = np.unique(pairs[:, 0] * len(signatures) + pairs[:, 1])
+    return np.column_stack([keys // len(signatures), keys % len(signatures)])
+
+
+def union_find(n, pairs):
+    """
+    Connected components of the pairs, labelled by their smallest member.
+    Vectorized union-find: every node points at the smallest label among its
+    neighbours, then paths are halved by pointer jumping, until nothing changes.
+    Args:
+        n (int): Number of nodes
+        pairs (np.ndarray): (n_pairs, 2) edges
+    Returns:
+        np.ndarray: Canonical (smallest) node of each node's component
+    """
+    parent = np.arange(n)
+    if not len(pairs):
+        return parent
+    left, right = pairs[:, 0], pairs[:, 1]
+    while True:
+        low = np.minimum(parent[left], parent[right])
+        updated = parent.copy()
+        np.minimum.at(updated, parent[left], low)
+        np.minimum.at(updated, parent[right], low)
+        while True:
+            jumped = updated[updated]
+            if np.array_equal(jumped, updated):
+                break
+            updated = jumped
+        if np.array_equal(updated, parent):
+            return parent
+        parent = updated
+
+
+def find_near_duplicates(texts, groups=None, threshold=THRESHOLD, num_perm=NUM_PERM, bands=BANDS):
+    """
+    Canonical copy of every review.
+    Args:
+        texts (list): Cleaned review texts, in corpus order
+        groups (np.ndarray): Optional group code per review (e.g. movie) that copies must share
+        threshold (float): Minimum estimated Jaccard similarity of a duplicate
+        num_perm (int): MinHash values per review
+        bands (int): LSH bands
+    Returns:
+        tuple: (canonical index of each review, which is its own index when it is
+        not a duplicate; estimated similarity of each review to its canonical copy)
+    """
+    with Tracing.span("minhash") as span:
+        signatures, valid = minhash_signatures(texts, num_perm)
+        span.add(len(texts))
+    with Tracing.span("lsh") as span:
+        pairs = candidate_pairs(signatures, valid, groups, bands, threshold)
+        span.add(len(pairs))
+    with Tracing.span("union-find"):
+        canonical = union_find(len(texts), pairs)
+    return canonical, similarity(signatures, np.arange(len(texts)), canonical)
+
+
+def deduplicate_reviews(input_csv, output_csv, report_csv, threshold=THRESHOLD, across_movies=ACROSS_MOVIES):
+    """
+    Blank the near-duplicate reviews of the cleaned review table.
+    Args:
+        input_csv (str): Cleaned reviews, one column per movie
+        output_csv (str): Same table with every duplicate emptied
+        report_csv (str): movie, row, canonical_movie, canonical_row, canonical, similarity
+            for every review that belongs to a group of copies
+        threshold (float): Minimum estimated Jaccard similarity of a duplicate
+        across_movies (bool): Whether a copy posted under another movie counts
+    Returns:
+        pd.DataFrame: The report
+    """
+    with Tracing.span("csv read", category="io"):
+        df = pd.read_csv(input_csv)
+
+    # Reviews in column order, so the canonical copy is the first in the file's movie order
+    long = df.melt(ignore_index=False, var_name='movie', value_name='review').reset_index(names='row')
+    long = long.dropna(subset=['review']).reset_index(drop=True)
+    groups = None if across_movies else pd.factorize(long['movie'])[0]
+    canonical, similarities = find_near_duplicates(long['review'].tolist(), groups, threshold)
+
+    in_group = np.bincount(canonical, minlength=len(long))[canonical] > 1
+    report = pd.DataFrame({
+        'movie': long['movie'],
+        'row': long['row'],
+        'canonical_movie': long['movie'].to_numpy()[canonical],
+        'canonical_row': long['row'].to_numpy()[canonical],
+        'canonical': canonical == np.arange(len(long)),
+        'similarity': similarities.round(3),
+    })[in_group]
+
+    duplicates = report[~report['canonical']]
+    for movie, rows in duplicates.groupby('movie', sort=False)['row']:
+        df.loc[rows.to_numpy(), movie] = None
+
+    with Tracing.span("csv write", category="io"):
+        df.to_csv(output_csv, index=False, encoding='utf-8')
+        report.to_csv(report_csv, index=False, encoding='utf-8')
+    print(f"✅ {len(duplicates)} near-duplicate reviews of {len(long)} removed "
+          f"({report['canonical'].sum()} canonical copies kept), saved to {output_csv}")
+    return report
+
+
+if __name__ == "__main__":
+    deduplicate_reviews(
+        input_csv="CleanedReviews.csv",
+        output_csv="DedupedReviews.csv",
+        report_csv="ReviewDuplicates.csv"
+    )
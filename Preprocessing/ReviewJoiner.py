@@ -0,0 +1,61 @@
+import os
+import re
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Pipeline"))
+import Tracing  # noqa: E402
+
+OUTPUT_COLUMNS = ['title', 'review', 'sentiment_score', 'sentiment_label', 'date', 'id']
+
+
+def normalize_title(title):
+    """
+    Reduce a movie title to a matching key.
+    'Titanic (1997)', 'titanic' and 'Titanic' all become 'titanic'.
+    """
+    title = re.sub(r'\s*\((\d{4}|Unknown)\)\s*$', '', str(title))
+    return re.sub(r'[^a-z0-9]', '', title.lower())
+
+
+def join_reviews(sentiment_csv, dates_csv, movie_info_csv, output_csv):
+    """
+    Attach review dates and TMDB movie ids to the sentiment results.
+    Args:
+        sentiment_csv (str): Output of analyze_sentiments (movie, row, review, score, label)
+        dates_csv (str): Cleaned dates with one column per movie, row-aligned with the reviews
+        movie_info_csv (str): TMDB movie info with an 'id' column
+        output_csv (str): Where to save the dashboard-ready reviews
+    """
+    with Tracing.span("csv read", category="io"):
+        sentiments = pd.read_csv(sentiment_csv)
+        # Dates are stored like the reviews: one column per movie, same row order
+        dates = pd.read_csv(dates_csv)
+    long_dates = dates.melt(ignore_index=False, var_name='movie', value_name='date').reset_index(names='row')
+    joined = sentiments.merge(long_dates, on=['movie', 'row'], how='left')
+
+    movies = pd.read_csv(movie_info_csv, usecols=['title', 'id'])
+    ids = {normalize_title(title): movie_id for title, movie_id in zip(movies['title'], movies['id'])}
+    joined['id'] = joined['movie'].map(lambda movie: ids.get(normalize_title(movie)))
+
+    unmatched = joined.loc[joined['id'].isna(), 'movie'].unique()
+    for movie in unmatched:
+        print(f"⚠️ No movie info found for '{movie}', dropping its reviews")
+    joined = joined.dropna(subset=['id'])
+    joined['id'] = joined['id'].astype(int)
+
+    result_df = joined.rename(columns={'movie': 'title'})[OUTPUT_COLUMNS]
+    with Tracing.span("csv write", category="io") as span:
+        result_df.to_csv(output_csv, index=False, encoding='utf-8')
+        span.add(len(result_df))
+    print(f"✅ Saved {len(result_df)} joined reviews to {output_csv}")
+
+
+if __name__ == "__main__":
+    join_reviews(
+        sentiment_csv="SentimentReviews.csv",
+        dates_csv="CleanedDates.csv",
+        movie_info_csv="movie_info_1.csv",
+        output_csv="analyzed_reviews_with_id.csv"
+    )
@@ -1,3 +1,5 @@
+import os
+import sys
 import pandas as pd
 import ftfy
 from emoji import demojize, emojize
@@ -8,6 +10,9 @@ from langdetect import detect, LangDetectException
 from deep_translator import GoogleTranslator
 import warnings
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Pipeline"))
+import Tracing  # noqa: E402
+
 # Suppress langdetect warnings
 warnings.filterwarnings("ignore", category=UserWarning, module='langdetect')
 
@@ -57,7 +62,8 @@ def translate_to_english(text, source_lang='auto'):
         text_without_emojis = EMOJI_PATTERN.sub('', text)
         
         # Translate only the non-emoji text
-        translated = GoogleTranslator(source=source_lang, target='en').translate(text_without_emojis)
+        with Tracing.span("translate request", category="io"):
+            translated = GoogleTranslator(source=source_lang, target='en').translate(text_without_emojis)
         
         # Combine translated text with original emojis
         result = f"{translated if translated else text_without_emojis} {emojis}".strip()
@@ -163,7 +169,9 @@ def preprocess_reviews_df(df, sentiment_words=None, translate_threshold=0.3):
     cleaner = partial(clean_text, preserve_case_for=sentiment_words)
     
     # First pass: basic cleaning
-    df = df.applymap(fix_encoding_emojis)
+    with Tracing.span("fix encoding") as span:
+        df = df.applymap(fix_encoding_emojis)
+        span.add(int(df.count().sum()))
     
     # Language handling - now always translates non-English reviews
     for movie_col in df.columns:
@@ -172,22 +180,30 @@ def preprocess_reviews_df(df, sentiment_words=None, translate_threshold=0.3):
             continue
             
         # Detect languages
-        languages = reviews.apply(detect_language)
+        with Tracing.span("language detection", movie=movie_col) as span:
+            languages = reviews.apply(detect_language)
+            span.add(len(reviews))
         non_english_pct = (languages != 'en').mean()
         
         if non_english_pct > 0:  # Always translate if non-English exists
             print(f"Translating {movie_col} ({non_english_pct:.1%} non-English)")
-            df[movie_col] = df[movie_col].apply(
-                lambda x: translate_to_english(x) if isinstance(x, str) and detect_language(x) != 'en' else x
-            )
+            with Tracing.span("translation", movie=movie_col) as span:
+                df[movie_col] = df[movie_col].apply(
+                    lambda x: translate_to_english(x) if isinstance(x, str) and detect_language(x) != 'en' else x
+                )
+                span.add(int((languages != 'en').sum()))
             
             # Remove reviews that couldn't be translated (returned None)
-            df[movie_col] = df[movie_col].apply(
-                lambda x: x if x is not None and (not isinstance(x, str) or detect_language(x) == 'en') else None
-            )
+            with Tracing.span("language recheck", movie=movie_col) as span:
+                df[movie_col] = df[movie_col].apply(
+                    lambda x: x if x is not None and (not isinstance(x, str) or detect_language(x) == 'en') else None
+                )
+                span.add(len(reviews))
     
     # Final cleaning pass
-    df = df.applymap(cleaner)
+    with Tracing.span("clean text") as span:
+        df = df.applymap(cleaner)
+        span.add(int(df.count().sum()))
     
     # Remove any rows that are now empty after cleaning
     df = df.dropna(how='all')
@@ -248,18 +264,23 @@ def main(input_csv, output_csv):
     
     # Load data
     print(f"Loading data from {input_csv}...")
-    df = pd.read_csv(input_csv)
+    with Tracing.span("csv read", category="io"):
+        df = pd.read_csv(input_csv)
     
     # Preprocess reviews with language handling
     print("Preprocessing reviews with language detection...")
-    df_clean = preprocess_reviews_df(df, sentiment_words=SENTIMENT_WORDS)
+    with Tracing.span("preprocess") as span:
+        df_clean = preprocess_reviews_df(df, sentiment_words=SENTIMENT_WORDS)
+        span.add(int(df.count().sum()))
     
     # Validate results
     print("Validating cleaned data...")
-    validate_cleanliness(df_clean)
+    with Tracing.span("validate"):
+        validate_cleanliness(df_clean)
     
     # Save results with explicit UTF-8 encoding
-    df_clean.to_csv(output_csv, index=False, encoding='utf-8-sig')
+    with Tracing.span("csv write", category="io"):
+        df_clean.to_csv(output_csv, index=False, encoding='utf-8-sig')
     print(f"Cleaned data saved to {output_csv}")
     
     # Print samples for manual verification
@@ -0,0 +1,251 @@
+"""
+Managed Chrome sessions for the scrapers.
+
+One browser left running for a whole crawl slows down and grows for hours,
+and when it crashes the rest of the movie is lost. DriverManager owns the
+browser instead:
+
+    resource blocking   images, fonts and stylesheets are never downloaded
+                        (URL patterns blocked through the DevTools protocol)
+    recycling           the browser is replaced after MAX_PAGES page loads or
+                        once Chrome's processes use more than MAX_RSS_MB, always
+                        between two pages
+    crash recovery      run() restarts the browser when the session is lost and
+                        calls the task again; tasks keep their progress in a
+                        ScrapeProgress, so a movie resumes from its last
+                        collected page instead of starting over
+
+ScrapeProgress also survives the process: an interrupted run picks the movie
+up where it stopped.
+
+    manager = DriverManager(options)
+    progress = ScrapeProgress("all_reviews.csv.progress.json")
+    state = progress.start(movie)
+    manager.run(lambda: collect(manager, movie, state, progress))   # Pages opened with manager.get()
+    progress.finish(movie)
+    manager.quit()
+"""
+import json
+import os
+import sys
+
+from selenium import webdriver
+from selenium.common.exceptions import InvalidSessionIdException, NoSuchWindowException, WebDriverException
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Pipeline"))
+import Tracing  # noqa: E402
+
+# ------------------- CONFIG -------------------
+
+MAX_PAGES = 50                  # Page loads before the browser is replaced
+MAX_RSS_MB = 1500               # Memory of Chrome and its renderers before the browser is replaced
+MAX_RESTARTS = 3                # Session losses survived per task (one movie) before giving up
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",   # Images
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",                             # Fonts
+    "*.css",                                                                    # Stylesheets
+]
+
+# ----------------------------------------------
+
+# Messages of WebDriverExceptions raised when the browser or its session is gone
+SESSION_LOST_MESSAGES = ("invalid session id", "session deleted", "disconnected", "chrome not reachable",
+                         "tab crashed", "target window already closed", "no such window")
+
+
+def session_lost(error):
+    """Whether an exception means the browser (or chromedriver) is gone, rather than a page problem."""
+    if isinstance(error, (InvalidSessionIdException, NoSuchWindowException, ConnectionError)):
+        return True
+    if isinstance(error, WebDriverException):
+        message = (error.msg or "").lower()
+        return any(text in message for text in SESSION_LOST_MESSAGES)
+    # chromedriver itself died: its HTTP connection is refused (urllib3 wraps the OSError)
+    return type(error).__name__ in ("MaxRetryError", "NewConnectionError", "ProtocolError")
+
+
+def process_tree_rss_mb(pid):
+    """Resident memory of a process and all its descendants (Linux only; None elsewhere)."""
+    try:
+        entries = [entry for entry in os.listdir("/proc") if entry.isdigit()]
+    except OSError:
+        return None
+    children = {}
+    for entry in entries:
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                parent = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue  # The process exited while we were looking
+        children.setdefault(parent, []).append(int(entry))
+
+    total, pending = 0, [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f"/proc/{current}/statm") as f:
+                total += int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except OSError:
+            continue
+        pending.extend(children.get(current, []))
+    return total / 1e6
+
+
+class DriverManager:
+    """
+    A Chrome session that blocks heavy resources, is recycled before it degrades
+    and is restarted when it dies.
+    Args:
+        options (Options): Chrome options used for every browser started
+        max_pages (int): Page loads before recycling
+        max_rss_mb (float): Browser memory before recycling (checked between pages)
+        blocked_patterns (list): URL patterns that are never downloaded
+    """
+
+    def __init__(self, options, max_pages=MAX_PAGES, max_rss_mb=MAX_RSS_MB, blocked_patterns=BLOCKED_URL_PATTERNS):
+        self.options = options
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.blocked_patterns = list(blocked_patterns)
+        self._driver = None
+        self.pages = 0              # Page loads by the current browser
+        self.browsers = 0           # Browsers started so far
+
+    # === Lifecycle ===
+
+    @property
+    def driver(self):
+        """The current browser, started on first use."""
+        if self._driver is None:
+            self._start()
+        return self._driver
+
+    def _start(self):
+        with Tracing.span("driver start", category="io"):
+            driver = webdriver.Chrome(options=self.options)
+            if self.blocked_patterns:
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.blocked_patterns})
+        self._driver = driver
+        self.pages = 0
+        self.browsers += 1
+
+    def quit(self):
+        """Close the browser; a dead one is simply forgotten."""
+        if self._driver is None:
+            return
+        try:
+            self._driver.quit()
+        except Exception:
+            pass
+        self._driver = None
+
+    def restart(self, reason):
+        print(f"♻️ Restarting the browser ({reason})")
+        with Tracing.span("driver restart", category="io", reason=reason):
+            self.quit()
+            self._start()
+
+    def rss_mb(self):
+        """Memory used by chromedriver, Chrome and its renderers (None if unknown)."""
+        if self._driver is None:
+            return None
+        service = getattr(self._driver, "service", None)
+        process = getattr(service, "process", None)
+        return process_tree_rss_mb(process.pid) if process is not None else None
+
+    def recycle_reason(self):
+        """Why the browser should be replaced before the next page, or None."""
+        if self._driver is None:
+            return None
+        if self.max_pages and self.pages >= self.max_pages:
+            return f"{self.pages} pages loaded"
+        rss = self.rss_mb() if self.max_rss_mb else None
+        if rss is not None and rss > self.max_rss_mb:
+            return f"{rss:.0f} MB resident"
+        return None
+
+    # === Navigation ===
+
+    def get(self, url):
+        """
+        Load a page, first replacing the browser if it is due for recycling.
+        Args:
+            url (str): Page to open
+        Returns:
+            WebDriver: The browser now showing the page
+        """
+        reason = self.recycle_reason()
+        if reason:
+            self.restart(reason)
+        driver = self.driver
+        with Tracing.span("page load", category="io"):
+            driver.get(url)
+        self.pages += 1
+        return driver
+
+    def run(self, task, max_restarts=MAX_RESTARTS):
+        """
+        Call task(), restarting the browser and calling it again whenever the
+        session is lost. The task must resume from its own saved progress.
+        Args:
+            task (callable): Work to do with the browser (opens pages with get())
+            max_restarts (int): Restarts before the error is raised
+        Returns:
+            The task's result
+        """
+        restarts = 0
+        while True:
+            try:
+                return task()
+            except Exception as e:
+                if not session_lost(e) or restarts >= max_restarts:
+                    raise
+                restarts += 1
+                detail = (str(e).strip().splitlines() or [type(e).__name__])[0]
+                self.restart(f"session lost: {detail[:80]}")
+
+
+class ScrapeProgress:
+    """
+    Pages and items collected so far for the movies in progress, saved after
+    every page so a crash or restart loses at most the page being read.
+    Args:
+        path (str): JSON checkpoint file (removed once no movie is in progress)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.movies = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.movies = json.load(f)
+
+    def start(self, movie):
+        """The movie's saved state ({'page': last collected page, 'items': [...]}), or a fresh one."""
+        state = self.movies.setdefault(movie, {"page": 0, "items": []})
+        if state["page"]:
+            print(f"⏯️ Resuming {movie} after page {state['page']} ({len(state['items'])} collected)")
+        return state
+
+    def page_done(self, movie, page, new_items):
+        """Record a collected page and its new items."""
+        state = self.movies[movie]
+        state["page"] = page
+        state["items"].extend(new_items)
+        self._save()
+
+    def finish(self, movie):
+        """Forget a movie once its results are saved."""
+        self.movies.pop(movie, None)
+        self._save()
+
+    def _save(self):
+        if not self.movies:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.movies, f)
+        os.replace(tmp_path, self.path)
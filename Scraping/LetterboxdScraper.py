@@ -2,11 +2,15 @@ import pandas as pd
 import time
 import random
 import os
-from selenium import webdriver
+import sys
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import NoSuchElementException
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Pipeline"))
+import Tracing  # noqa: E402
+from DriverManager import DriverManager, ScrapeProgress  # noqa: E402
+
 # ------------------- CONFIG -------------------
 
 REVIEWS_PER_MOVIE = 100
@@ -22,8 +26,8 @@ def init_driver():
     options.add_argument("--headless")
     options.add_argument("--disable-gpu")
     options.add_argument("--log-level=3")
-    driver = webdriver.Chrome(options=options)
-    return driver
+    # Started lazily, recycled and restarted by the manager (see DriverManager.py)
+    return DriverManager(options)
 
 def get_review_elements(driver):
     return driver.find_elements(By.CSS_SELECTOR, 'div.review')
@@ -44,27 +48,50 @@ def extract_review_texts(review_elements, already_collected, movie_name):
             continue
     return reviews
 
-def scroll_and_collect_reviews(driver, reviews_needed, movie_name):
-    collected_reviews = set()
+def scroll_and_collect_reviews(driver, collected_reviews, reviews_needed, movie_name):
+    """Scroll the open page until it shows no new reviews; returns the reviews not collected before."""
+    collected_reviews = set(collected_reviews)
+    page_reviews = []
 
     while len(collected_reviews) < reviews_needed:
-        time.sleep(random.uniform(*WAIT_BETWEEN_REVIEWS))
-
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(random.uniform(*WAIT_BETWEEN_REVIEWS))
-
-        elements = get_review_elements(driver)
-        new_texts = extract_review_texts(elements, collected_reviews, movie_name)
+        with Tracing.span("scroll wait", category="wait"):
+            time.sleep(random.uniform(*WAIT_BETWEEN_REVIEWS))
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            time.sleep(random.uniform(*WAIT_BETWEEN_REVIEWS))
+
+        with Tracing.span("extract reviews") as span:
+            elements = get_review_elements(driver)
+            new_texts = extract_review_texts(elements, collected_reviews, movie_name)
+            span.add(len(new_texts))
         collected_reviews.update(new_texts)
+        page_reviews.extend(new_texts)
 
         if len(new_texts) == 0:
             break  # No more new reviews loaded
 
-    return list(collected_reviews)[:reviews_needed]
-
-def build_review_url(movie_title):
+    return page_reviews
+
+def collect_reviews(manager, movie, state, progress, reviews_needed=REVIEWS_PER_MOVIE):
+    """
+    Read review pages, starting after the last page saved in `state`, until
+    enough reviews are collected or a page has none. Every page is saved to
+    `progress`, so after a browser restart this picks up at the next page.
+    """
+    while len(state['items']) < reviews_needed:
+        page = state['page'] + 1
+        driver = manager.get(build_review_url(movie, page))
+        with Tracing.span("load wait", category="wait"):
+            time.sleep(random.uniform(2, 4))  # Let page load
+        new_texts = scroll_and_collect_reviews(driver, state['items'], reviews_needed, movie)
+        progress.page_done(movie, page, new_texts)
+        if not new_texts:
+            break  # Past the last page of reviews
+    return state['items'][:reviews_needed]
+
+def build_review_url(movie_title, page=1):
     slug = movie_title.lower().replace(' ', '-')
-    return f"https://letterboxd.com/film/{slug}/reviews/by/date/"
+    url = f"https://letterboxd.com/film/{slug}/reviews/by/date/"
+    return url if page == 1 else f"{url}page/{page}/"
 
 def save_reviews_to_master_csv(movie, reviews, output_file=OUTPUT_CSV):
     review_col = pd.Series(reviews, name=movie)
@@ -91,38 +118,43 @@ def already_scraped(movie, output_file=OUTPUT_CSV):
     df = pd.read_csv(output_file, nrows=1)
     return movie in df.columns
 
-def scrape_reviews_for_movie(driver, movie):
-    url = build_review_url(movie)
-    print(f"🎬 Scraping: {movie} → {url}")
-    driver.get(url)
-    time.sleep(random.uniform(2, 4))  # Let page load
-    reviews = scroll_and_collect_reviews(driver, REVIEWS_PER_MOVIE, movie)
+def scrape_reviews_for_movie(manager, movie, progress):
+    print(f"🎬 Scraping: {movie} → {build_review_url(movie)}")
+    state = progress.start(movie)
+    reviews = manager.run(lambda: collect_reviews(manager, movie, state, progress))
     print(f"📝 Collected {len(reviews)} reviews for '{movie}'")
     return reviews
 
-def main():
-    driver = init_driver()
-    movie_list = load_movie_list(MOVIE_CSV)
+def main(movie_csv=MOVIE_CSV, output_csv=OUTPUT_CSV):
+    manager = init_driver()
+    progress = ScrapeProgress(f"{output_csv}.progress.json")  # Lets an interrupted movie resume
+    movie_list = load_movie_list(movie_csv)
 
     your_movies = movie_list[:16]  # You're scraping 18, others will scrape 16
 
     for idx, movie in enumerate(your_movies):
-        if already_scraped(movie):
+        if already_scraped(movie, output_csv):
             print(f"⏩ Already scraped: {movie}")
             continue
 
         try:
-            reviews = scrape_reviews_for_movie(driver, movie)
+            with Tracing.span("movie", movie=movie) as span:
+                reviews = scrape_reviews_for_movie(manager, movie, progress)
+                span.add(len(reviews))
             if reviews:
-                save_reviews_to_master_csv(movie, reviews)
+                with Tracing.span("csv write", category="io"):
+                    save_reviews_to_master_csv(movie, reviews, output_csv)
             else:
                 print(f"⚠️ No reviews found for {movie}")
+            progress.finish(movie)
         except Exception as e:
+            # The pages collected so far stay in the progress file for the next run
             print(f"❌ Error scraping {movie}: {e}")
 
-        time.sleep(random.uniform(*WAIT_BETWEEN_MOVIES))
+        with Tracing.span("movie wait", category="wait"):
+            time.sleep(random.uniform(*WAIT_BETWEEN_MOVIES))
 
-    driver.quit()
+    manager.quit()
     print("\n🎉 Done scraping your 16 movies!")
 
 if __name__ == "__main__":
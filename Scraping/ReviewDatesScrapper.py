@@ -3,13 +3,17 @@ import time
 import random
 import os
 import re
-from selenium import webdriver
+import sys
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Pipeline"))
+import Tracing  # noqa: E402
+from DriverManager import DriverManager, ScrapeProgress  # noqa: E402
+
 # ------------------- CONFIG -------------------
 
 DATES_PER_MOVIE = 100
@@ -29,8 +33,8 @@ def init_driver():
     options.add_argument("--log-level=3")
     options.add_argument("--window-size=1920,1080")
     options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-    driver = webdriver.Chrome(options=options)
-    return driver
+    # Started lazily, recycled and restarted by the manager (see DriverManager.py)
+    return DriverManager(options)
 
 def get_date_elements(driver):
     return driver.find_elements(By.CSS_SELECTOR, 'span.date')
@@ -46,49 +50,56 @@ def extract_date_texts(date_elements, already_collected, movie_name):
             if text and text not in already_collected:
                 count += 1
                 print(f"{movie_name} ✅ Date {count}")
-                date.append(text)
+                dates.append(text)
         except NoSuchElementException:
             continue
-    return date
+    return dates
 
-def click_next_page(driver, movie_name):
-    """Click next page button if available and return True if successful"""
+def open_date_page(manager, movie_name, page):
+    """Open a page of the movie's reviews; returns the driver, or None if it shows no dates (past the last page)."""
+    driver = manager.get(build_date_url(movie_name, page))
     try:
-        next_button = WebDriverWait(driver, PAGE_LOAD_WAIT).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, 'a.next'))
-        )
-        driver.execute_script("arguments[0].scrollIntoView();", next_button)
-        time.sleep(random.uniform(1, 2))
-        next_button.click()
-        
-        # Wait for new page to load
-        WebDriverWait(driver, PAGE_LOAD_WAIT).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR,'span.date')))
-        time.sleep(random.uniform(*WAIT_BETWEEN_DATES))
-        return True
-    except Exception as e:
-        print(f"❌ Could not find/click next page for {movie_name}: {str(e)}")
-        return False
-    
+        with Tracing.span("load wait", category="wait"):
+            WebDriverWait(driver, PAGE_LOAD_WAIT).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, 'span.date'))
+            )
+            time.sleep(random.uniform(*WAIT_BETWEEN_DATES))
+    except TimeoutException:
+        print(f"❌ No dates on page {page} for {movie_name}")
+        return None
+    return driver
 
-def collect_all_dates(driver, dates_needed, movie_name):
-    collected_dates = set()
-    current_page = 1
+def collect_all_dates(manager, movie_name, state, progress, dates_needed=DATES_PER_MOVIE):
+    """
+    Read review pages, starting after the last page saved in `state`, until
+    enough dates are collected, a page fails to load or MAX_RETRIES pages in a
+    row add nothing. Every page is saved to `progress`, so after a browser
+    restart this picks up at the next page.
+    """
+    collected_dates = set(state['items'])
     retries = 0
 
     while len(collected_dates) < dates_needed and retries < MAX_RETRIES:
+        current_page = state['page'] + 1
         print(f"📄 Processing page {current_page} for {movie_name}")
-        
+        driver = open_date_page(manager, movie_name, current_page)
+        if driver is None:
+            break  # No more pages or the page did not load
+
         # Scroll to trigger potential lazy loading
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(random.uniform(1, 2))
-        driver.execute_script("window.scrollTo(0, 0);")
-        time.sleep(random.uniform(1, 2))
+        with Tracing.span("scroll wait", category="wait"):
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            time.sleep(random.uniform(1, 2))
+            driver.execute_script("window.scrollTo(0, 0);")
+            time.sleep(random.uniform(1, 2))
 
         # Get all date elements on current page
-        elements = get_date_elements(driver)
-        new_texts = extract_date_texts(elements, collected_dates, movie_name)
+        with Tracing.span("extract dates", page=current_page) as span:
+            elements = get_date_elements(driver)
+            new_texts = extract_date_texts(elements, collected_dates, movie_name)
+            span.add(len(new_texts))
         
+        progress.page_done(movie_name, current_page, new_texts)
         if new_texts:
             collected_dates.update(new_texts)
             print(f"📊 Collected {len(collected_dates)}/{dates_needed} dates so far")
@@ -97,15 +108,7 @@ def collect_all_dates(driver, dates_needed, movie_name):
             retries += 1
             print(f"⚠ No new dates found on page {current_page}, retry {retries}/{MAX_RETRIES}")
 
-        # If we still need more dates, try to go to next page
-        if len(collected_dates) < dates_needed:
-            if not click_next_page(driver, movie_name):
-                break  # No more pages or error clicking next
-            current_page += 1
-        else:
-            break  # We have enough dates
-
-    return list(collected_dates)[:dates_needed]
+    return state['items'][:dates_needed]
 
 def sanitize_movie_title(title):
     """Clean movie title for URL"""
@@ -115,9 +118,10 @@ def sanitize_movie_title(title):
     title = re.sub(r'[\s-]+', '-', title)
     return title.lower()
 
-def build_date_url(movie_title):
+def build_date_url(movie_title, page=1):
     slug = sanitize_movie_title(movie_title)
-    return f"https://letterboxd.com/film/{slug}/reviews/by/activity/"
+    url = f"https://letterboxd.com/film/{slug}/reviews/by/activity/"
+    return url if page == 1 else f"{url}page/{page}/"
 
 def save_dates_to_master_csv(movie, dates, output_file=OUTPUT_CSV):
     try:
@@ -170,56 +174,48 @@ def already_scraped(movie, output_file=OUTPUT_CSV):
         return False
 
 
-def scrape_dates_for_movie(driver, movie):
-    url = build_date_url(movie)
-    print(f"🎬 Scraping: {movie} → {url}")
-    
-    try:
-        driver.get(url)
-        WebDriverWait(driver, PAGE_LOAD_WAIT).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, 'span.date'))
-        )
-    except Exception as e:
-        print(f"⚠ Initial page load failed for {movie}: {str(e)}")
-        return []
-    
-    time.sleep(random.uniform(2, 4))  # Additional load time
-    
-    dates = collect_all_dates(driver, DATES_PER_MOVIE, movie)
+def scrape_dates_for_movie(manager, movie, progress):
+    print(f"🎬 Scraping: {movie} → {build_date_url(movie)}")
+    state = progress.start(movie)
+    dates = manager.run(lambda: collect_all_dates(manager, movie, state, progress))
     print(f"📝 Total collected {len(dates)} dates for '{movie}'")
     return dates
 
-def main():
-    driver = init_driver()
-    movie_list = load_movie_list(MOVIE_CSV)
+def main(movie_csv=MOVIE_CSV, output_csv=OUTPUT_CSV):
+    manager = init_driver()
+    progress = ScrapeProgress(f"{output_csv}.progress.json")  # Lets an interrupted movie resume
+    movie_list = load_movie_list(movie_csv)
 
     your_movies = movie_list[:16]  # You're scraping 16 movies
 
     for idx, movie in enumerate(your_movies):
-        if already_scraped(movie):
+        if already_scraped(movie, output_csv):
             print(f"⏩ Already scraped: {movie}")
             continue
 
         try:
-            dates = scrape_dates_for_movie(driver, movie)
+            with Tracing.span("movie", movie=movie) as span:
+                dates = scrape_dates_for_movie(manager, movie, progress)
+                span.add(len(dates))
             if dates:
-                save_dates_to_master_csv(movie, dates)
+                with Tracing.span("csv write", category="io"):
+                    save_dates_to_master_csv(movie, dates, output_csv)
             else:
                 print(f"⚠ No dates found for {movie}")
+            progress.finish(movie)
         except Exception as e:
+            # The pages collected so far stay in the progress file for the next run
             print(f"❌ Error scraping {movie}: {e}")
-            # Save partial results if any
-            if 'dates' in locals() and dates:
-                save_dates_to_master_csv(movie, dates)
 
         # Random delay between movies with increasing delay based on progress
         if idx < len(your_movies) - 1:  # No need to wait after last movie
             delay_multiplier = 1 + (idx / len(your_movies))  # Increases from 1 to 2
             delay = random.uniform(*WAIT_BETWEEN_MOVIES) * delay_multiplier
             print(f"⏳ Waiting {delay:.1f} seconds before next movie...")
-            time.sleep(delay)
+            with Tracing.span("movie wait", category="wait"):
+                time.sleep(delay)
 
-    driver.quit()
+    manager.quit()
     print("\n🎉 Done scraping your 16 movies!")
 
 if __name__ == "__main__":
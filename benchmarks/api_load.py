@@ -0,0 +1,230 @@
+"""
+Local client and load test for the query API (API/QueryAPI.py).
+
+Starts the API on a free port over a scratch copy of the bundled data, checks
+that every endpoint answers with valid JSON (and that unknown movies and bad
+parameters get a 4xx), then runs N client threads that each keep one HTTP/1.1
+connection open and request random endpoints for random movies.
+
+Reports requests per second, latency percentiles and the response cache hit
+rate. Runs offline.
+
+    python benchmarks/api_load.py --clients 16 --requests 2000 --json api.json
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+from load_test import free_port
+from startup import REPO_ROOT, prepare_workdir
+
+SERVER = os.path.join(REPO_ROOT, "API", "QueryAPI.py")
+SERVER_TIMEOUT = 60
+
+
+def get(conn, path):
+    """GET a path on an open connection; returns (status, decoded JSON body, X-Cache header)."""
+    conn.request("GET", path)
+    response = conn.getresponse()
+    body = json.loads(response.read())
+    return response.status, body, response.getheader("X-Cache")
+
+
+def start_server(workdir, port):
+    server = subprocess.Popen(
+        [sys.executable, SERVER, "--port", str(port)],
+        cwd=workdir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.time() + SERVER_TIMEOUT
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            if get(conn, "/health")[0] == 200:
+                conn.close()
+                return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("Query API did not start")
+
+
+def endpoint_paths(movie_id):
+    return [
+        f"/movies/{movie_id}",
+        f"/movies/{movie_id}/sentiment",
+        f"/movies/{movie_id}/series?grain=year",
+        f"/movies/{movie_id}/series?grain=month",
+        f"/movies/{movie_id}/reviews?limit=10",
+        f"/movies/{movie_id}/reviews?order=score&descending=1&limit=10",
+    ]
+
+
+CATALOG_PATHS = ["/movies?limit=50", "/top?by=user_score&limit=10", "/extremes", "/genres"]
+
+
+def check_endpoints(port):
+    """
+    Request every endpoint once and check status and payload.
+    Returns:
+        tuple: (movie ids in the catalog, list of failures)
+    """
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    failures = []
+
+    def expect(path, status):
+        got, body, _ = get(conn, path)
+        if got != status:
+            failures.append(f"{path}: {got} instead of {status} ({body.get('error')})")
+        return body
+
+    catalog = expect("/movies?limit=500", 200)
+    movie_ids = [movie['id'] for movie in catalog.get('movies', [])]
+    for path in CATALOG_PATHS + endpoint_paths(movie_ids[0]):
+        expect(path, 200)
+
+    # Following the cursor must continue where the first page stopped
+    first = expect(f"/movies/{movie_ids[0]}/reviews?limit=2", 200)
+    if first['next']:
+        second = expect(f"/movies/{movie_ids[0]}/reviews?limit=2&after={first['next']}", 200)
+        if first['reviews'][-1]['row'] >= second['reviews'][0]['row']:
+            failures.append("review cursor did not advance")
+
+    expect("/search?q=great&limit=5", 200)
+    expect("/movies/no-such-movie", 404)
+    expect("/top?by=password", 400)
+    expect("/movies?limit=abc", 400)
+    expect(f"/movies/{movie_ids[0]}/reviews?limit=0", 400)
+    expect("/movies?limit=5&offset=0", 200)
+    expect("/nowhere", 404)
+    conn.close()
+    return movie_ids, failures
+
+
+def client(port, paths, n_requests, seed, latencies, counts):
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    for _ in range(n_requests):
+        start = time.perf_counter()
+        status, _, cache = get(conn, rng.choice(paths))
+        latencies.append(time.perf_counter() - start)
+        counts[(status, cache)] = counts.get((status, cache), 0) + 1
+    conn.close()
+
+
+def load_test(port, movie_ids, clients, n_requests, seed=0):
+    """
+    Request every path once (uncached), then run `clients` concurrent
+    keep-alive clients, `n_requests` each.
+    Args:
+        port (int): Port of the running API
+        movie_ids (list): Movies to query
+        clients (int): Number of client threads
+        n_requests (int): Requests per client
+        seed (int): Seed for the request choices
+    Returns:
+        dict: Throughput, latency percentiles and status/cache counts
+    """
+    paths = CATALOG_PATHS + [path for movie_id in movie_ids for path in endpoint_paths(movie_id)]
+    # One pass over every path first, so the timed run measures the cached steady state
+    warm_up = []
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    for path in paths:
+        start = time.perf_counter()
+        get(conn, path)
+        warm_up.append(time.perf_counter() - start)
+    conn.close()
+
+    latencies, counts = [], [{} for _ in range(clients)]
+    threads = [
+        threading.Thread(target=client, args=(port, paths, n_requests, seed + i, latencies, counts[i]))
+        for i in range(clients)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    totals = {}
+    for per_client in counts:
+        for key, n in per_client.items():
+            totals[key] = totals.get(key, 0) + n
+    latency_ms = np.array(latencies) * 1000
+    return {
+        "clients": clients,
+        "requests": len(latencies),
+        "distinct_paths": len(paths),
+        "uncached_ms": {
+            "p50": round(float(np.percentile(warm_up, 50)) * 1000, 2),
+            "max": round(float(max(warm_up)) * 1000, 2),
+        },
+        "wall_s": round(elapsed, 2),
+        "requests_per_s": round(len(latencies) / elapsed, 1),
+        "latency_ms": {
+            "p50": round(float(np.percentile(latency_ms, 50)), 2),
+            "p90": round(float(np.percentile(latency_ms, 90)), 2),
+            "p99": round(float(np.percentile(latency_ms, 99)), 2),
+            "max": round(float(latency_ms.max()), 2),
+        },
+        "cache_hits": sum(n for (status, cache), n in totals.items() if cache == "hit"),
+        "non_200": sum(n for (status, _), n in totals.items() if status != 200),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent client connections")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per client")
+    parser.add_argument("--movies", type=int, default=50, help="Movies drawn from by the clients")
+    parser.add_argument("--workdir", help="Serve this directory instead of a copy of the bundled data")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    workdir = args.workdir or prepare_workdir()
+    port = free_port()
+    server = start_server(workdir, port)
+    try:
+        movie_ids, failures = check_endpoints(port)
+        result = load_test(port, movie_ids[:args.movies], args.clients, args.requests, args.seed)
+    finally:
+        server.terminate()
+        server.wait()
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+    result["failures"] = failures
+
+    latency = result["latency_ms"]
+    print(f"{result['clients']} clients x {args.requests} requests in {result['wall_s']}s "
+          f"({result['requests_per_s']} requests/s)")
+    print(f"  latency: p50 {latency['p50']} ms, p90 {latency['p90']} ms, "
+          f"p99 {latency['p99']} ms, max {latency['max']} ms")
+    print(f"  cache hits: {result['cache_hits']:,} of {result['requests']:,} "
+          f"({result['distinct_paths']} distinct paths)")
+    print(f"  uncached (first request of each path): p50 {result['uncached_ms']['p50']} ms, "
+          f"max {result['uncached_ms']['max']} ms")
+    if result["non_200"]:
+        print(f"  ⚠️ {result['non_200']} responses were not 200")
+    for failure in failures:
+        print(f"  ❌ {failure}")
+    if not failures:
+        print("  ✅ All endpoints answered as expected")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"\nResults saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
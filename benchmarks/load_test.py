@@ -0,0 +1,227 @@
+"""
+Concurrent-session load test for the Movie Dashboard.
+
+Starts the dashboard on a local headless Streamlit server and connects N
+simulated users to it over Streamlit's websocket protocol, the way browsers
+do. Every user selects a random movie, waits for the rerun to finish, and
+repeats. All sessions share one server process, and so its caches.
+
+Reports rerun latency percentiles, throughput, and how much the server's
+resident memory grew per connected session. Runs offline against the bundled
+data/ files.
+
+    python benchmarks/load_test.py --sessions 20 --reruns 10 --json load.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ClientState_pb2 import ClientState
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState, WidgetStates
+from tornado.websocket import websocket_connect
+
+from startup import APP_DIR, prepare_workdir
+
+PAGE = os.path.join(APP_DIR, "🎬_Movie Dashboard.py")
+MOVIE_SELECTBOX = "🎬 Select a Movie"
+SERVER_TIMEOUT = 60
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def rss_mb(pid):
+    """Current resident set size of a process (Linux only; None elsewhere)."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except OSError:
+        return None
+
+
+def start_server(workdir, port):
+    """Run the dashboard headless and wait until it answers its health check."""
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", PAGE,
+         "--server.headless", "true", "--server.port", str(port),
+         "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"],
+        cwd=workdir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.time() + SERVER_TIMEOUT
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as response:
+                if response.read() == b"ok":
+                    return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("Streamlit server did not start")
+
+
+class Session:
+    """One simulated browser tab."""
+
+    def __init__(self, port):
+        self.url = f"ws://127.0.0.1:{port}/_stcore/stream"
+        self.ws = None
+        self.selectbox = None
+        self.errors = []
+
+    async def connect(self):
+        self.ws = await websocket_connect(self.url, subprotocols=["streamlit"])
+
+    async def rerun(self, widget_states=None):
+        """Request a rerun and wait until the script has finished."""
+        msg = BackMsg(rerun_script=ClientState(widget_states=widget_states or WidgetStates()))
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+
+        while True:
+            payload = await self.ws.read_message()
+            if payload is None:
+                raise ConnectionError("Server closed the connection")
+            forward = ForwardMsg()
+            forward.ParseFromString(payload)
+            kind = forward.WhichOneof("type")
+
+            if kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                element = forward.delta.new_element
+                if element.WhichOneof("type") == "selectbox" and element.selectbox.label == MOVIE_SELECTBOX:
+                    self.selectbox = element.selectbox
+                elif element.WhichOneof("type") == "exception":
+                    self.errors.append(f"{element.exception.type}: {element.exception.message}")
+            elif kind == "script_finished":
+                if forward.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    return
+
+    async def select(self, index):
+        state = WidgetState(id=self.selectbox.id, int_value=index)
+        await self.rerun(WidgetStates(widgets=[state]))
+
+    def close(self):
+        if self.ws is not None:
+            self.ws.close()
+
+
+async def simulate_user(session, reruns, rng, latencies):
+    await session.connect()
+    await session.rerun()
+    if session.selectbox is None:
+        raise RuntimeError("Movie selectbox not found on the dashboard")
+    # Option 0 is the "Select a movie" placeholder
+    movies = range(1, len(session.selectbox.options))
+    for _ in range(reruns):
+        start = time.perf_counter()
+        await session.select(rng.choice(movies))
+        latencies.append(time.perf_counter() - start)
+
+
+async def load_test(port, server_pid, sessions, reruns, seed=0):
+    """
+    Connect `sessions` concurrent users to the server, each doing `reruns` movie selections.
+    Args:
+        port (int): Port of the running dashboard
+        server_pid (int): Process id of the server, for memory readings
+        sessions (int): Number of simulated users
+        reruns (int): Movie selections per user
+        seed (int): Seed for the movie choices
+    Returns:
+        dict: Latency percentiles, throughput and memory figures
+    """
+    # One warm-up user fills the server-wide caches, so the memory measured
+    # below is what each additional session costs
+    warm_up = Session(port)
+    await simulate_user(warm_up, 3, random.Random(seed), [])
+    warm_up.close()
+    baseline = rss_mb(server_pid)
+
+    users = [Session(port) for _ in range(sessions)]
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        simulate_user(user, reruns, random.Random(seed + i + 1), latencies)
+        for i, user in enumerate(users)
+    ))
+    elapsed = time.perf_counter() - start
+    after = rss_mb(server_pid)  # Measured while every session is still connected
+    for user in users:
+        user.close()
+
+    latency_ms = np.array(latencies) * 1000
+    result = {
+        "sessions": sessions,
+        "reruns_per_session": reruns,
+        "reruns": len(latencies),
+        "wall_s": round(elapsed, 2),
+        "reruns_per_s": round(len(latencies) / elapsed, 2),
+        "latency_ms": {
+            "p50": round(float(np.percentile(latency_ms, 50)), 1),
+            "p90": round(float(np.percentile(latency_ms, 90)), 1),
+            "p99": round(float(np.percentile(latency_ms, 99)), 1),
+            "max": round(float(latency_ms.max()), 1),
+        },
+        "rss_baseline_mb": None,
+        "rss_after_mb": None,
+        "rss_per_session_mb": None,
+        "errors": sorted({error for user in users for error in user.errors}),
+    }
+    if baseline is not None and after is not None:
+        result.update(
+            rss_baseline_mb=round(baseline, 1),
+            rss_after_mb=round(after, 1),
+            rss_per_session_mb=round((after - baseline) / sessions, 2),
+        )
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10, help="Concurrent sessions")
+    parser.add_argument("--reruns", type=int, default=10, help="Movie selections per session")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    workdir = prepare_workdir()
+    port = free_port()
+    server = start_server(workdir, port)
+    try:
+        result = asyncio.run(load_test(port, server.pid, args.sessions, args.reruns, args.seed))
+    finally:
+        server.terminate()
+        server.wait()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    latency = result["latency_ms"]
+    print(f"{result['sessions']} sessions x {result['reruns_per_session']} reruns in {result['wall_s']}s "
+          f"({result['reruns_per_s']} reruns/s)")
+    print(f"  rerun latency: p50 {latency['p50']} ms, p90 {latency['p90']} ms, "
+          f"p99 {latency['p99']} ms, max {latency['max']} ms")
+    if result["rss_per_session_mb"] is not None:
+        print(f"  server memory: {result['rss_baseline_mb']} MB -> {result['rss_after_mb']} MB "
+              f"({result['rss_per_session_mb']} MB per session)")
+    for error in result["errors"]:
+        print(f"  ❌ {error}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"\nResults saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
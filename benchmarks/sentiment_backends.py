@@ -0,0 +1,116 @@
+"""
+Throughput benchmark for the sentiment backends in Analysis/SentimentScorers.py.
+
+Scores the bundled analyzed reviews with each backend and batch size and reports
+reviews per second, p50/p99 per-batch latency, peak memory and agreement with
+the labels already stored in the CSV.
+
+    python benchmarks/sentiment_backends.py --backends vader lexicon --batch-sizes 64 256 1024
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "Analysis"))
+
+from SentimentScorers import SCORERS, get_scorer  # noqa: E402
+
+DEFAULT_CSV = os.path.join(REPO_ROOT, "data", "analyzed_reviews_with_id.csv")
+
+
+def load_reviews(csv_path, limit=None):
+    df = pd.read_csv(csv_path, usecols=['review', 'sentiment_label'])
+    df = df.dropna(subset=['review'])
+    if limit:
+        df = df.head(limit)
+    return df['review'].astype(str).tolist(), df['sentiment_label'].tolist()
+
+
+def time_batches(scorer, texts):
+    """Score all texts and return (scores, per-batch latencies in seconds)."""
+    scores = []
+    latencies = []
+    for batch in scorer.batches(texts):
+        start = time.perf_counter()
+        scores.extend(scorer.score_batch(batch))
+        latencies.append(time.perf_counter() - start)
+    return scores, latencies
+
+
+def peak_memory_mb(scorer, texts):
+    """Peak Python heap allocated while scoring, measured in a separate pass."""
+    tracemalloc.start()
+    try:
+        scorer.score(texts)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1e6
+
+
+def benchmark(backend, batch_size, texts, labels, measure_memory=True):
+    start = time.perf_counter()
+    scorer = get_scorer(backend, batch_size=batch_size)
+    init_seconds = time.perf_counter() - start
+
+    # Warm-up batch so lazy setup inside the backend is not counted
+    scorer.score_batch(texts[:min(batch_size, len(texts))])
+
+    scores, latencies = time_batches(scorer, texts)
+    total = sum(latencies)
+    predicted = [scorer.classify(score) for score in scores]
+
+    return {
+        'backend': backend,
+        'batch_size': batch_size,
+        'reviews': len(texts),
+        'init_s': round(init_seconds, 3),
+        'reviews_per_s': round(len(texts) / total, 1) if total else None,
+        'p50_batch_ms': round(float(np.percentile(latencies, 50)) * 1e3, 2),
+        'p99_batch_ms': round(float(np.percentile(latencies, 99)) * 1e3, 2),
+        'peak_heap_mb': round(peak_memory_mb(scorer, texts), 1) if measure_memory else None,
+        'max_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'label_agreement': round(float(np.mean(np.array(predicted) == np.array(labels))), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", default=DEFAULT_CSV, help="Reviews CSV with 'review' and 'sentiment_label'")
+    parser.add_argument("--backends", nargs="+", default=["vader", "lexicon"], choices=sorted(SCORERS))
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[64, 256, 1024])
+    parser.add_argument("--limit", type=int, help="Only score the first N reviews")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    texts, labels = load_reviews(args.csv, args.limit)
+    print(f"Benchmarking {len(texts)} reviews from {args.csv}\n")
+
+    results = []
+    for backend in args.backends:
+        for batch_size in args.batch_sizes:
+            try:
+                results.append(benchmark(backend, batch_size, texts, labels, not args.no_memory))
+            except ImportError as e:
+                print(f"⚠️ Skipping {backend}: {e}")
+                break
+
+    print(pd.DataFrame(results).to_string(index=False))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
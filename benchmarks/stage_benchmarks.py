@@ -0,0 +1,252 @@
+"""
+Stage-by-stage benchmark suite at several corpus scales.
+
+For each scale a synthetic corpus is generated (see synthetic_corpus.py) and
+every stage is timed against it:
+
+    clean_text, clean_date, detect_language   per review, on a random sample of the raw reviews
+    find_near_duplicates                      on every raw review (MinHash/LSH is linear in the corpus)
+    analyze_sentiments                        end to end on a wide CSV built from the sample
+    build_review_store, store queries          on the full corpus (what the dashboard loads)
+
+Per-review stages report throughput and the time projected for the whole
+corpus, since running langdetect or ftfy over 10M reviews would take hours.
+Results are written as JSON; pass a previous report as --baseline to print
+how each stage changed.
+
+    python benchmarks/stage_benchmarks.py --scales 50:4500 1000:100000 10000:10000000 --json stages.json
+    python benchmarks/stage_benchmarks.py --scales 1000:100000 --baseline stages.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "Pipeline"))
+sys.path.insert(0, os.path.join(REPO_ROOT, "streamlit"))
+
+from RunPipeline import load_module  # noqa: E402
+from synthetic_corpus import generate_corpus  # noqa: E402
+
+DEFAULT_SCALES = ["50:4500", "1000:100000"]
+DEFAULT_SAMPLE = 5000
+DEFAULT_LANGUAGE_SAMPLE = 1000
+
+
+def parse_scale(text):
+    movies, reviews = text.split(":")
+    return int(movies), int(reviews)
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def per_item(name, func, items, total):
+    """Time func over every item and project the cost to `total` items."""
+    _, seconds = timed(lambda: [func(item) for item in items])
+    per_item_s = seconds / max(len(items), 1)
+    return name, {
+        "items": len(items),
+        "seconds": round(seconds, 4),
+        "per_item_us": round(per_item_s * 1e6, 2),
+        "items_per_s": round(len(items) / seconds, 1) if seconds else None,
+        "projected_s": round(per_item_s * total, 2),
+    }
+
+
+def whole(name, func, *args, items=None, **kwargs):
+    """Time one call of func."""
+    _, seconds = timed(func, *args, **kwargs)
+    result = {"seconds": round(seconds, 4)}
+    if items:
+        result.update(items=items, items_per_s=round(items / seconds, 1) if seconds else None)
+    return name, result
+
+
+def unavailable(name, error):
+    print(f"⚠️ {name} skipped: {error}")
+    return name, {"unavailable": str(error)}
+
+
+def preprocessing_stages(sample, total, language_sample):
+    """clean_text, detect_language and clean_date on the raw review sample."""
+    texts = sample['review'].tolist()
+    stages = []
+    try:
+        preprocessor = load_module("Preprocessing/ReviewPreprocessor.py")
+    except ImportError as e:
+        stages += [unavailable("clean_text", e), unavailable("detect_language", e)]
+    else:
+        stages += [
+            per_item("clean_text", preprocessor.clean_text, texts, total),
+            per_item("detect_language", preprocessor.detect_language, texts[:language_sample], total),
+        ]
+    dates = load_module("Preprocessing/DatePreprocessor.py")
+    stages.append(per_item("clean_date", dates.clean_date, sample['date'].tolist(), total))
+    return stages
+
+
+def dedup_stage(texts):
+    """MinHash/LSH near-duplicate search over the whole corpus."""
+    dedup = load_module("Preprocessing/NearDuplicates.py")
+    name, result = whole("find_near_duplicates", dedup.find_near_duplicates, texts, items=len(texts))
+    return name, result
+
+
+def sentiment_stage(sample, total, workdir, backend):
+    """analyze_sentiments on the sample, laid out one column per movie like the preprocessed CSV."""
+    try:
+        sentiment = load_module("Analysis/Sentiment Analysis.py")
+    except ImportError as e:
+        return unavailable("analyze_sentiments", e)
+    wide = pd.DataFrame({
+        str(movie_id): group['review'].reset_index(drop=True)
+        for movie_id, group in sample.groupby('id', sort=False)
+    })
+    input_csv = os.path.join(workdir, "sentiment_input.csv")
+    wide.to_csv(input_csv, index=False, encoding='utf-8')
+
+    name, result = whole(f"analyze_sentiments ({backend})", sentiment.analyze_sentiments,
+                         input_csv, os.path.join(workdir, "sentiment_output.csv"), backend=backend,
+                         items=len(sample))
+    result["projected_s"] = round(result["seconds"] / len(sample) * total, 2)
+    return name, result
+
+
+def store_stages(corpus_dir, n_reviews):
+    """Build the review store from the full corpus and time the queries the dashboard makes."""
+    from review_bitmaps import MOVIE_ATTRIBUTES, ReviewBitmaps
+    from review_store import ReviewStore, build_review_store
+
+    cwd = os.getcwd()
+    os.chdir(corpus_dir)  # The text store and database are written next to the corpus
+    try:
+        stages = [whole("build_review_store", build_review_store,
+                        "analyzed_reviews_with_id.csv", "movie_info_1.csv", items=n_reviews)]
+        store, seconds = timed(ReviewStore)
+        stages.append(("open store", {"seconds": round(seconds, 4)}))
+
+        top = store.most_reviewed_movies(20)
+        largest = top[0]
+        stages += [
+            whole("load movies", store.movies),
+            whole("top 50 movies by revenue", store.top_movies, 'revenue', 50),
+            whole("release year counts", store.release_year_counts),
+            whole("genre sentiment", store.genre_sentiment),
+            whole("movies with two genres", store.movies_with_genres, store.genre_mask(['Action', 'Comedy'])),
+            whole("largest movie: all reviews", store.reviews_for_movie, largest,
+                  columns=['row', 'sentiment_score', 'sentiment_label', 'date']),
+            whole("largest movie: review page", store.review_page, largest, 'score', True),
+            whole("largest movie: daily series", store.sentiment_series, largest, 'day'),
+            whole("compare 20 movies", store.compare_movies, top),
+            whole("full-text search", store.search_reviews, "great"),
+        ]
+        bitmaps, seconds = timed(ReviewBitmaps, store.movies(['id', 'title', *MOVIE_ATTRIBUTES]), store.bitmap_prefix)
+        stages.append(("open review bitmaps", {"seconds": round(seconds, 4)}))
+        filters = {'sentiment_label': ['Positive'], 'original_language': ['en'],
+                   'review_year': bitmaps.row_values['review_year'][-3:]}
+        stages += [
+            whole("cross-filter: total", bitmaps.total, filters),
+            whole("cross-filter: label counts", bitmaps.counts, 'sentiment_label', filters),
+            whole("cross-filter: per-movie counts", bitmaps.movie_counts, filters),
+        ]
+        return stages
+    finally:
+        os.chdir(cwd)
+
+
+def run_scale(movies, reviews, workdir, sample_size, language_sample, backend, skip_store):
+    corpus_dir = os.path.join(workdir, f"corpus_{movies}_{reviews}")
+    manifest, seconds = timed(generate_corpus, movies, reviews, corpus_dir)
+    stages = [("generate corpus", {"seconds": round(seconds, 2)})]
+
+    raw = pd.read_csv(manifest['files']['raw_reviews'], dtype={'date': str}, keep_default_na=False)
+    sample = raw.sample(min(sample_size, len(raw)), random_state=0)
+    texts = raw['review'].tolist()
+    del raw
+
+    stages += preprocessing_stages(sample, reviews, language_sample)
+    stages.append(dedup_stage(texts))
+    del texts
+    stages.append(sentiment_stage(sample, reviews, corpus_dir, backend))
+    if not skip_store:
+        stages += store_stages(corpus_dir, reviews)
+    return {"movies": movies, "reviews": reviews, "sample": len(sample), "stages": dict(stages)}
+
+
+def print_report(report, baseline=None):
+    previous = {(run["movies"], run["reviews"]): run["stages"] for run in (baseline or {}).get("runs", [])}
+    for run in report["runs"]:
+        print(f"\n{run['movies']:,} movies, {run['reviews']:,} reviews (sample {run['sample']:,})")
+        before = previous.get((run["movies"], run["reviews"]), {})
+        for name, stats in run["stages"].items():
+            if "unavailable" in stats:
+                print(f"  {name:<32} unavailable")
+                continue
+            line = f"  {name:<32} {stats['seconds']:>10.3f}s"
+            if "per_item_us" in stats:
+                line += f"  {stats['per_item_us']:>10.1f} µs/review"
+            if "projected_s" in stats:
+                line += f"  (~{stats['projected_s']:.0f}s for all reviews)"
+            # Per-review stages are compared per review, since the sample size may differ
+            metric = "per_item_us" if "per_item_us" in stats else "seconds"
+            if before.get(name, {}).get(metric):
+                line += f"  x{stats[metric] / before[name][metric]:.2f} vs baseline"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", nargs="+", default=DEFAULT_SCALES, help="movies:reviews pairs")
+    parser.add_argument("--sample", type=int, default=DEFAULT_SAMPLE, help="Reviews timed per-review stages run on")
+    parser.add_argument("--language-sample", type=int, default=DEFAULT_LANGUAGE_SAMPLE,
+                        help="Reviews detect_language runs on (it is much slower)")
+    parser.add_argument("--backend", default="vader", help="Sentiment backend for analyze_sentiments")
+    parser.add_argument("--skip-store", action="store_true", help="Do not build the review store")
+    parser.add_argument("--work-dir", help="Keep the corpora here instead of a temporary directory")
+    parser.add_argument("--json", help="Write the report to this JSON file")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    workdir = args.work_dir or tempfile.mkdtemp(prefix="movieviz-stages-")
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "runs": [],
+    }
+    try:
+        for scale in args.scales:
+            movies, reviews = parse_scale(scale)
+            print(f"=== {movies:,} movies, {reviews:,} reviews ===")
+            report["runs"].append(run_scale(movies, reviews, workdir, args.sample, args.language_sample,
+                                            args.backend, args.skip_store))
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
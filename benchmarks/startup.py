@@ -0,0 +1,129 @@
+"""
+Cold-start benchmark for the Streamlit pages.
+
+Each measurement runs in a fresh Python process, the way a new container
+starts: it times the import of Streamlit itself, then the first full run of a
+page through Streamlit's headless AppTest runner (time to first render), and
+lists the slowest module imports reported by `python -X importtime`.
+
+The bundled data/ files are copied to a scratch directory and the review store
+is built there once before measuring, so store building is not counted.
+
+    python benchmarks/startup.py --repeat 5 --json startup.json
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.join(REPO_ROOT, "streamlit")
+DATA_DIR = os.path.join(REPO_ROOT, "data")
+PAGES = ["🎞️_Main.py", "🎬_Movie Dashboard.py"]
+
+
+def run_child(page):
+    """Measure one cold start of a page; prints a JSON result on stdout."""
+    sys.path.insert(0, APP_DIR)
+
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    import_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    at = AppTest.from_file(os.path.join(APP_DIR, page), default_timeout=300).run()
+    render_s = time.perf_counter() - start
+
+    print(json.dumps({
+        "streamlit_import_s": import_s,
+        "first_render_s": render_s,
+        "exceptions": [str(e.value) for e in at.exception],
+    }))
+
+
+def slowest_imports(importtime_log, top=8):
+    """Top-level modules with the largest cumulative time in `-X importtime` output."""
+    ranked = []
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue  # Header line
+        name = parts[2][1:]
+        if not name.startswith(" "):  # Nested imports are indented
+            ranked.append((int(parts[1]), name))
+    ranked.sort(reverse=True)
+    return [{"module": name, "cumulative_ms": round(us / 1000, 1)} for us, name in ranked[:top]]
+
+
+def measure(page, workdir):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", __file__, "--child", page],
+        cwd=workdir, capture_output=True, text=True, check=True
+    )
+    stats = json.loads(result.stdout.strip().splitlines()[-1])
+    stats["imports"] = slowest_imports(result.stderr)
+    return stats
+
+
+def prepare_workdir():
+    """Copy the bundled data and build the review store once."""
+    workdir = tempfile.mkdtemp(prefix="movieviz-startup-")
+    for name in os.listdir(DATA_DIR):
+        shutil.copy(os.path.join(DATA_DIR, name), workdir)
+    subprocess.run([sys.executable, os.path.join(APP_DIR, "review_store.py")], cwd=workdir, check=True,
+                   capture_output=True)
+    return workdir
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="Cold starts per page")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child)
+        return
+
+    workdir = prepare_workdir()
+    report = []
+    try:
+        for page in PAGES:
+            runs = [measure(page, workdir) for _ in range(args.repeat)]
+            errors = sorted({error for run in runs for error in run["exceptions"]})
+            report.append({
+                "page": page,
+                "runs": args.repeat,
+                "streamlit_import_s": round(statistics.median(r["streamlit_import_s"] for r in runs), 3),
+                "first_render_s": round(statistics.median(r["first_render_s"] for r in runs), 3),
+                "slowest_imports": runs[-1]["imports"],
+                "errors": errors,
+            })
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    for entry in report:
+        print(f"\n{entry['page']}  (median of {entry['runs']} cold starts)")
+        print(f"  import streamlit: {entry['streamlit_import_s']:.3f}s")
+        print(f"  first render:     {entry['first_render_s']:.3f}s")
+        for item in entry["slowest_imports"]:
+            print(f"    {item['cumulative_ms']:>8.1f} ms  {item['module']}")
+        for error in entry["errors"]:
+            print(f"  ❌ {error}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
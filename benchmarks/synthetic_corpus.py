@@ -0,0 +1,230 @@
+"""
+Synthetic corpus generator for scale testing.
+
+Writes datasets with the same schema as the bundled data/ files, at any scale:
+
+    movie_info_1.csv                 one row per movie (TMDB schema)
+    analyzed_reviews_with_id.csv     one row per review, grouped by movie, like the pipeline output
+    raw_reviews.csv                  id, review, date before preprocessing: other languages,
+                                     emoji, mojibake and mixed date formats
+
+Review counts per movie follow a long-tailed (Zipf-like) distribution, so a few
+movies get a very large share of the reviews, as on Letterboxd. Review texts
+are drawn from a pool of generated texts (--pool) rather than built one by one,
+so generation time is dominated by writing the CSVs; rows are written in
+chunks, so memory stays flat at any scale.
+
+    python benchmarks/synthetic_corpus.py --movies 10000 --reviews 10000000 --out corpus_10m
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+CHUNK_SIZE = 500_000
+DEFAULT_POOL = 50_000
+
+GENRES = ['Action', 'Adventure', 'Animation', 'Comedy', 'Crime', 'Drama', 'Family', 'Fantasy',
+          'History', 'Horror', 'Music', 'Mystery', 'Romance', 'Science Fiction', 'Thriller', 'War']
+LANGUAGES = ['en'] * 12 + ['fr', 'es', 'de', 'ja', 'ko', 'zh', 'it', 'hi']
+TITLE_WORDS = ['Night', 'Star', 'Return', 'Last', 'Kingdom', 'Shadow', 'Rise', 'Fall', 'Dream', 'War',
+               'Ocean', 'Fire', 'Secret', 'Empire', 'Heart', 'Storm', 'City', 'Ghost', 'Legend', 'Edge']
+FIRST_NAMES = ['James', 'Greta', 'Denis', 'Sofia', 'Bong', 'Chloe', 'Jordan', 'Kathryn', 'Hayao', 'Ava']
+LAST_NAMES = ['Cameron', 'Gerwig', 'Villeneuve', 'Coppola', 'Joon-ho', 'Zhao', 'Peele', 'Bigelow', 'Miyazaki']
+
+POSITIVE = ['amazing', 'beautiful', 'loved', 'brilliant', 'stunning', 'masterpiece', 'fun', 'great',
+            'moving', 'perfect', 'hilarious', 'gorgeous']
+NEGATIVE = ['boring', 'awful', 'hated', 'terrible', 'mess', 'dull', 'worst', 'disappointing',
+            'painful', 'forgettable', 'annoying', 'bad']
+NEUTRAL = ['movie', 'film', 'story', 'cast', 'ending', 'soundtrack', 'plot', 'scene', 'director',
+           'score', 'visuals', 'characters', 'sequel', 'runtime', 'dialogue', 'theater']
+FILLER = ['the', 'a', 'this', 'was', 'so', 'really', 'just', 'honestly', 'and', 'but', 'it', 'i',
+          'not', 'very', 'kind of', 'absolutely', 'at times', 'overall']
+FOREIGN = [
+    "la película es increíble, me encantó", "quelle déception, le film est trop long",
+    "der Film war wirklich großartig", "filme maravilhoso, chorei muito",
+    "映画は本当に素晴らしかった", "정말 재미있는 영화였어요", "film bellissimo, da rivedere",
+]
+EMOJI = ['😂', '😍', '😭', '🔥', '💀', '👏', '🙄', '😴', '❤️', '✨']
+# Curly quotes and accents turn into sequences such as "â€™" when UTF-8 is read as cp1252
+MOJIBAKE_SEEDS = ["it’s", "didn’t", "“wow”", "café", "naïve", "—"]
+DATE_FORMATS = ['%m/%d/%Y', '%Y-%m-%d', '%d %B %Y', '%b %d, %Y', '%d.%m.%y']
+DATE_FORMAT_WEIGHTS = [0.6, 0.15, 0.1, 0.1, 0.05]
+
+
+def mojibake(text):
+    return text.encode('utf-8').decode('cp1252', errors='replace')
+
+
+def make_text_pool(size, rng):
+    """
+    Generate review texts with a known polarity.
+    Returns:
+        tuple: (clean texts, raw texts, polarity in [-1, 1]) for each pool entry
+    """
+    clean, raw, polarity = [], [], np.empty(size)
+    for i in range(size):
+        tone = rng.uniform(-1, 1)
+        n_words = int(rng.integers(6, 60))
+        sentiment_words = POSITIVE if tone > 0 else NEGATIVE
+        weights = [0.45, 0.35, 0.2 * abs(tone) + 0.02]
+        pools = [FILLER, NEUTRAL, sentiment_words]
+        choice = rng.choice(3, size=n_words, p=np.array(weights) / sum(weights))
+        words = [pools[c][rng.integers(len(pools[c]))] for c in choice]
+        text = ' '.join(words).capitalize()
+        if rng.random() < 0.3:
+            text += '!' if tone > 0 else '...'
+        clean.append(text)
+
+        raw_text = text
+        roll = rng.random()
+        if roll < 0.08:
+            raw_text = FOREIGN[rng.integers(len(FOREIGN))]
+        elif roll < 0.11:
+            raw_text = mojibake(f"{text} {MOJIBAKE_SEEDS[rng.integers(len(MOJIBAKE_SEEDS))]}")
+        if rng.random() < 0.12:
+            raw_text += ' ' + ''.join(rng.choice(EMOJI, size=int(rng.integers(1, 4))))
+        raw.append(raw_text)
+        polarity[i] = tone
+    return pd.Series(clean), pd.Series(raw), polarity
+
+
+def make_movies(n_movies, rng):
+    ids = np.arange(1, n_movies + 1)
+    years = rng.integers(1970, 2025, size=n_movies)
+    titles = [
+        f"{' '.join(rng.choice(TITLE_WORDS, size=int(rng.integers(1, 4))))} {i} ({year})"
+        for i, year in zip(ids, years)
+    ]
+    return pd.DataFrame({
+        'title': titles,
+        'poster_url': [f"https://image.tmdb.org/t/p/w500/synthetic{i}.jpg" for i in ids],
+        'genres': ['|'.join(rng.choice(GENRES, size=int(rng.integers(1, 4)), replace=False)) for _ in ids],
+        'release_year': years,
+        'runtime': rng.integers(75, 200, size=n_movies),
+        'director': [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}" for _ in ids],
+        'user_score': np.round(rng.uniform(4, 9, size=n_movies), 3),
+        'original_language': rng.choice(LANGUAGES, size=n_movies),
+        'overview': [f"A synthetic overview for movie {i}." for i in ids],
+        'revenue': np.round(rng.lognormal(18, 1.5, size=n_movies)).astype(np.int64),
+        'id': ids,
+    })
+
+
+def review_counts(n_movies, n_reviews, rng, skew=0.9):
+    """Reviews per movie, long-tailed and summing to n_reviews."""
+    weights = 1.0 / np.arange(1, n_movies + 1) ** skew
+    rng.shuffle(weights)
+    return rng.multinomial(n_reviews, weights / weights.sum())
+
+
+def format_dates(days, formats):
+    """
+    Format day numbers (days since 1970-01-01) with the given strftime formats.
+    Each distinct day is formatted once, since a chunk spans only a few
+    thousand days however many reviews it holds.
+    Args:
+        days (np.ndarray): Day number of each review
+        formats (list): strftime formats
+    Returns:
+        tuple: (table of formatted days, one row per format; column of each review in that table)
+    """
+    unique_days, inverse = np.unique(days, return_inverse=True)
+    index = pd.DatetimeIndex(unique_days.astype('datetime64[D]'))
+    table = np.array([index.strftime(fmt).to_numpy() for fmt in formats], dtype=object)
+    return table, inverse
+
+
+def raw_dates(days, rng):
+    """Dates in a random mix of formats, as scraped dates come in, with a few missing."""
+    table, inverse = format_dates(days, DATE_FORMATS)
+    out = table[rng.choice(len(DATE_FORMATS), size=len(days), p=DATE_FORMAT_WEIGHTS), inverse]
+    out[rng.random(len(days)) < 0.002] = ''
+    return out
+
+
+def generate_corpus(n_movies, n_reviews, out_dir, pool_size=DEFAULT_POOL, seed=0):
+    """
+    Write a synthetic corpus to out_dir.
+    Args:
+        n_movies (int): Number of movies
+        n_reviews (int): Total number of reviews
+        out_dir (str): Output directory
+        pool_size (int): Number of distinct review texts to draw from
+        seed (int): Random seed
+    Returns:
+        dict: Paths of the written files and the corpus size
+    """
+    rng = np.random.default_rng(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {
+        'movie_info': os.path.join(out_dir, 'movie_info_1.csv'),
+        'reviews': os.path.join(out_dir, 'analyzed_reviews_with_id.csv'),
+        'raw_reviews': os.path.join(out_dir, 'raw_reviews.csv'),
+    }
+
+    movies = make_movies(n_movies, rng)
+    movies.to_csv(paths['movie_info'], index=False, encoding='utf-8')
+
+    clean_pool, raw_pool, polarity = make_text_pool(min(pool_size, max(n_reviews, 1)), rng)
+    movie_ids = np.repeat(movies['id'].to_numpy(), review_counts(n_movies, n_reviews, rng))
+    release = pd.to_datetime(movies.set_index('id')['release_year'].astype(str) + '-01-01')
+    last_day = pd.Timestamp('2025-06-30')
+
+    for start in range(0, max(n_reviews, 1), CHUNK_SIZE):
+        ids = movie_ids[start:start + CHUNK_SIZE]
+        if len(ids) == 0:
+            break
+        picks = rng.integers(len(clean_pool), size=len(ids))
+        scores = np.clip(polarity[picks] * 0.8 + rng.normal(0, 0.25, size=len(ids)), -1, 1).round(4)
+        labels = np.where(scores >= 0.05, 'Positive', np.where(scores <= -0.05, 'Negative', 'Neutral'))
+
+        # Reviews fall between the release year (Letterboxd starts in 2012) and today
+        first = np.maximum(release.reindex(ids).to_numpy().astype('datetime64[D]'), np.datetime64('2012-01-01'))
+        span = (last_day.to_datetime64().astype('datetime64[D]') - first).astype(np.int64)
+        days = first.astype(np.int64) + (rng.random(len(ids)) * span).astype(np.int64)
+        table, inverse = format_dates(days, ['%m/%d/%Y'])
+
+        chunk = pd.DataFrame({
+            'title': movies['title'].to_numpy()[ids - 1],
+            'review': clean_pool.to_numpy()[picks],
+            'sentiment_score': scores,
+            'sentiment_label': labels,
+            'date': table[0, inverse],
+            'id': ids,
+        })
+        header = start == 0
+        chunk.to_csv(paths['reviews'], mode='w' if header else 'a', header=header, index=False, encoding='utf-8')
+        pd.DataFrame({
+            'id': ids,
+            'review': raw_pool.to_numpy()[picks],
+            'date': raw_dates(days, rng),
+        }).to_csv(paths['raw_reviews'], mode='w' if header else 'a', header=header, index=False, encoding='utf-8')
+        print(f"  {min(start + CHUNK_SIZE, n_reviews):,} / {n_reviews:,} reviews")
+
+    manifest = {'movies': n_movies, 'reviews': n_reviews, 'pool': len(clean_pool), 'seed': seed, 'files': paths}
+    with open(os.path.join(out_dir, 'corpus.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--movies", type=int, default=1000)
+    parser.add_argument("--reviews", type=int, default=100_000)
+    parser.add_argument("--out", required=True, help="Output directory")
+    parser.add_argument("--pool", type=int, default=DEFAULT_POOL, help="Distinct review texts to draw from")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    generate_corpus(args.movies, args.reviews, args.out, args.pool, args.seed)
+    print(f"✅ Wrote {args.movies:,} movies and {args.reviews:,} reviews to {args.out} "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Sidebar cross-filter panel shared by the Streamlit pages.
+
+The selection is kept in st.session_state, so it follows the user from page to
+page, and charts read it with current_filters(). Every filter lists its values
+with the number of reviews each would match under the other filters, counted
+from the review bitmaps (see review_bitmaps.py); a change reruns the page
+once so all lists and charts are recounted together.
+"""
+import streamlit as st
+
+import perf
+
+FILTER_LABELS = {
+    'sentiment_label': 'Sentiment',
+    'review_year': 'Review year',
+    'original_language': 'Language',
+    'release_year': 'Release year',
+    'director': 'Director',
+    'movie': 'Movie',
+}
+SORTED_BY_VALUE = {'sentiment_label', 'review_year', 'release_year'}
+OPTION_LIMIT = 50  # Values listed per filter, most reviewed first
+STATE_KEY = "cross_filter"
+
+
+def current_filters():
+    """The active selection: dimension -> selected values, for dimensions with a selection."""
+    return {dimension: values for dimension, values in st.session_state.get(STATE_KEY, {}).items() if values}
+
+
+def _clear_filters():
+    st.session_state[STATE_KEY] = {}
+
+
+def _options(counts, selected, by_value):
+    """Selected values first, then values that still match reviews, capped at OPTION_LIMIT."""
+    matching = counts[counts > 0]
+    if not by_value:
+        matching = matching.sort_values(ascending=False, kind='stable')
+    values = [value for value in matching.index.tolist() if value not in selected]
+    return selected + values[:max(OPTION_LIMIT - len(selected), 0)]
+
+
+def render_filter_panel(bitmaps):
+    """
+    Draw the cross-filter panel in the sidebar.
+    Args:
+        bitmaps (ReviewBitmaps): Review bitmaps of the current data version
+    Returns:
+        dict: The active filters (see current_filters)
+    """
+    filters = current_filters()
+    titles = dict(zip(bitmaps.movies['id'], bitmaps.movies['title']))
+    with st.sidebar.expander("🔎 Cross-filter", expanded=bool(filters)):
+        with perf.section("cross-filter counts"):
+            counts = {dimension: bitmaps.counts(dimension, filters) for dimension in FILTER_LABELS}
+
+        chosen = {}
+        for dimension, label in FILTER_LABELS.items():
+            selected = filters.get(dimension, [])
+            options = _options(counts[dimension], selected, dimension in SORTED_BY_VALUE)
+            names = titles if dimension == 'movie' else {}
+            chosen[dimension] = st.multiselect(
+                label, options, default=selected,
+                format_func=lambda value, c=counts[dimension], n=names: f"{n.get(value, value)} · {c.get(value, 0):,}"
+            )
+        if filters:
+            st.caption(f"{bitmaps.total(filters):,} matching reviews")
+            st.button("Clear filters", on_click=_clear_filters)
+
+    chosen = {dimension: values for dimension, values in chosen.items() if values}
+    if chosen != filters:
+        st.session_state[STATE_KEY] = chosen
+        st.rerun()
+    return filters
@@ -0,0 +1,458 @@
+"""
+Per-movie Plotly figures for the Movie Dashboard, with a shared LRU cache.
+
+Figures are keyed by (movie id, data version), so switching back to a movie
+reuses the figures built earlier, and a new data version simply stops matching
+the old entries, which then age out of the LRU. A background thread warms the
+cache with the most reviewed movies when the server starts.
+
+Sentiment trends are read from the store's precomputed time series at the
+chosen grain and smoothed here, so changing the grain or the rolling window
+never rescans the reviews. Comparison figures for several movies are built from one grouped query per
+chart (see ReviewStore.compare_movies) and cached the same way, keyed by the
+selected ids.
+
+Cross-filtered figures are built on every rerun from the reviews the bitmaps
+select (see ReviewBitmaps.matching_rows), through the same chart code as the
+cached ones, so they are not cached.
+
+Genre figures come from the store's per-genre aggregates (each movie counted
+once for every bit set in its genre mask), so they never touch the reviews.
+"""
+import threading
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import perf
+
+FIGURE_CACHE_SIZE = 128
+WARMUP_MOVIES = 20
+MAX_COMPARE = 20
+DEFAULT_GRAIN = 'year'
+GRAIN_LABELS = {'day': 'Daily', 'week': 'Weekly', 'month': 'Monthly', 'year': 'Yearly'}
+GRAIN_FREQS = {'day': 'D', 'week': 'W-MON', 'month': 'MS', 'year': 'YS'}
+GRAIN_PERIODS = {'day': 'D', 'week': 'W-SUN', 'month': 'M', 'year': 'Y'}  # Weeks run Monday to Sunday
+EMOTION_COLS = ['joy', 'anger', 'fear', 'sadness', 'surprise', 'love']
+
+
+class FigureCache:
+    """Thread-safe bounded LRU mapping (movie id, data version) to a movie's figures."""
+
+    def __init__(self, maxsize=FIGURE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            figures = self._entries.get(key)
+            if figures is not None:
+                self._entries.move_to_end(key)
+            return figures
+
+    def put(self, key, figures):
+        with self._lock:
+            self._entries[key] = figures
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+
+def build_movie_figures(store, movie_id):
+    """
+    Build every chart the dashboard shows for one movie.
+    Returns:
+        dict: 'pie', 'radar' and 'labels' figures (None when there is no data)
+    """
+    reviews = store.reviews_for_movie(movie_id, columns=['sentiment_score', 'sentiment_label'])
+    return movie_figures(reviews, store.sentiment_counts(movie_id), movie_id)
+
+
+def movie_figures(reviews, sentiment_counts, movie_id):
+    """
+    The charts of build_movie_figures(), from a movie's reviews (or a subset of them).
+    Args:
+        reviews (pd.DataFrame): sentiment_score and sentiment_label of each review
+        sentiment_counts (pd.Series): Review count per sentiment label
+        movie_id (str): Movie id (seeds the placeholder emotion scores)
+    Returns:
+        dict: 'pie', 'radar' and 'labels' figures (None when there is no data)
+    """
+    import plotly.express as px
+
+    figures = {'pie': None, 'radar': None, 'labels': None}
+
+    # === Sentiment Distribution ===
+    if not sentiment_counts.empty:
+        figures['pie'] = px.pie(values=sentiment_counts.values, names=sentiment_counts.index)
+
+    # === Radar Chart ===
+    # No emotion scores are stored yet; placeholder values are seeded by movie
+    # so a cached radar looks the same as a freshly built one
+    rng = np.random.default_rng(zlib.crc32(str(movie_id).encode()))
+    emotions = reviews.reindex(columns=EMOTION_COLS).assign(**{
+        col: rng.uniform(0, 1, len(reviews))
+        for col in EMOTION_COLS if col not in reviews.columns
+    })
+    radar_df = emotions.mean().reset_index()
+    radar_df.columns = ['emotion', 'value']
+    radar_df = pd.concat([radar_df, radar_df.iloc[0:1]])
+    figures['radar'] = px.line_polar(radar_df, r='value', theta='emotion', line_close=True, markers=True)
+
+    # === Average Sentiment per Label ===
+    if not reviews.empty:
+        avg_df = reviews.groupby('sentiment_label')['sentiment_score'].mean().reset_index()
+        figures['labels'] = px.bar(avg_df, x='sentiment_label', y='sentiment_score')
+
+    return figures
+
+
+def smooth_series(series, grain, window=1):
+    """
+    Rolling-window statistics over a precomputed sentiment series.
+    Periods without reviews are filled in, so a window always spans the same
+    length of time, and each window pools the counts and sums of its periods
+    rather than averaging their means.
+    Args:
+        series (pd.DataFrame): period, n, score_sum and score_sq, as returned by ReviewStore.sentiment_series
+        grain (str): Grain of the series
+        window (int): Window length in periods (1 = no smoothing)
+    Returns:
+        pd.DataFrame: period, n, mean and std for every period
+    """
+    sums = series.set_index('period')[['n', 'score_sum', 'score_sq']]
+    if sums.empty:
+        return pd.DataFrame(columns=['period', 'n', 'mean', 'std'])
+    sums = sums.reindex(pd.date_range(sums.index.min(), sums.index.max(), freq=GRAIN_FREQS[grain]), fill_value=0)
+    rolled = sums.rolling(window, min_periods=1).sum()
+
+    n = rolled['n'].where(rolled['n'] > 0)
+    mean = rolled['score_sum'] / n
+    variance = (rolled['score_sq'] - n * mean ** 2) / (n - 1)
+    return pd.DataFrame({
+        'period': rolled.index,
+        'n': rolled['n'].astype(int).to_numpy(),
+        'mean': mean.to_numpy(),
+        'std': np.sqrt(variance.clip(lower=0)).to_numpy(),
+    })
+
+
+def review_series(reviews, grain):
+    """
+    A sentiment time series counted from reviews, in the shape of ReviewStore.sentiment_series.
+    Args:
+        reviews (pd.DataFrame): sentiment_score and date of each review
+        grain (str): 'day', 'week', 'month' or 'year'
+    Returns:
+        pd.DataFrame: period (start date), n, score_sum and score_sq, oldest first
+    """
+    dated = reviews.dropna(subset=['date'])
+    periods = dated['date'].dt.to_period(GRAIN_PERIODS[grain]).dt.start_time
+    scores = dated['sentiment_score']
+    series = pd.DataFrame({'n': scores.notna(), 'score_sum': scores.fillna(0), 'score_sq': scores.fillna(0) ** 2})
+    series = series.groupby(periods.to_numpy()).sum()
+    return series.rename_axis('period').reset_index()
+
+
+def build_trend_figure(store, movie_id, grain=DEFAULT_GRAIN, window=1):
+    """The sentiment trend of one movie at a given grain, smoothed over `window` periods (None when undated)."""
+    return trend_figure(store.sentiment_series(movie_id, grain), grain, window)
+
+
+def trend_figure(series, grain=DEFAULT_GRAIN, window=1):
+    """The trend chart of a sentiment series (see review_series), smoothed over `window` periods (None when empty)."""
+    import plotly.express as px
+
+    trend = smooth_series(series, grain, window)
+    if trend.empty:
+        return None
+    title = f"{GRAIN_LABELS[grain]} Sentiment Trend"
+    if window > 1:
+        title += f" ({window}-{grain} rolling window)"
+    fig = px.line(
+        trend,
+        x='period',
+        y='mean',
+        title=title,
+        hover_data={'n': True, 'std': ':.2f'},
+        labels={'mean': 'Average Sentiment Score', 'period': 'Period', 'n': 'Reviews', 'std': 'Std. Deviation'}
+    )
+    if grain == 'year':
+        fig.update_layout(xaxis_tickformat="%Y")  # Only show year
+    return fig
+
+
+def build_comparison_figures(store, movie_ids, titles):
+    """
+    Build the compare-mode charts for several movies at once.
+    Args:
+        store (ReviewStore): Review store
+        movie_ids (list): Movie ids to compare, in display order
+        titles (dict): Movie id -> title
+    Returns:
+        dict: 'distribution', 'mean' and 'trend' figures (None when there is no data)
+    """
+    distribution, yearly = store.compare_movies(movie_ids)
+    return comparison_figures(distribution, yearly, movie_ids, titles)
+
+
+def comparison_figures(distribution, yearly, movie_ids, titles):
+    """
+    The charts of build_comparison_figures(), from per-movie summaries.
+    Args:
+        distribution (pd.DataFrame): id, sentiment_label, n and mean_score
+        yearly (pd.DataFrame): id, year, n and mean_score
+        movie_ids (list): Movie ids to compare, in display order
+        titles (dict): Movie id -> title
+    Returns:
+        dict: 'distribution', 'mean' and 'trend' figures (None when there is no data)
+    """
+    import plotly.express as px
+
+    order = [titles[movie_id] for movie_id in movie_ids]
+    figures = {'distribution': None, 'mean': None, 'trend': None}
+
+    # === Sentiment Distribution (share of each label) ===
+    if not distribution.empty:
+        distribution['title'] = distribution['id'].map(titles)
+        distribution['share'] = distribution['n'] / distribution.groupby('id')['n'].transform('sum')
+        figures['distribution'] = px.bar(
+            distribution, x='title', y='share', color='sentiment_label',
+            category_orders={'title': order},
+            labels={'share': 'Share of Reviews', 'title': 'Movie', 'sentiment_label': 'Sentiment'}
+        )
+
+        # === Mean Sentiment (weighted from the per-label sums, no extra query) ===
+        totals = distribution.assign(score_sum=distribution['n'] * distribution['mean_score'])
+        totals = totals.groupby('title')[['n', 'score_sum']].sum()
+        mean_df = (totals['score_sum'] / totals['n']).reindex(order).rename('mean_score').reset_index()
+        figures['mean'] = px.bar(
+            mean_df, x='title', y='mean_score',
+            labels={'mean_score': 'Average Sentiment Score', 'title': 'Movie'}
+        )
+
+    # === Yearly Trends, aligned on a shared year axis ===
+    if not yearly.empty:
+        trend = yearly.pivot(index='year', columns='id', values='mean_score')
+        trend = trend.reindex(range(trend.index.min(), trend.index.max() + 1))
+        trend = trend.reindex(columns=[m for m in movie_ids if m in trend.columns]).rename(columns=titles)
+        fig = px.line(
+            trend, markers=True, title='Yearly Sentiment Trend',
+            labels={'value': 'Average Sentiment Score', 'year': 'Year', 'variable': 'Movie'}
+        )
+        fig.update_traces(connectgaps=True)
+        figures['trend'] = fig
+
+    return figures
+
+
+def build_genre_figures(store):
+    """
+    Sentiment per genre over the whole catalog.
+    Args:
+        store (ReviewStore): Review store
+    Returns:
+        dict: 'distribution' and 'mean' figures (None when there is no data)
+    """
+    import plotly.express as px
+
+    stats = store.genre_sentiment()
+    figures = {'distribution': None, 'mean': None}
+    if stats.empty:
+        return figures
+
+    stats['share'] = stats['n'] / stats.groupby('genre')['n'].transform('sum')
+    # Genres ordered from most to least positive
+    positive = stats[stats['sentiment_label'] == 'Positive'].set_index('genre')['share']
+    order = positive.reindex(stats['genre'].unique()).fillna(0).sort_values(ascending=False).index.tolist()
+    figures['distribution'] = px.bar(
+        stats, x='genre', y='share', color='sentiment_label',
+        category_orders={'genre': order},
+        hover_data={'n': True, 'share': ':.1%'},
+        labels={'share': 'Share of Reviews', 'genre': 'Genre', 'sentiment_label': 'Sentiment', 'n': 'Reviews'}
+    )
+
+    totals = stats.assign(score_sum=stats['n'] * stats['mean_score']).groupby('genre')[['n', 'score_sum']].sum()
+    mean_df = (totals['score_sum'] / totals['n']).rename('mean_score').sort_values(ascending=False).reset_index()
+    figures['mean'] = px.bar(
+        mean_df, x='genre', y='mean_score',
+        labels={'mean_score': 'Average Sentiment Score', 'genre': 'Genre'}
+    )
+    return figures
+
+
+def build_genre_trend_figure(store, genres, grain=DEFAULT_GRAIN, window=1):
+    """The sentiment trends of several genres, one line each (None when there is no data)."""
+    import plotly.express as px
+
+    trends = []
+    for genre in genres:
+        trend = smooth_series(store.genre_series(genre, grain), grain, window)
+        if not trend.empty:
+            trends.append(trend.assign(genre=genre))
+    if not trends:
+        return None
+    title = f"{GRAIN_LABELS[grain]} Sentiment Trend by Genre"
+    if window > 1:
+        title += f" ({window}-{grain} rolling window)"
+    fig = px.line(
+        pd.concat(trends, ignore_index=True),
+        x='period',
+        y='mean',
+        color='genre',
+        title=title,
+        hover_data={'n': True, 'std': ':.2f'},
+        labels={'mean': 'Average Sentiment Score', 'period': 'Period', 'n': 'Reviews', 'std': 'Std. Deviation',
+                'genre': 'Genre'}
+    )
+    fig.update_traces(connectgaps=True)
+    if grain == 'year':
+        fig.update_layout(xaxis_tickformat="%Y")
+    return fig
+
+
+def filtered_reviews(store, bitmaps, filters, movie_id):
+    """One movie's reviews that match the cross-filter: sentiment_score, sentiment_label and date."""
+    rows = bitmaps.matching_rows(movie_id, filters)
+    return store.reviews_for_movie(movie_id, columns=['sentiment_score', 'sentiment_label', 'date'], rows=rows)
+
+
+def build_filtered_movie_figures(store, bitmaps, filters, movie_id, grain=DEFAULT_GRAIN, window=1):
+    """
+    One movie's charts, built from its reviews that match the cross-filter.
+    Args:
+        store (ReviewStore): Review store
+        bitmaps (ReviewBitmaps): Review bitmaps
+        filters (dict): Cross-filter selection
+        movie_id (str): Movie id
+        grain (str): Grain of the trend chart
+        window (int): Rolling window of the trend chart
+    Returns:
+        dict: The 'pie', 'radar' and 'labels' figures of build_movie_figures(), the
+        'trend' figure and a 'years' bar of matching reviews (None when no review matches)
+    """
+    import plotly.express as px
+
+    reviews = filtered_reviews(store, bitmaps, filters, movie_id)
+    figures = {'pie': None, 'radar': None, 'labels': None, 'trend': None, 'years': None}
+    if reviews.empty:
+        return figures
+    figures.update(movie_figures(reviews, reviews['sentiment_label'].value_counts(sort=False), movie_id))
+    figures['trend'] = trend_figure(review_series(reviews, grain), grain, window)
+    years = reviews['date'].dropna().dt.year.value_counts().sort_index()
+    if not years.empty:
+        figures['years'] = px.bar(x=years.index, y=years.to_numpy(), title="Reviews per Year",
+                                  labels={'x': 'Review Year', 'y': 'Reviews'})
+    return figures
+
+
+def build_filtered_comparison_figures(store, bitmaps, filters, movie_ids, titles):
+    """The compare-mode charts, built from the reviews that match the cross-filter (see build_comparison_figures)."""
+    reviews = pd.concat([filtered_reviews(store, bitmaps, filters, movie_id).assign(id=movie_id)
+                         for movie_id in movie_ids], ignore_index=True)
+    if reviews.empty:
+        return {'distribution': None, 'mean': None, 'trend': None}
+    # Summed like the store's precomputed tables: n counts every review, means skip missing scores
+    distribution = reviews.groupby(['id', 'sentiment_label'], sort=False).agg(
+        n=('sentiment_label', 'size'), score_sum=('sentiment_score', 'sum')).reset_index()
+    distribution['mean_score'] = distribution.pop('score_sum') / distribution['n']
+    dated = reviews.dropna(subset=['date', 'sentiment_score']).assign(year=lambda df: df['date'].dt.year)
+    yearly = dated.groupby(['id', 'year'], sort=False).agg(
+        n=('sentiment_score', 'size'), mean_score=('sentiment_score', 'mean')).reset_index()
+    return comparison_figures(distribution, yearly, movie_ids, titles)
+
+
+@st.cache_resource
+def get_figure_cache():
+    return FigureCache()
+
+
+def get_movie_figures(store, movie_id, version):
+    """The cached figures for a movie, building them on a miss."""
+    cache = get_figure_cache()
+    key = (movie_id, version)
+    with perf.section("movie figures", cache="figures"):
+        figures = cache.get(key)
+        if figures is None:
+            perf.cache_miss("figures")
+            figures = build_movie_figures(store, movie_id)
+            cache.put(key, figures)
+        return figures
+
+
+def get_trend_figure(store, movie_id, grain, window, version):
+    """The cached trend figure for a movie, grain and window, building it on a miss."""
+    cache = get_figure_cache()
+    key = (movie_id, grain, window, version)
+    with perf.section("trend figure", cache="figures"):
+        if key in cache:
+            return cache.get(key)
+        perf.cache_miss("figures")
+        figure = build_trend_figure(store, movie_id, grain, window)
+        cache.put(key, figure)
+        return figure
+
+
+def get_comparison_figures(store, movie_ids, titles, version):
+    """The cached compare-mode figures for a selection of movies, building them on a miss."""
+    cache = get_figure_cache()
+    key = (tuple(movie_ids), version)
+    with perf.section("comparison figures", cache="figures"):
+        figures = cache.get(key)
+        if figures is None:
+            perf.cache_miss("figures")
+            figures = build_comparison_figures(store, movie_ids, titles)
+            cache.put(key, figures)
+        return figures
+
+
+def get_genre_figures(store, version):
+    """The cached per-genre figures, building them on a miss."""
+    cache = get_figure_cache()
+    key = ('genres', version)
+    with perf.section("genre figures", cache="figures"):
+        figures = cache.get(key)
+        if figures is None:
+            perf.cache_miss("figures")
+            figures = build_genre_figures(store)
+            cache.put(key, figures)
+        return figures
+
+
+def get_genre_trend_figure(store, genres, grain, window, version):
+    """The cached trend figure for a selection of genres, grain and window, building it on a miss."""
+    cache = get_figure_cache()
+    key = ('genre trend', tuple(genres), grain, window, version)
+    with perf.section("genre trend figure", cache="figures"):
+        if key in cache:
+            return cache.get(key)
+        perf.cache_miss("figures")
+        figure = build_genre_trend_figure(store, genres, grain, window)
+        cache.put(key, figure)
+        return figure
+
+
+def warm_up(store, cache, version, limit=WARMUP_MOVIES):
+    """Build and cache figures for the most reviewed movies."""
+    for movie_id in store.most_reviewed_movies(limit):
+        if (movie_id, version) not in cache:
+            cache.put((movie_id, version), build_movie_figures(store, movie_id))
+        if (movie_id, DEFAULT_GRAIN, 1, version) not in cache:
+            cache.put((movie_id, DEFAULT_GRAIN, 1, version), build_trend_figure(store, movie_id))
+
+
+@st.cache_resource(max_entries=1)
+def start_warm_up(_store, version):
+    """Start warming the figure cache in the background, once per data version."""
+    thread = threading.Thread(target=warm_up, args=(_store, get_figure_cache(), version),
+                              name="figure-warmup", daemon=True)
+    thread.start()
+    return thread
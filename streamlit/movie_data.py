@@ -0,0 +1,187 @@
+"""
+Shared data access for the Streamlit pages.
+
+Every dataset is loaded once per server process and shared by all sessions and
+pages. Each cached loader is keyed by the (mtime, size) signature of the files
+it reads, so replacing a file makes the next rerun load the new version, while
+unchanged files are never parsed again on navigation or rerun.
+
+Datasets are cached with st.cache_resource, so they are not pickled and copied
+for every caller: the pages query the shared review store rather than whole
+tables, and arrays handed out directly are marked read-only.
+"""
+import os
+import sys
+
+import pandas as pd
+import streamlit as st
+
+import perf
+from review_bitmaps import MOVIE_ATTRIBUTES, ReviewBitmaps
+from review_store import MOVIES_SOURCES, REVIEWS_SOURCES, first_existing, open_review_store
+from title_index import TitleIndex
+
+WORD_FREQ_CSV = "word_frequencies.csv"
+WORDCLOUD_CACHE_DIR = "wordcloud_cache"
+ANALYSIS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Analysis")
+
+
+def file_signature(*paths):
+    """(mtime_ns, size) of each path, or None for paths that do not exist."""
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except (OSError, TypeError):
+            signature.append(None)
+        else:
+            signature.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def source_files():
+    """The pipeline outputs the pages are built from."""
+    return first_existing(REVIEWS_SOURCES), first_existing(MOVIES_SOURCES)
+
+
+def data_available():
+    return all(source_files())
+
+
+def data_version():
+    """Changes whenever one of the source files is replaced."""
+    return file_signature(*source_files())
+
+
+def built_from_current_reviews(path):
+    """Whether a file built offline from the reviews exists and is not older than them."""
+    built, reviews = file_signature(path, first_existing(REVIEWS_SOURCES))
+    return built is not None and (reviews is None or built[0] >= reviews[0])
+
+
+def read_only(array):
+    if array is not None:
+        array.setflags(write=False)
+    return array
+
+
+# === Review store ===
+
+@st.cache_resource(show_spinner="Loading reviews...", max_entries=1)
+def _open_store(version):
+    perf.cache_miss("store")
+    return open_review_store()
+
+
+def get_review_store():
+    with perf.section("open review store", cache="store"):
+        return _open_store(data_version())
+
+
+# === Movie titles ===
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _load_title_index(version):
+    perf.cache_miss("title index")
+    movies = _open_store(version).movies(['id', 'title'])
+    return TitleIndex(movies['id'], movies['title'])
+
+
+def load_title_index():
+    """Titles and ids of every movie with a prefix search, built once per data version."""
+    with perf.section("title index", cache="title index"):
+        return _load_title_index(data_version())
+
+
+# === Review bitmaps ===
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _load_review_bitmaps(version):
+    perf.cache_miss("bitmaps")
+    store = _open_store(version)
+    return ReviewBitmaps(store.movies(['id', 'title', *MOVIE_ATTRIBUTES]), store.bitmap_prefix)
+
+
+def load_review_bitmaps():
+    """Bitmap indexes for the cross-filter panel, memory-mapped once per data version."""
+    with perf.section("review bitmaps", cache="bitmaps"):
+        return _load_review_bitmaps(data_version())
+
+
+# === Word clouds ===
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _load_word_frequencies(signature):
+    """{movie_id: {word: count}}, shared by every session; do not modify."""
+    perf.cache_miss("word frequencies")
+    # Precomputed offline by Analysis/WordFrequencies.py
+    if signature[0] is None:
+        return {}
+    freq_df = pd.read_csv(WORD_FREQ_CSV, dtype={'id': str, 'word': str})
+    return {
+        movie_id: dict(zip(group['word'], group['count']))
+        for movie_id, group in freq_df.groupby('id', sort=False)
+    }
+
+
+def _count_words(texts):
+    """Word counts of review texts, tokenized like the offline table."""
+    from collections import Counter
+    if ANALYSIS_DIR not in sys.path:
+        sys.path.insert(0, ANALYSIS_DIR)
+    from WordFrequencies import MAX_WORDS, tokenize
+
+    counter = Counter()
+    for text in texts:
+        counter.update(tokenize(text))
+    return dict(counter.most_common(MAX_WORDS))
+
+
+def _wordcloud_array(frequencies, width, height):
+    from wordcloud import WordCloud
+
+    if not frequencies:
+        return None
+    wordcloud = WordCloud(width=width, height=height, background_color='white').generate_from_frequencies(frequencies)
+    return read_only(wordcloud.to_array())
+
+
+@st.cache_resource(show_spinner=False, max_entries=256)
+def _render_wordcloud(movie_id, width, height, signature, version):
+    perf.cache_miss("word cloud")
+    import numpy as np
+    from PIL import Image
+
+    # Prefer the image rendered offline for this movie and size, unless the reviews changed since
+    cached_path = os.path.join(WORDCLOUD_CACHE_DIR, f"{movie_id}_{width}x{height}.png")
+    if built_from_current_reviews(cached_path):
+        return read_only(np.array(Image.open(cached_path)))
+
+    frequencies = None
+    if built_from_current_reviews(WORD_FREQ_CSV):
+        frequencies = _load_word_frequencies(file_signature(WORD_FREQ_CSV)).get(movie_id)
+    if frequencies is None:
+        # No table (or an outdated one): count this movie's words from the review store
+        frequencies = _count_words(_open_store(version).texts.movie_texts(movie_id))
+    return _wordcloud_array(frequencies, width, height)
+
+
+def render_wordcloud(movie_id, width, height):
+    """Word cloud image array for a movie, or None if it has no words."""
+    cached_path = os.path.join(WORDCLOUD_CACHE_DIR, f"{movie_id}_{width}x{height}.png")
+    with perf.section("word cloud", cache="word cloud"):
+        return _render_wordcloud(movie_id, width, height, file_signature(WORD_FREQ_CSV, cached_path), data_version())
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _render_filtered_wordcloud(movie_id, filter_key, width, height, version):
+    perf.cache_miss("word cloud")
+    rows = _load_review_bitmaps(version).matching_rows(movie_id, dict(filter_key))
+    return _wordcloud_array(_count_words(_open_store(version).texts.texts(rows)), width, height)
+
+
+def render_filtered_wordcloud(movie_id, filters, width, height):
+    """Word cloud image array of a movie's reviews that match the cross-filter, or None if they have no words."""
+    filter_key = tuple(sorted((dimension, tuple(values)) for dimension, values in filters.items()))
+    with perf.section("word cloud", cache="word cloud"):
+        return _render_filtered_wordcloud(movie_id, filter_key, width, height, data_version())
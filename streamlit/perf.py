@@ -0,0 +1,150 @@
+"""
+Per-section timing and cache-hit counters for the Streamlit pages.
+
+Instrumentation is off unless the MOVIEVIZ_PERF environment variable is set
+(or the page is opened with ?perf=1). When it is off, section() hands back one
+shared no-op context manager and the cache counters return immediately, so the
+pages pay a thread-local lookup per call and nothing else.
+
+When it is on, each script run gets its own record (kept per thread, so the
+background figure warm-up is not counted). Every finished section is logged
+as one JSON line on the "movieviz.perf" logger (to stderr, or to the file
+named by MOVIEVIZ_PERF_LOG), and a sidebar panel shows the current run's
+breakdown next to the totals of the last few reruns. The panel is drawn once,
+by finish_run(), so pages call it before every st.stop(). Sections never draw
+anything themselves: they may run inside cached functions, where Streamlit
+forbids writing to elements created outside the function.
+
+    with perf.section("word cloud", cache="wordcloud"):
+        image = render_wordcloud(...)      # calls perf.cache_miss("wordcloud") when it computes
+"""
+import contextlib
+import json
+import logging
+import os
+import threading
+import time
+
+import streamlit as st
+
+ENABLED = os.environ.get("MOVIEVIZ_PERF", "") not in ("", "0")
+LOG_PATH = os.environ.get("MOVIEVIZ_PERF_LOG")
+HISTORY_SIZE = 5
+
+logger = logging.getLogger("movieviz.perf")
+_local = threading.local()
+_NO_OP = contextlib.nullcontext()
+
+
+class RunStats:
+    """Timings and cache counters of one script run."""
+
+    def __init__(self, page):
+        self.page = page
+        self.started = time.perf_counter()
+        self.sections = {}  # name -> seconds, summed over repeated sections
+        self.caches = {}    # name -> [lookups, misses]
+        self.panel = None
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def summary(self):
+        return {
+            "page": self.page,
+            "total_ms": round(self.elapsed() * 1000, 1),
+            "sections": {name: round(seconds * 1000, 1) for name, seconds in self.sections.items()},
+            "caches": {name: {"hits": lookups - misses, "misses": misses}
+                       for name, (lookups, misses) in self.caches.items()},
+        }
+
+
+class _Section:
+    def __init__(self, run, name, cache):
+        self.run = run
+        self.name = name
+        self.cache = cache
+
+    def __enter__(self):
+        if self.cache:
+            self.run.caches.setdefault(self.cache, [0, 0])[0] += 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self.start
+        self.run.sections[self.name] = self.run.sections.get(self.name, 0.0) + seconds
+        record = {"page": self.run.page, "section": self.name, "ms": round(seconds * 1000, 1)}
+        if self.cache:
+            record["cache"] = self.cache
+        logger.info(json.dumps(record))
+        return False
+
+
+def _configure_logger():
+    if logger.handlers:
+        return
+    handler = logging.FileHandler(LOG_PATH, encoding="utf-8") if LOG_PATH else logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def start_run(page):
+    """Begin recording this script run; a no-op unless instrumentation is enabled."""
+    _local.run = None
+    if not (ENABLED or st.query_params.get("perf") == "1"):
+        return None
+    _configure_logger()
+    run = RunStats(page)
+    run.panel = st.sidebar.empty()
+    _local.run = run
+    return run
+
+
+def section(name, cache=None):
+    """
+    Time a block of the page.
+    Args:
+        name (str): Section name shown in the logs and the panel
+        cache (str): Name of the cache the block reads from, counted as one lookup
+    """
+    run = getattr(_local, "run", None)
+    if run is None:
+        return _NO_OP
+    return _Section(run, name, cache)
+
+
+def cache_miss(name):
+    """Call from inside a cached function's body: it only runs when the cache missed."""
+    run = getattr(_local, "run", None)
+    if run is not None:
+        run.caches.setdefault(name, [0, 0])[1] += 1
+
+
+def finish_run():
+    """Log the run's summary and add it to this session's rerun history."""
+    run = getattr(_local, "run", None)
+    if run is None:
+        return
+    summary = run.summary()
+    logger.info(json.dumps({"event": "run", **summary}))
+    history = st.session_state.setdefault("perf_history", [])
+    history.append({"page": run.page, "total_ms": summary["total_ms"]})
+    del history[:-HISTORY_SIZE]
+    _render_panel(run)
+    _local.run = None
+
+
+def _render_panel(run):
+    with run.panel.container():
+        with st.expander("⏱️ Performance", expanded=True):
+            summary = run.summary()
+            st.markdown(f"**This run:** {summary['total_ms']:.0f} ms so far")
+            st.table([{"section": name, "ms": ms} for name, ms in summary["sections"].items()])
+            if summary["caches"]:
+                st.table([{"cache": name, **counts} for name, counts in summary["caches"].items()])
+            history = st.session_state.get("perf_history", [])
+            if history:
+                st.markdown("**Previous runs:** " + ", ".join(f"{entry['total_ms']:.0f} ms" for entry in history))
@@ -0,0 +1,277 @@
+"""
+Bitmap indexes over the reviews, for cross-filtering.
+
+Review rows are numbered in store order (sorted by movie, then date), so each
+filter value maps to a set of rows, kept as a bitmap of uint64 words where
+row r is bit r % 64 of word r // 64. Combining filters is a bitwise AND of
+bitmaps (OR within one dimension), and every count behind a chart is a
+popcount of the result.
+
+Two kinds of dimension are indexed:
+    review-level  sentiment_label, review_year   one row bitmap per value, written
+                                                 with the store and memory-mapped
+    movie-level   movie, original_language,      one bit per movie; a movie's reviews
+                  release_year, director         are one contiguous run of rows, so
+                                                 these are run-length encoded row
+                                                 bitmaps and cost nothing per review
+
+Files written for a prefix such as "reviews_bitmaps":
+    reviews_bitmaps.npy     uint64 words, one row of words per review-level value
+    reviews_bitmaps.json    number of rows, the (dimension, value) of each bitmap,
+                            and each movie's [first_row, end_row)
+"""
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+BITMAP_PREFIX = "reviews_bitmaps"
+ROW_DIMENSIONS = ['sentiment_label', 'review_year']
+MOVIE_DIMENSIONS = ['movie', 'original_language', 'release_year', 'director']
+MOVIE_ATTRIBUTES = ['original_language', 'release_year', 'director']
+
+
+def bitmap_paths(prefix=BITMAP_PREFIX):
+    return f"{prefix}.npy", f"{prefix}.json"
+
+
+def pack_rows(flags):
+    """Pack a boolean array over the rows into uint64 words."""
+    packed = np.packbits(np.asarray(flags, dtype=bool), bitorder='little')
+    padded = np.zeros(-(-len(packed) // 8) * 8, dtype=np.uint8)
+    padded[:len(packed)] = packed
+    return padded.view('<u8')
+
+
+def popcount(words):
+    """Number of set bits in an array of uint64 words."""
+    return int(np.bitwise_count(words).sum(dtype=np.int64))
+
+
+def range_counts(words, starts, ends):
+    """
+    Set bits of a row bitmap within each [start, end) row range, for all ranges at once.
+    Args:
+        words (np.ndarray): Row bitmap
+        starts (np.ndarray): First row of each range
+        ends (np.ndarray): End row of each range
+    Returns:
+        np.ndarray: Count per range
+    """
+    # A trailing zero word lets a boundary at the very end index one word past the bitmap
+    words = np.append(words, np.uint64(0))
+    cumulative = np.concatenate([[0], np.cumsum(np.bitwise_count(words), dtype=np.int64)])
+
+    def prefix(rows):
+        word, bit = rows // 64, (rows % 64).astype(np.uint64)
+        low_bits = (np.uint64(1) << bit) - np.uint64(1)
+        return cumulative[word] + np.bitwise_count(words[word] & low_bits)
+
+    return prefix(np.asarray(ends, dtype=np.int64)) - prefix(np.asarray(starts, dtype=np.int64))
+
+
+def write_review_bitmaps(movie_ids, sentiment_labels, dates, prefix=BITMAP_PREFIX):
+    """
+    Write the review-level bitmaps for reviews already in store order.
+    Args:
+        movie_ids (pd.Series): Movie id of each review, grouped by movie
+        sentiment_labels (pd.Series): Sentiment label of each review
+        dates (pd.Series): Review date as YYYY-MM-DD (None when unknown)
+        prefix (str): Path prefix of the output files
+    """
+    words_path, meta_path = bitmap_paths(prefix)
+    tmp = f"{os.getpid()}-{threading.get_ident()}.tmp"
+    n_rows = len(movie_ids)
+    # Factorized first: there are only a few thousand distinct dates however many reviews there are
+    date_codes, unique_dates = pd.factorize(pd.Series(dates), sort=True)
+    years = pd.to_numeric(pd.Series(unique_dates, dtype=object).str[:4], errors='coerce').to_numpy()
+    year_codes, unique_years = pd.factorize(np.where(date_codes >= 0, years[date_codes], np.nan), sort=True)
+    label_codes, unique_labels = pd.factorize(pd.Series(sentiment_labels), sort=True)
+
+    keys, bitmaps = [], []
+    for dimension, codes, values in [('sentiment_label', label_codes, [str(v) for v in unique_labels]),
+                                     ('review_year', year_codes, [int(v) for v in unique_years])]:
+        for code, value in enumerate(values):
+            keys.append([dimension, value])
+            bitmaps.append(pack_rows(codes == code))
+    n_words = len(pack_rows(np.zeros(n_rows, dtype=bool)))
+    words = np.vstack(bitmaps) if bitmaps else np.zeros((0, n_words), dtype='<u8')
+
+    ids = pd.Series(movie_ids).astype(str).to_numpy()
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]]) if n_rows else np.array([], dtype=np.int64)
+    ends = np.r_[starts[1:], n_rows]
+    movies = [[ids[start], int(start), int(end)] for start, end in zip(starts, ends)]
+    if len({movie_id for movie_id, _, _ in movies}) != len(movies):
+        raise ValueError("Reviews are not grouped by movie")
+
+    with open(f"{words_path}.{tmp}", "wb") as f:
+        np.save(f, words)
+    with open(f"{meta_path}.{tmp}", "w", encoding="utf-8") as f:
+        json.dump({'rows': n_rows, 'keys': keys, 'movies': movies}, f)
+    for path in (words_path, meta_path):
+        os.replace(f"{path}.{tmp}", path)
+
+
+class ReviewBitmaps:
+    """
+    Cross-filter counts over the reviews.
+    Filters are a dict of dimension -> list of selected values; an empty or
+    missing list does not filter. Values are sentiment labels, review and
+    release years (int), language codes, director names and movie ids.
+    """
+
+    def __init__(self, movies, prefix=BITMAP_PREFIX):
+        """
+        Args:
+            movies (pd.DataFrame): id and title plus the MOVIE_ATTRIBUTES columns of every movie
+            prefix (str): Path prefix of the bitmap files
+        """
+        words_path, meta_path = bitmap_paths(prefix)
+        self.words = np.load(words_path, mmap_mode="r")
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        self.n_rows = meta['rows']
+        self.bitmap_index = {(dimension, value): i for i, (dimension, value) in enumerate(meta['keys'])}
+        self.row_values = {dimension: [value for dim, value in meta['keys'] if dim == dimension]
+                           for dimension in ROW_DIMENSIONS}
+        self.row_totals = {key: popcount(self.words[i]) for key, i in self.bitmap_index.items()}
+
+        # Movies in row order; movies without reviews get an empty range
+        ranges = pd.DataFrame(meta['movies'], columns=['id', 'start', 'end'])
+        movies = movies.assign(
+            id=movies['id'].astype(str),
+            release_year=pd.to_numeric(movies['release_year'], errors='coerce').astype('Int64')
+        ).drop_duplicates('id')
+        self.movies = ranges.merge(movies, on='id', how='outer', sort=False)
+        self.movies[['start', 'end']] = self.movies[['start', 'end']].fillna(self.n_rows).astype(np.int64)
+        self.movies = self.movies.sort_values('start', kind='stable').reset_index(drop=True)
+        self.movies['movie'] = self.movies['id']
+        self.lengths = (self.movies['end'] - self.movies['start']).to_numpy()
+
+    # === Building blocks ===
+
+    def _row_filter(self, filters, exclude=None):
+        """AND of the review-level filters as a row bitmap (None when none applies)."""
+        result = None
+        for dimension in ROW_DIMENSIONS:
+            values = filters.get(dimension)
+            if dimension == exclude or not values:
+                continue
+            selected = np.zeros(self.words.shape[1], dtype='<u8')
+            for value in values:
+                i = self.bitmap_index.get((dimension, value))
+                if i is not None:
+                    selected |= self.words[i]
+            result = selected if result is None else result & selected
+        return result
+
+    def _movie_filter(self, filters, exclude=None):
+        """AND of the movie-level filters as a boolean array over movies (None when none applies)."""
+        result = None
+        for dimension in MOVIE_DIMENSIONS:
+            values = filters.get(dimension)
+            if dimension == exclude or not values:
+                continue
+            selected = self.movies[dimension].isin(values).to_numpy()
+            result = selected if result is None else result & selected
+        return result
+
+    def _movie_rows(self, movie_mask):
+        """Expand a boolean array over movies into a row bitmap."""
+        flags = np.zeros(self.n_rows, dtype=bool)
+        flags[:self.lengths.sum()] = np.repeat(movie_mask, self.lengths)
+        return pack_rows(flags)
+
+    def _per_movie(self, filters, exclude=None, and_bitmap=None):
+        """Matching reviews of each movie, under every filter but `exclude`."""
+        rows = self._row_filter(filters, exclude)
+        if and_bitmap is not None:
+            rows = and_bitmap if rows is None else rows & and_bitmap
+        counts = self.lengths.copy() if rows is None else range_counts(rows, self.movies['start'], self.movies['end'])
+        movie_mask = self._movie_filter(filters, exclude)
+        return counts if movie_mask is None else np.where(movie_mask, counts, 0)
+
+    def _label_bitmap(self, sentiment_label):
+        i = self.bitmap_index.get(('sentiment_label', sentiment_label))
+        return self.words[i] if i is not None else np.zeros(self.words.shape[1], dtype='<u8')
+
+    # === Counts ===
+
+    def total(self, filters):
+        """Number of reviews matching every filter."""
+        return int(self._per_movie(filters).sum())
+
+    def movie_counts(self, filters, sentiment_label=None):
+        """
+        Matching reviews per movie.
+        Args:
+            filters (dict): Cross-filter selection
+            sentiment_label (str): Only count reviews with this label as well
+        Returns:
+            pd.Series: Count per movie id, in row order
+        """
+        bitmap = self._label_bitmap(sentiment_label) if sentiment_label is not None else None
+        return pd.Series(self._per_movie(filters, and_bitmap=bitmap), index=self.movies['id'])
+
+    def matching_rows(self, movie_id, filters, sentiment_label=None):
+        """
+        The store rows of a movie's reviews that match every filter.
+        Args:
+            movie_id (str): Movie id
+            filters (dict): Cross-filter selection
+            sentiment_label (str): Only keep reviews with this label as well
+        Returns:
+            np.ndarray: Matching rows, ascending (i.e. oldest review first)
+        """
+        movie = self.movies.index[self.movies['id'] == movie_id]
+        if not len(movie):
+            return np.array([], dtype=np.int64)
+        movie_mask = self._movie_filter(filters)
+        if movie_mask is not None and not movie_mask[movie[0]]:
+            return np.array([], dtype=np.int64)
+        start, end = int(self.movies.at[movie[0], 'start']), int(self.movies.at[movie[0], 'end'])
+        rows = self._row_filter(filters)
+        if sentiment_label is not None:
+            label_rows = self._label_bitmap(sentiment_label)
+            rows = label_rows if rows is None else rows & label_rows
+        if rows is None:
+            return np.arange(start, end, dtype=np.int64)
+        # Only the words covering the movie's rows are unpacked
+        first_word = start // 64
+        words = np.ascontiguousarray(rows[first_word:-(-end // 64)])
+        flags = np.unpackbits(words.view(np.uint8), bitorder='little')[start - first_word * 64:end - first_word * 64]
+        return start + np.flatnonzero(flags)
+
+    def first_row(self, movie_id, filters, sentiment_label=None):
+        """The first review of a movie that matches every filter (store row), or None."""
+        rows = self.matching_rows(movie_id, filters, sentiment_label)
+        return int(rows[0]) if len(rows) else None
+
+    def counts(self, dimension, filters):
+        """
+        Matching reviews per value of one dimension, under every other filter,
+        so a chart (or filter list) of a dimension still shows the values not selected.
+        Args:
+            dimension (str): One of ROW_DIMENSIONS or MOVIE_DIMENSIONS
+            filters (dict): Cross-filter selection
+        Returns:
+            pd.Series: Count per value, sorted by value
+        """
+        if dimension in ROW_DIMENSIONS:
+            rows = self._row_filter(filters, exclude=dimension)
+            movie_mask = self._movie_filter(filters)
+            if movie_mask is not None:
+                movie_rows = self._movie_rows(movie_mask)
+                rows = movie_rows if rows is None else rows & movie_rows
+            values = self.row_values[dimension]
+            counts = [self.row_totals[(dimension, value)] if rows is None
+                      else popcount(self.words[self.bitmap_index[(dimension, value)]] & rows)
+                      for value in values]
+            return pd.Series(counts, index=pd.Index(values, name=dimension), dtype=np.int64)
+        if dimension in MOVIE_DIMENSIONS:
+            per_movie = pd.Series(self._per_movie(filters, exclude=dimension))
+            counts = per_movie.groupby(self.movies[dimension].to_numpy()).sum()
+            return counts.rename_axis(dimension).astype(np.int64)
+        raise ValueError(f"Unknown filter dimension: {dimension}")
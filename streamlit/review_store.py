@@ -0,0 +1,677 @@
+"""
+Indexed SQLite store behind the Streamlit pages.
+
+The store is built from the pipeline outputs (the Parquet files when present,
+otherwise the CSVs) and answers per-movie lookups with index seeks instead of
+boolean scans over the whole review table. Review text is kept out of SQLite in
+the memory-mapped text store (review_text_store.py); reviews.row is the row of
+the same review in that store. Full-text search goes through review_search, a
+contentless FTS5 index over the review text whose rowids are those same rows.
+
+    python review_store.py        # (re)build reviews.db in the current directory
+"""
+import ast
+import json
+import os
+import re
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+from review_bitmaps import BITMAP_PREFIX, bitmap_paths, write_review_bitmaps
+from review_text_store import TEXT_STORE_PREFIX, ReviewTextStore, text_store_paths, write_text_store
+
+DB_PATH = "reviews.db"
+REVIEWS_SOURCES = ["analyzed_reviews_with_id.parquet", "analyzed_reviews_with_id.csv"]
+MOVIES_SOURCES = ["movie_info_1.parquet", "movie_info_1.csv"]
+INSERT_CHUNK = 100_000
+
+SCHEMA = """
+CREATE TABLE movies (
+    id TEXT PRIMARY KEY,
+    title TEXT,
+    poster_url TEXT,
+    genres TEXT,
+    release_year INTEGER,
+    runtime INTEGER,
+    director TEXT,
+    user_score REAL,
+    original_language TEXT,
+    overview TEXT,
+    revenue INTEGER,
+    genre_mask INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE genres (
+    bit INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    movies INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE reviews (
+    row INTEGER PRIMARY KEY,
+    id TEXT NOT NULL,
+    sentiment_score REAL,
+    sentiment_label TEXT,
+    date TEXT
+);
+CREATE TABLE movie_sentiment (
+    id TEXT NOT NULL,
+    sentiment_label TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    score_sum REAL NOT NULL,
+    PRIMARY KEY (id, sentiment_label)
+) WITHOUT ROWID;
+CREATE TABLE sentiment_series (
+    id TEXT NOT NULL,
+    grain TEXT NOT NULL,
+    period TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    score_sum REAL NOT NULL,
+    score_sq REAL NOT NULL,
+    PRIMARY KEY (id, grain, period)
+) WITHOUT ROWID;
+CREATE TABLE genre_sentiment (
+    bit INTEGER NOT NULL,
+    sentiment_label TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    score_sum REAL NOT NULL,
+    PRIMARY KEY (bit, sentiment_label)
+) WITHOUT ROWID;
+CREATE TABLE genre_series (
+    bit INTEGER NOT NULL,
+    grain TEXT NOT NULL,
+    period TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    score_sum REAL NOT NULL,
+    score_sq REAL NOT NULL,
+    PRIMARY KEY (bit, grain, period)
+) WITHOUT ROWID;
+CREATE VIRTUAL TABLE review_search USING fts5(review, content='', tokenize='porter unicode61');
+"""
+
+INDEXES = """
+CREATE INDEX idx_reviews_movie_date ON reviews (id, date);
+CREATE INDEX idx_reviews_movie_label ON reviews (id, sentiment_label);
+CREATE INDEX idx_reviews_movie_score ON reviews (id, COALESCE(sentiment_score, -1e308));
+CREATE INDEX idx_reviews_label ON reviews (sentiment_label);
+CREATE INDEX idx_reviews_date ON reviews (date);
+CREATE INDEX idx_movie_sentiment_label ON movie_sentiment (sentiment_label, n);
+CREATE INDEX idx_movies_user_score ON movies (user_score);
+CREATE INDEX idx_movies_revenue ON movies (revenue);
+CREATE INDEX idx_movies_release_year ON movies (release_year);
+"""
+
+MOVIE_COLUMNS = ['id', 'title', 'poster_url', 'genres', 'release_year', 'runtime',
+                 'director', 'user_score', 'original_language', 'overview', 'revenue', 'genre_mask']
+RANKABLE_COLUMNS = ['user_score', 'revenue', 'release_year', 'runtime']
+REVIEW_COLUMNS = ['id', 'sentiment_score', 'sentiment_label', 'date', 'review']
+STORED_REVIEW_COLUMNS = ['row', 'id', 'sentiment_score', 'sentiment_label', 'date']
+SEARCH_LIMIT = 50
+# Start date (YYYY-MM-DD) of the period a day falls in, for each series grain;
+# weeks start on Monday
+SERIES_GRAINS = {
+    'day': "period",
+    'week': "date(period, '-6 days', 'weekday 1')",
+    'month': "substr(period, 1, 7) || '-01'",
+    'year': "substr(period, 1, 4) || '-01-01'",
+}
+REVIEW_PAGE_SIZE = 10
+# Sort key of score order: unscored reviews count as the lowest (the same
+# expression is indexed, so score pages stay range scans)
+SCORE_SORT_KEY = "COALESCE(sentiment_score, -1e308)"
+# TMDB's movie genres; a movie's genre_mask has bit i set for GENRE_NAMES[i].
+# Genres missing here are given the next free bits when the store is built,
+# so only ever append to this list
+GENRE_NAMES = ['Action', 'Adventure', 'Animation', 'Comedy', 'Crime', 'Documentary', 'Drama', 'Family',
+               'Fantasy', 'History', 'Horror', 'Music', 'Mystery', 'Romance', 'Science Fiction', 'TV Movie',
+               'Thriller', 'War', 'Western']
+MAX_GENRES = 63  # Bits in a signed SQLite integer
+
+
+def first_existing(paths):
+    return next((path for path in paths if os.path.exists(path)), None)
+
+
+def read_table(path, columns=None):
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path, columns=columns)
+    return pd.read_csv(path, usecols=columns)
+
+
+def parse_genres(value):
+    """
+    Genre names from a movie info cell: "Drama|Romance" as written by TMDB_API.py,
+    a real array in Parquet files, or the stringified list older CSVs hold.
+    """
+    if isinstance(value, str):
+        if value.startswith('['):
+            try:
+                value = ast.literal_eval(value)
+            except (ValueError, SyntaxError):
+                return []
+        else:
+            return [genre.strip() for genre in value.split('|') if genre.strip()]
+    if value is None or isinstance(value, float):
+        return []
+    return [str(genre) for genre in value]
+
+
+def genre_dictionary(genre_lists):
+    """GENRE_NAMES followed by any other genre in the data, in order of first appearance."""
+    names = list(GENRE_NAMES)
+    for genres in genre_lists:
+        names += [genre for genre in genres if genre not in names]
+    if len(names) > MAX_GENRES:
+        raise ValueError(f"{len(names)} genres do not fit in a {MAX_GENRES}-bit genre mask")
+    return names
+
+
+def genre_mask(genres, names):
+    """Multi-hot bitmask of genres over the genre dictionary `names`."""
+    mask = 0
+    for genre in genres:
+        mask |= 1 << names.index(genre)
+    return mask
+
+
+def _nullable(value):
+    if pd.isna(value):
+        return None
+    # Nullable integer columns hand out numpy scalars, which sqlite3 would store as blobs
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def rows_clause(rows):
+    """SQL condition (and its parameter) keeping only the given store rows, e.g. a cross-filter's matches."""
+    return " AND row IN (SELECT value FROM json_each(?))", json.dumps([int(row) for row in rows])
+
+
+def fts_query(text):
+    """
+    Turn search box input into an FTS5 query: "quoted phrases" stay phrases,
+    every other word is a term, and all of them must match.
+    """
+    parts = re.findall(r'"([^"]*)"|(\S+)', text)
+    terms = [phrase or word for phrase, word in parts]
+    return ' '.join('"' + term.replace('"', '""') + '"' for term in terms if term.strip())
+
+
+def build_review_store(reviews_path, movies_path, db_path=DB_PATH, text_prefix=TEXT_STORE_PREFIX,
+                       bitmap_prefix=BITMAP_PREFIX):
+    """
+    Build the SQLite store, the review text store and the review bitmaps from the pipeline outputs.
+    Every file is written to a temporary path and swapped in atomically,
+    so running pages keep reading the old copy until the new one is ready.
+    Args:
+        reviews_path (str): Analyzed reviews (.parquet or .csv)
+        movies_path (str): Movie info (.parquet or .csv)
+        db_path (str): Where to write the database
+        text_prefix (str): Path prefix of the review text store
+        bitmap_prefix (str): Path prefix of the review bitmaps
+    """
+    tmp_path = f"{db_path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.executescript(SCHEMA)
+
+        # Movie info written before box-office data was fetched has no revenue column
+        movies = read_table(movies_path).reindex(columns=MOVIE_COLUMNS)
+        movies['revenue'] = pd.to_numeric(movies['revenue'], errors='coerce').astype('Int64')
+        movies['id'] = movies['id'].astype(str)
+        movies['title'] = movies['title'].astype(str).str.strip()
+        genre_lists = movies['genres'].apply(parse_genres)
+        genre_names = genre_dictionary(genre_lists)
+        movies['genres'] = genre_lists.apply(json.dumps)
+        movies['genre_mask'] = genre_lists.apply(genre_mask, names=genre_names)
+        conn.executemany("INSERT INTO genres (bit, name) VALUES (?, ?)", enumerate(genre_names))
+        conn.executemany(
+            f"INSERT INTO movies VALUES ({', '.join('?' * len(MOVIE_COLUMNS))})",
+            ([_nullable(value) for value in row] for row in movies[MOVIE_COLUMNS].itertuples(index=False))
+        )
+
+        reviews = read_table(reviews_path, REVIEW_COLUMNS)
+        reviews['id'] = reviews['id'].astype(str)
+        reviews['date'] = pd.to_datetime(reviews['date'], errors='coerce', format='mixed').dt.strftime('%Y-%m-%d')
+        reviews['sentiment_score'] = reviews['sentiment_score'].astype('float64')
+        reviews = reviews.sort_values(['id', 'date'], kind='stable', na_position='last')
+        reviews.insert(0, 'row', range(len(reviews)))
+        texts = reviews['review'].fillna('').astype(str).tolist()
+        write_text_store(reviews['id'].tolist(), texts, text_prefix)
+        write_review_bitmaps(reviews['id'], reviews['sentiment_label'], reviews['date'], bitmap_prefix)
+        for start in range(0, len(texts), INSERT_CHUNK):
+            conn.executemany(
+                "INSERT INTO review_search (rowid, review) VALUES (?, ?)",
+                enumerate(texts[start:start + INSERT_CHUNK], start=start)
+            )
+        conn.execute("INSERT INTO review_search (review_search) VALUES ('optimize')")
+        del texts
+
+        reviews = reviews[STORED_REVIEW_COLUMNS].astype(object).where(reviews.notna(), None)
+        for start in range(0, len(reviews), INSERT_CHUNK):
+            chunk = reviews.iloc[start:start + INSERT_CHUNK]
+            conn.executemany(
+                "INSERT INTO reviews VALUES (?, ?, ?, ?, ?)",
+                chunk.itertuples(index=False)
+            )
+
+        conn.execute("""
+            INSERT INTO movie_sentiment
+            SELECT id, sentiment_label, COUNT(*), TOTAL(sentiment_score)
+            FROM reviews GROUP BY id, sentiment_label
+        """)
+        # Daily sums first, then every coarser grain rolled up from the days
+        conn.execute("""
+            INSERT INTO sentiment_series
+            SELECT id, 'day', date, COUNT(sentiment_score), TOTAL(sentiment_score),
+                   TOTAL(sentiment_score * sentiment_score)
+            FROM reviews WHERE date IS NOT NULL GROUP BY id, date
+        """)
+        for grain, period in SERIES_GRAINS.items():
+            if grain != 'day':
+                conn.execute(f"""
+                    INSERT INTO sentiment_series
+                    SELECT id, '{grain}', {period}, SUM(n), SUM(score_sum), SUM(score_sq)
+                    FROM sentiment_series WHERE grain = 'day' GROUP BY id, {period}
+                """)
+        # Genre aggregates: each movie's rows counted once for every bit set in its mask
+        conn.execute("UPDATE genres SET movies = (SELECT COUNT(*) FROM movies WHERE genre_mask & (1 << bit))")
+        conn.execute("""
+            INSERT INTO genre_sentiment
+            SELECT g.bit, s.sentiment_label, SUM(s.n), SUM(s.score_sum)
+            FROM genres g JOIN movies m ON m.genre_mask & (1 << g.bit)
+            JOIN movie_sentiment s ON s.id = m.id
+            GROUP BY g.bit, s.sentiment_label
+        """)
+        conn.execute("""
+            INSERT INTO genre_series
+            SELECT g.bit, s.grain, s.period, SUM(s.n), SUM(s.score_sum), SUM(s.score_sq)
+            FROM genres g JOIN movies m ON m.genre_mask & (1 << g.bit)
+            JOIN sentiment_series s ON s.id = m.id
+            GROUP BY g.bit, s.grain, s.period
+        """)
+        conn.executescript(INDEXES)
+        conn.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, db_path)
+    print(f"✅ Built review store {db_path} ({len(reviews)} reviews, {len(movies)} movies)")
+
+
+def store_is_stale(db_path, sources, text_prefix=TEXT_STORE_PREFIX, bitmap_prefix=BITMAP_PREFIX):
+    """True when the database, text store or bitmaps are missing or older than any of its source files."""
+    paths = [db_path, *text_store_paths(text_prefix), *bitmap_paths(bitmap_prefix)]
+    if not all(os.path.exists(path) for path in paths):
+        return True
+    built = os.path.getmtime(db_path)
+    return any(os.path.getmtime(path) > built for path in sources if path)
+
+
+def open_review_store(db_path=DB_PATH, text_prefix=TEXT_STORE_PREFIX, bitmap_prefix=BITMAP_PREFIX):
+    """Open the store, building or rebuilding it first if the pipeline outputs are newer."""
+    reviews_path = first_existing(REVIEWS_SOURCES)
+    movies_path = first_existing(MOVIES_SOURCES)
+    if store_is_stale(db_path, [reviews_path, movies_path], text_prefix, bitmap_prefix):
+        build_review_store(reviews_path, movies_path, db_path, text_prefix, bitmap_prefix)
+    return ReviewStore(db_path, text_prefix, bitmap_prefix)
+
+
+class ReviewStore:
+    """
+    Read-only query layer over the SQLite store.
+    Each thread (i.e. each Streamlit script run) gets its own connection;
+    the memory-mapped text store is shared by all of them.
+    """
+
+    def __init__(self, db_path=DB_PATH, text_prefix=TEXT_STORE_PREFIX, bitmap_prefix=BITMAP_PREFIX):
+        self.db_path = db_path
+        self.bitmap_prefix = bitmap_prefix
+        self.texts = ReviewTextStore(text_prefix)
+        self._local = threading.local()
+
+    @property
+    def conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            uri = f"file:{os.path.abspath(self.db_path)}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            self._local.conn = conn
+        return conn
+
+    def query(self, sql, params=(), parse_dates=None):
+        return pd.read_sql_query(sql, self.conn, params=params, parse_dates=parse_dates)
+
+    # === Movies ===
+
+    def movies(self, columns=None):
+        """All movie metadata, with genres decoded back into lists."""
+        columns = columns or MOVIE_COLUMNS
+        df = self.query(f"SELECT {', '.join(columns)} FROM movies ORDER BY rowid")
+        if 'genres' in df:
+            df['genres'] = df['genres'].apply(json.loads)
+        return df
+
+    def movie(self, movie_id):
+        """One movie's metadata as a dict, or None if the id is unknown."""
+        df = self.query("SELECT * FROM movies WHERE id = ?", (movie_id,))
+        if df.empty:
+            return None
+        movie = df.iloc[0].to_dict()
+        movie['genres'] = json.loads(movie['genres'])
+        return movie
+
+    def movie_count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM movies").fetchone()[0]
+
+    def top_movies(self, column, limit, columns=None):
+        """
+        The `limit` movies with the highest value in a column, read in order
+        from that column's index instead of sorting the catalog.
+        Args:
+            column (str): One of RANKABLE_COLUMNS
+            limit (int): Number of movies
+            columns (list): Columns to return
+        Returns:
+            pd.DataFrame: Movies, highest first (movies without a value are left out)
+        """
+        if column not in RANKABLE_COLUMNS:
+            raise ValueError(f"Cannot rank movies by {column}")
+        columns = columns or MOVIE_COLUMNS
+        return self.query(
+            f"SELECT {', '.join(columns)} FROM movies WHERE {column} IS NOT NULL ORDER BY {column} DESC LIMIT ?",
+            (limit,)
+        )
+
+    def release_year_counts(self):
+        """Number of movies per release year, counted over the release year index."""
+        return self.query(
+            "SELECT release_year, COUNT(*) AS n FROM movies WHERE release_year IS NOT NULL "
+            "GROUP BY release_year ORDER BY release_year"
+        )
+
+    # === Reviews ===
+
+    def review_count(self):
+        return self.conn.execute("SELECT COALESCE(SUM(n), 0) FROM movie_sentiment").fetchone()[0]
+
+    def reviews_for_movie(self, movie_id, start=None, end=None, columns=None, rows=None):
+        """
+        One movie's reviews ordered by date, via the (id, date) index.
+        Args:
+            movie_id (str): Movie id
+            start (str): Optional first date (inclusive, YYYY-MM-DD)
+            end (str): Optional last date (inclusive, YYYY-MM-DD)
+            columns (list): Columns to return
+            rows (np.ndarray): Optional store rows to keep (see ReviewBitmaps.matching_rows)
+        Returns:
+            pd.DataFrame: Matching reviews
+        """
+        columns = columns or REVIEW_COLUMNS
+        stored = [column for column in columns if column not in ('row', 'review')]
+        sql = f"SELECT {', '.join(['row'] + stored)} FROM reviews WHERE id = ?"
+        params = [movie_id]
+        if start:
+            sql += " AND date >= ?"
+            params.append(start)
+        if end:
+            sql += " AND date <= ?"
+            params.append(end)
+        if rows is not None:
+            condition, param = rows_clause(rows)
+            sql += condition
+            params.append(param)
+        sql += " ORDER BY date"
+        df = self.query(sql, params, parse_dates=['date'] if 'date' in columns else None)
+        if 'review' in columns:
+            df['review'] = self.texts.texts(df['row'])
+        return df[columns]
+
+    def first_review(self, movie_id, sentiment_label):
+        """The earliest review of a movie with a given label, as a dict."""
+        row = self.query(
+            "SELECT * FROM reviews WHERE id = ? AND sentiment_label = ? ORDER BY row LIMIT 1",
+            (movie_id, sentiment_label)
+        )
+        if row.empty:
+            return None
+        review = row.iloc[0].to_dict()
+        review['review'] = self.texts.text(review['row'])
+        return review
+
+    def review_page(self, movie_id, order='date', descending=False, after=None, limit=REVIEW_PAGE_SIZE, rows=None):
+        """
+        One page of a movie's reviews, fetched with a keyset query so that the
+        cost of a page does not depend on how far into the movie it is.
+        Reviews are numbered by (id, date) when the store is built, so date
+        order is a range scan over the primary key (undated reviews count as
+        the newest); score order walks the (id, SCORE_SORT_KEY) index, with
+        the row number breaking ties (unscored reviews count as the lowest).
+        Args:
+            movie_id (str): Movie id
+            order (str): 'date' or 'score'
+            descending (bool): Newest / highest first
+            after (tuple): Cursor returned with the previous page, None for the first page
+            limit (int): Reviews per page
+            rows (np.ndarray): Optional store rows to page through (see ReviewBitmaps.matching_rows)
+        Returns:
+            tuple: (page DataFrame including the review text, cursor for the next page or None)
+        """
+        direction = " DESC" if descending else ""
+        select = "SELECT row, sentiment_score, sentiment_label, date"
+        if order == 'date':
+            first, end = self.texts.movie_rows(movie_id)
+            keys = ['row']
+            sql = f"{select} FROM reviews WHERE row >= ? AND row < ?"
+            params = [first, end]
+        elif order == 'score':
+            keys = [SCORE_SORT_KEY, 'row']
+            sql = f"{select}, {SCORE_SORT_KEY} AS score_key FROM reviews WHERE id = ?"
+            params = [movie_id]
+        else:
+            raise ValueError(f"Unknown review order: {order}")
+
+        if rows is not None:
+            condition, param = rows_clause(rows)
+            sql += condition
+            params.append(param)
+        if after is not None:
+            sql += f" AND ({', '.join(keys)}) {'<' if descending else '>'} ({', '.join('?' * len(keys))})"
+            params.extend(after)
+        sql += f" ORDER BY {', '.join(key + direction for key in keys)} LIMIT ?"
+        params.append(limit + 1)  # One extra row tells whether there is a next page
+
+        df = self.query(sql, params, parse_dates=['date'])
+        has_next = len(df) > limit
+        df = df.iloc[:limit]
+        cursor_columns = ['score_key', 'row'] if order == 'score' else keys
+        cursor = tuple(df[column].iloc[-1].item() for column in cursor_columns) if has_next else None
+        df = df.drop(columns=['score_key'], errors='ignore')
+        df['review'] = self.texts.texts(df['row'])
+        return df, cursor
+
+    def search_reviews(self, text, movie_id=None, sentiment_labels=None, start=None, end=None,
+                       limit=SEARCH_LIMIT):
+        """
+        Reviews containing every term and phrase of a search, best matches first.
+        Args:
+            text (str): Search box input; "quoted phrases" must match exactly
+            movie_id (str): Optional movie to search within (default: all movies)
+            sentiment_labels (list): Optional labels to keep
+            start (str): Optional first date (inclusive, YYYY-MM-DD)
+            end (str): Optional last date (inclusive, YYYY-MM-DD)
+            limit (int): Maximum number of reviews returned
+        Returns:
+            pd.DataFrame: Matching reviews, including their text
+        """
+        match = fts_query(text)
+        if not match:
+            return pd.DataFrame(columns=STORED_REVIEW_COLUMNS + ['review'])
+
+        sql = """
+            SELECT r.row, r.id, r.sentiment_score, r.sentiment_label, r.date
+            FROM review_search JOIN reviews r ON r.row = review_search.rowid
+            WHERE review_search MATCH ?
+        """
+        params = [match]
+        if movie_id is not None:
+            sql += " AND r.id = ?"
+            params.append(movie_id)
+        if sentiment_labels:
+            sql += f" AND r.sentiment_label IN ({', '.join('?' * len(sentiment_labels))})"
+            params.extend(sentiment_labels)
+        if start:
+            sql += " AND r.date >= ?"
+            params.append(start)
+        if end:
+            sql += " AND r.date <= ?"
+            params.append(end)
+        sql += " ORDER BY review_search.rank LIMIT ?"
+        params.append(limit)
+
+        df = self.query(sql, params, parse_dates=['date'])
+        df['review'] = self.texts.texts(df['row'])
+        return df
+
+    # === Aggregates ===
+
+    def sentiment_counts(self, movie_id):
+        """Review count per sentiment label for one movie."""
+        df = self.query("SELECT sentiment_label, n FROM movie_sentiment WHERE id = ?", (movie_id,))
+        return df.set_index('sentiment_label')['n']
+
+    def sentiment_series(self, movie_id, grain):
+        """
+        One movie's precomputed sentiment time series.
+        Args:
+            movie_id (str): Movie id
+            grain (str): 'day', 'week', 'month' or 'year'
+        Returns:
+            pd.DataFrame: period (start date), n, score_sum and score_sq, oldest first
+        """
+        if grain not in SERIES_GRAINS:
+            raise ValueError(f"Unknown series grain: {grain}")
+        return self.query(
+            """SELECT period, n, score_sum, score_sq FROM sentiment_series
+               WHERE id = ? AND grain = ? ORDER BY period""",
+            (movie_id, grain), parse_dates=['period']
+        )
+
+    def most_reviewed_movies(self, limit):
+        """Ids of the movies with the most reviews, most reviewed first."""
+        rows = self.conn.execute(
+            "SELECT id FROM movie_sentiment GROUP BY id ORDER BY SUM(n) DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def compare_movies(self, movie_ids):
+        """
+        Sentiment summaries for several movies, read from the precomputed
+        per-movie tables with one query per result rather than one per movie.
+        Args:
+            movie_ids (list): Movie ids to compare
+        Returns:
+            tuple: (distribution, yearly) DataFrames; distribution has one row per
+            (id, sentiment_label) with n and mean_score, yearly one row per
+            (id, year) with n and mean_score
+        """
+        placeholders = ', '.join('?' * len(movie_ids))
+        distribution = self.query(
+            f"""SELECT id, sentiment_label, n, score_sum / n AS mean_score
+                FROM movie_sentiment WHERE id IN ({placeholders})""",
+            movie_ids
+        )
+        yearly = self.query(
+            f"""SELECT id, CAST(substr(period, 1, 4) AS INTEGER) AS year,
+                       n, score_sum / n AS mean_score
+                FROM sentiment_series WHERE grain = 'year' AND id IN ({placeholders}) AND n > 0""",
+            movie_ids
+        )
+        return distribution, yearly
+
+    # === Genres ===
+
+    def genres(self):
+        """
+        The genre dictionary, limited to genres that have movies.
+        Returns:
+            pd.DataFrame: bit, name and the number of movies tagged with the genre
+        """
+        return self.query("SELECT bit, name, movies FROM genres WHERE movies > 0 ORDER BY bit")
+
+    def genre_mask(self, names):
+        """Bitmask selecting the named genres (unknown names select nothing)."""
+        placeholders = ', '.join('?' * len(names))
+        bits = self.conn.execute(f"SELECT bit FROM genres WHERE name IN ({placeholders})", list(names)).fetchall()
+        return sum(1 << bit for bit, in bits)
+
+    def genre_sentiment(self):
+        """
+        Precomputed sentiment per genre, a movie counting towards each of its genres.
+        Returns:
+            pd.DataFrame: genre, sentiment_label, n and mean_score
+        """
+        return self.query(
+            """SELECT g.name AS genre, s.sentiment_label, s.n, s.score_sum / s.n AS mean_score
+               FROM genre_sentiment s JOIN genres g ON g.bit = s.bit ORDER BY s.bit"""
+        )
+
+    def genre_series(self, genre, grain):
+        """
+        One genre's precomputed sentiment time series (see sentiment_series).
+        Args:
+            genre (str): Genre name
+            grain (str): 'day', 'week', 'month' or 'year'
+        Returns:
+            pd.DataFrame: period (start date), n, score_sum and score_sq, oldest first
+        """
+        if grain not in SERIES_GRAINS:
+            raise ValueError(f"Unknown series grain: {grain}")
+        return self.query(
+            """SELECT period, n, score_sum, score_sq FROM genre_series
+               WHERE bit = (SELECT bit FROM genres WHERE name = ?) AND grain = ? ORDER BY period""",
+            (genre, grain), parse_dates=['period']
+        )
+
+    def movies_with_genres(self, mask, match_all=True, columns=None):
+        """
+        Movies tagged with the genres in a bitmask, with their review totals.
+        Args:
+            mask (int): Genre bitmask (see genre_mask)
+            match_all (bool): Require every genre in the mask instead of any of them
+            columns (list): Movie columns to return
+        Returns:
+            pd.DataFrame: The movie columns plus n and mean_score, most reviewed first
+        """
+        columns = columns or ['id', 'title', 'release_year', 'user_score']
+        condition = "m.genre_mask & :mask = :mask" if match_all else "m.genre_mask & :mask != 0"
+        return self.query(
+            f"""SELECT {', '.join(f'm.{column}' for column in columns)},
+                       SUM(s.n) AS n, SUM(s.score_sum) / SUM(s.n) AS mean_score
+                FROM movies m JOIN movie_sentiment s ON s.id = m.id
+                WHERE :mask != 0 AND {condition}
+                GROUP BY m.id ORDER BY n DESC""",
+            {'mask': mask}
+        )
+
+    def top_label_movie(self, sentiment_label):
+        """
+        The movie with the most reviews of one sentiment label, read from the
+        end of the (sentiment_label, n) index however large the catalog.
+        Returns:
+            tuple: (movie id, review count), or None when no review has the label
+        """
+        return self.conn.execute(
+            "SELECT id, n FROM movie_sentiment WHERE sentiment_label = ? ORDER BY n DESC LIMIT 1",
+            (sentiment_label,)
+        ).fetchone()
+
+
+if __name__ == "__main__":
+    build_review_store(first_existing(REVIEWS_SOURCES), first_existing(MOVIES_SOURCES))
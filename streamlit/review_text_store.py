@@ -0,0 +1,103 @@
+"""
+Memory-mapped store for review text.
+
+All review texts live in one contiguous UTF-8 blob, sorted by movie id, with an
+offset array marking where each review starts. Readers memory-map both files,
+so every Streamlit process shares the same page-cache pages and only the
+slices that are actually read are paged in.
+
+Files written for a prefix such as "reviews_text":
+    reviews_text.bin            concatenated UTF-8 review texts
+    reviews_text.offsets.npy    uint64 offsets, one more than the number of reviews
+    reviews_text.movies.json    {movie_id: [first_row, end_row]}
+"""
+import json
+import mmap
+import os
+import threading
+
+import numpy as np
+
+TEXT_STORE_PREFIX = "reviews_text"
+
+
+def text_store_paths(prefix=TEXT_STORE_PREFIX):
+    return f"{prefix}.bin", f"{prefix}.offsets.npy", f"{prefix}.movies.json"
+
+
+def write_text_store(movie_ids, texts, prefix=TEXT_STORE_PREFIX):
+    """
+    Write the text store for reviews that are already sorted by movie id.
+    Row i of the store is the i-th text passed in.
+    Args:
+        movie_ids (list): Movie id of each review, grouped by movie
+        texts (list): Review text of each review
+        prefix (str): Path prefix of the three output files
+    """
+    blob_path, offsets_path, movies_path = text_store_paths(prefix)
+    tmp = f"{os.getpid()}-{threading.get_ident()}.tmp"
+    lengths = np.zeros(len(texts), dtype=np.uint64)
+    ranges = {}
+
+    with open(f"{blob_path}.{tmp}", "wb") as blob:
+        for row, (movie_id, text) in enumerate(zip(movie_ids, texts)):
+            data = text.encode("utf-8") if isinstance(text, str) else b""
+            blob.write(data)
+            lengths[row] = len(data)
+
+            if movie_id not in ranges:
+                ranges[movie_id] = [row, row + 1]
+            elif ranges[movie_id][1] != row:
+                raise ValueError(f"Reviews for movie {movie_id} are not contiguous")
+            else:
+                ranges[movie_id][1] = row + 1
+
+    offsets = np.zeros(len(texts) + 1, dtype=np.uint64)
+    np.cumsum(lengths, out=offsets[1:])
+    with open(f"{offsets_path}.{tmp}", "wb") as f:
+        np.save(f, offsets)
+    with open(f"{movies_path}.{tmp}", "w", encoding="utf-8") as f:
+        json.dump(ranges, f)
+
+    for path in (blob_path, offsets_path, movies_path):
+        os.replace(f"{path}.{tmp}", path)
+
+
+class ReviewTextStore:
+    """Read-only, memory-mapped view over a text store written by write_text_store()."""
+
+    def __init__(self, prefix=TEXT_STORE_PREFIX):
+        blob_path, offsets_path, movies_path = text_store_paths(prefix)
+        self.offsets = np.load(offsets_path, mmap_mode="r")
+        with open(movies_path, encoding="utf-8") as f:
+            self.ranges = {movie_id: tuple(bounds) for movie_id, bounds in json.load(f).items()}
+
+        with open(blob_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            # mmap cannot map an empty file
+            self.blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def text(self, row):
+        start, end = int(self.offsets[row]), int(self.offsets[row + 1])
+        return self.blob[start:end].decode("utf-8")
+
+    def texts(self, rows):
+        """Texts for the given store rows, in the same order."""
+        return [self.text(row) for row in rows]
+
+    def movie_rows(self, movie_id):
+        """Row range [first, end) holding one movie's reviews."""
+        return self.ranges.get(movie_id, (0, 0))
+
+    def movie_texts(self, movie_id):
+        """All of one movie's review texts, decoded from a single slice of the blob."""
+        first, end = self.movie_rows(movie_id)
+        if first == end:
+            return []
+        bounds = self.offsets[first:end + 1].astype(np.int64)
+        chunk = self.blob[int(bounds[0]):int(bounds[-1])]
+        bounds -= bounds[0]
+        return [chunk[bounds[i]:bounds[i + 1]].decode("utf-8") for i in range(end - first)]
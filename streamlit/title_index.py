@@ -0,0 +1,66 @@
+"""
+Prefix search over movie titles, for pickers on catalogs too large to list.
+
+Every title is indexed under each of its word suffixes ("the dark knight
+rises" is also found as "dark knight rises", "knight rises" and "rises"), in
+one sorted list. A query is normalized the same way and located with a binary
+search, so matching "knight" among 10k+ titles reads only the keys that start
+with it instead of scanning every title.
+
+    index = TitleIndex(ids, titles)
+    index.search("dark kni")      # ['The Dark Knight Rises (2012)', ...]
+"""
+import bisect
+import re
+
+SEARCH_LIMIT = 50
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def normalize_title(text):
+    """Lowercase words without punctuation, so "Spider-Man:" matches "spider man"."""
+    return " ".join(_NON_WORD.sub(" ", str(text).lower()).split())
+
+
+class TitleIndex:
+    """Titles and ids of every movie, in file order, with a word-prefix search."""
+
+    def __init__(self, ids, titles):
+        self.ids = [str(movie_id) for movie_id in ids]
+        self.titles = [str(title) for title in titles]
+        self.id_for_title = dict(zip(self.titles, self.ids))
+        self.title_for_id = dict(zip(self.ids, self.titles))
+
+        entries = []
+        for position, title in enumerate(self.titles):
+            words = normalize_title(title).split()
+            for start in range(len(words)):
+                entries.append((" ".join(words[start:]), start, position))
+        entries.sort()
+        self._keys = [key for key, _, _ in entries]
+        self._entries = [(start, position) for _, start, position in entries]
+
+    def __len__(self):
+        return len(self.titles)
+
+    def search(self, query, limit=SEARCH_LIMIT):
+        """
+        Titles with a word sequence starting with the query.
+        Args:
+            query (str): Text typed by the user
+            limit (int): Maximum number of titles
+        Returns:
+            list: Matching titles, those starting with the query first, then alphabetical
+        """
+        query = normalize_title(query)
+        if not query:
+            return []
+        matches = {}
+        i = bisect.bisect_left(self._keys, query)
+        while i < len(self._keys) and self._keys[i].startswith(query):
+            start, position = self._entries[i]
+            matches[position] = min(start, matches.get(position, start))
+            i += 1
+        ranked = sorted(matches, key=lambda position: (matches[position] > 0, self.titles[position]))
+        return [self.titles[position] for position in ranked[:limit]]
@@ -1,11 +1,14 @@
 import streamlit as st
-import time
-import pandas as pd
-import plotly.express as px
 import os
 
+import perf
+from cross_filter import render_filter_panel
+from movie_charts import start_warm_up
+from movie_data import data_version, get_review_store, load_review_bitmaps
+
 # ✅ Set page config first, only once
 st.set_page_config(page_title="Movie Dashboard",layout="wide", page_icon="🎬")
+perf.start_run("Main")
 
 # Logo setup
 image_path = r"pages/images/TMBDLogo.png"
@@ -21,59 +24,106 @@ st.title("🎬 Welcome to the Movie Sentiment Visualizer")
 st.markdown("Use the **sidebar** to select the Movie Dashboard.")
 
 # === FUNCTION: Animated Stat Box ===
-def animated_stat_box(value_text_func, label, duration=0.05, max_value=50, box_color="#ff4d4d"):
-    placeholder = st.empty()
-    for i in range(1, max_value + 1):
-        text = value_text_func(i)
-        placeholder.markdown(
-            f"""
-            <div style="
-                background-color:{box_color};
-                color:white;
-                padding:15px 30px;
-                border-radius:10px;
-                width:100%;
-                box-shadow: 2px 2px 10px rgba(0,0,0,0.3);
-                display:flex;
-                align-items:center;
-                font-size:26px;
-                font-weight:bold;
-                margin-bottom: 15px;">
-                <span style='margin-right:10px;'>{text}</span>
-                <span>{label}</span>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-        time.sleep(duration)
+# The count-up runs in the browser as a CSS animation of a registered custom
+# property, so the script sends each box once and never sleeps.
+# Browsers without @property support simply show the final value.
+STAT_BOX_CSS = """
+<style>
+@property --stat-value {
+    syntax: '<integer>';
+    initial-value: 0;
+    inherits: false;
+}
+@keyframes stat-count-up {
+    from { --stat-value: 0; }
+}
+.stat-value {
+    animation: stat-count-up 2.5s ease-out;
+    counter-reset: stat-value var(--stat-value);
+}
+.stat-value::after {
+    content: counter(stat-value);
+}
+</style>
+"""
+
+def animated_stat_box(value, label, box_color="#ff4d4d"):
+    box_class = f"stat-{label.lower()}"
+    st.markdown(
+        f"""
+        <style>.{box_class} {{ --stat-value: {int(value)}; }}</style>
+        <div style="
+            background-color:{box_color};
+            color:white;
+            padding:15px 30px;
+            border-radius:10px;
+            width:100%;
+            box-shadow: 2px 2px 10px rgba(0,0,0,0.3);
+            display:flex;
+            align-items:center;
+            font-size:26px;
+            font-weight:bold;
+            margin-bottom: 15px;">
+            <span class="stat-value {box_class}" style="margin-right:10px;"></span>
+            <span>{label}</span>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
 
-# === BOX 1: 50 Movies ===
-animated_stat_box(lambda i: f"{i}", "Movies")
 
-# === Spacer between boxes ===
-st.markdown("<div style='height: 20px;'></div>", unsafe_allow_html=True)
+# Unfiltered charts rank and bin the catalog inside the store, so the page never loads every movie
+TOP_SCORES = 10
+TOP_GROSS = 50
+TIMELINE_MAX_MOVIES = 60  # Above this, release years are shown as a histogram
 
-# === BOX 2: 5,000+ Reviews ===
-animated_stat_box(lambda i: f"{i * 100}", "Reviews")
+# Load data
+store = get_review_store()
+# Start building dashboard charts for the most reviewed movies in the background
+start_warm_up(store, data_version())
+
+# === Cross-filter (sidebar) ===
+filters = render_filter_panel(load_review_bitmaps())
+if filters:
+    # Filtered charts cover the movies that still have matching reviews
+    with perf.section("cross-filter movies"):
+        matching = load_review_bitmaps().movie_counts(filters)
+        matching = matching[matching > 0]
+        catalog = store.movies(['id', 'title', 'release_year', 'user_score', 'revenue'])
+        catalog = catalog[catalog['id'].isin(matching.index)]
+    movie_count, review_count = len(catalog), int(matching.sum())
+    st.info("Charts are filtered by the cross-filter in the sidebar.")
+else:
+    movie_count, review_count = store.movie_count(), store.review_count()
 
+st.markdown(STAT_BOX_CSS, unsafe_allow_html=True)
 
-# Load data
-df_info = pd.read_csv("movie_info_1.csv")
-df_info['release_year'] = pd.to_numeric(df_info['release_year'], errors='coerce')
-df_info['user_score'] = pd.to_numeric(df_info['user_score'], errors='coerce')
+with perf.section("stat boxes"):
+    # === BOX 1: Movies ===
+    animated_stat_box(movie_count, "Movies")
+
+    # === Spacer between boxes ===
+    st.markdown("<div style='height: 20px;'></div>", unsafe_allow_html=True)
 
-# Sort by title just for consistent ordering
-df_info = df_info.sort_values(by="title")
+    # === BOX 2: Reviews ===
+    animated_stat_box(review_count, "Reviews")
+
+# Plotly is only needed from here on; importing it late lets the header and stats render first
+with perf.section("import plotly"):
+    import plotly.express as px
 
 col1, col2 = st.columns(2)
 
 # === Chart 1: User Scores Bar Chart ===
 with col1:
-    st.subheader("⭐ Top 10 Movies by User Score")
+    st.subheader(f"⭐ Top {TOP_SCORES} Movies by User Score")
     st.markdown("<br>", unsafe_allow_html=True)
 
-    # Sort by user score and take top 10
-    df_sorted = df_info.sort_values("user_score", ascending=False).head(10)
+    with perf.section("top movies query"):
+        if filters:
+            df_sorted = catalog.nlargest(TOP_SCORES, "user_score")[["title", "user_score"]]
+        else:
+            df_sorted = store.top_movies("user_score", TOP_SCORES, ["title", "user_score"])
 
     fig_scores = px.bar(
         df_sorted,
@@ -96,136 +146,113 @@ with col1:
         uniformtext_mode="hide"
     )
 
-    st.plotly_chart(fig_scores, use_container_width=True)
+    with perf.section("plotly charts"):
+        st.plotly_chart(fig_scores, use_container_width=True)
 
 
-# === Chart 2: Release Years Chart (Horizontal) ===
+# === Chart 2: Release Years Chart ===
 with col2:
     st.subheader("📆 Movie Release Years")
 
-    fig_years = px.bar(
-        df_info,
-        x="release_year",
-        y="title",
-        orientation="h",
-        title="Release Timeline",
-        labels={"release_year": "Year", "title": "Movie"},
-        color="release_year",
-        color_continuous_scale="Viridis"
-    )
-    fig_years.update_layout(
-        height=500,
-        yaxis=dict(autorange="reversed"),
-        xaxis=dict(range=[1990, 2030])
-    )
-    st.plotly_chart(fig_years, use_container_width=True)
-
-# Manual worldwide gross in billions USD
-worldwide_gross = {
-    "Titanic (1997)": 2.264,
-    "Barbie (2023)": 1.446,
-    "Furious 7 (2015)": 1.515,
-    "Jurassic World (2015)": 1.671,
-    "The Avengers (2012)": 1.519,
-    "Ne Zha 2 (2025)": 0.0,
-    "Inside Out 2 (2024)": 0.0,
-    "The Lion King (1994)": 0.968,
-    "Avengers Endgame (2019)": 2.799,
-    "Avengers Infinity War (2018)": 2.048,
-    "Avatar The Way Of Water (2022)": 2.320,
-    "Spider-Man No Way Home (2021)": 1.921,
-    "Star Wars The Force Awakens (2015)": 2.068,
-    "Top Gun Maverick (2022)": 1.495,
-    "Avatar (2009)": 2.923,
-    "Frozen 2 (2019)": 1.453,
-    "Star Wars: Episode I- The Phantom Menace": 1.027,
-    "The Batman (2022)": 0.772,
-    "Skyfall (2012)": 1.109,
-    "Joker (2019)": 1.074,
-    "Toy Story 4 (2019)": 1.073,
-    "Aladdin (2019)": 1.054,
-    "Despicable Me 3 (2017)": 1.035,
-    "Transformers: Age Of Extinction (2014)": 1.104,
-    "The Dark Knight Rises (2012)": 1.081,
-    "Star Wars: The Rise Of Skywalker (2019)": 1.077,
-    "Toy Story 3 (2010)": 1.067,
-    "Pirates Of The Caribbean: Dead Man'S Chest (2006)": 1.066,
-    "Moana 2": 0.0,
-    "Rogue One: A Star Wars Story (2016)": 1.058,
-    "Pirates Of The Caribbean: On Stranger Tides (2011)": 1.045,
-    "Jurassic Park (1993)": 1.046,
-    "Finding Dory (2016)": 1.029,
-    "Avengers: Age Of Ultron (2015)": 1.403,
-    "Super Mario Bros. (2023)": 1.361,
-    "Star Wars: The Last Jedi (2017)": 1.334,
-    "Black Panther (2018)": 1.347,
-    "Harry Potter And The Deathly Hallows (2010)": 1.342,
-    "Jurassic World Fallen Kingdom (2018)": 1.309,
-    "Beauty And The Beast (2017)": 1.266,
-    "Incredibles 2 (2018)": 1.243,
-    "The Fate Of The Furious (2017)": 1.236,
-    "Iron Man 3 (2013)": 1.215,
-    "Minions (2015)": 1.159,
-    "Captain America Civil War (2016)": 1.155,
-    "Aquaman (2018)": 1.152,
-    "The Lord Of The Rings The Return Of The King (2003)": 1.146,
-    "Spider Man Far From Home (2019)": 1.131,
-    "Captain Marvel (2019)": 1.131,
-    "Transformers Dark Of The Moon (2011)": 1.123
-}
-
-gross_df = pd.DataFrame(list(worldwide_gross.items()), columns=["title", "gross"])
-gross_df = gross_df.sort_values(by="gross", ascending=False)
+    if movie_count <= TIMELINE_MAX_MOVIES:
+        # One bar per movie, sorted by title for consistent ordering
+        df_years = (catalog if filters else store.movies(["title", "release_year"])).sort_values(by="title")
+        fig_years = px.bar(
+            df_years,
+            x="release_year",
+            y="title",
+            orientation="h",
+            title="Release Timeline",
+            labels={"release_year": "Year", "title": "Movie"},
+            color="release_year",
+            color_continuous_scale="Viridis"
+        )
+        fig_years.update_layout(
+            height=500,
+            yaxis=dict(autorange="reversed"),
+            xaxis=dict(range=[1990, 2030])
+        )
+    else:
+        # A bar per movie is unreadable for a large catalog: count movies per year instead
+        with perf.section("release year query"):
+            if filters:
+                df_years = catalog.groupby("release_year").size().reset_index(name="n")
+            else:
+                df_years = store.release_year_counts()
+        fig_years = px.bar(
+            df_years,
+            x="release_year",
+            y="n",
+            title="Movies Released per Year",
+            labels={"release_year": "Year", "n": "Movies"},
+            color="n",
+            color_continuous_scale="Viridis"
+        )
+        fig_years.update_layout(height=500)
+    with perf.section("plotly charts"):
+        st.plotly_chart(fig_years, use_container_width=True)
+
+# Worldwide gross comes from TMDB's revenue field (movies without box-office data are left out)
+with perf.section("top movies query"):
+    if filters:
+        gross_df = catalog.dropna(subset=["revenue"]).nlargest(TOP_GROSS, "revenue")[["title", "revenue"]]
+    else:
+        gross_df = store.top_movies("revenue", TOP_GROSS, ["title", "revenue"])
+gross_df["gross"] = gross_df["revenue"] / 1e9
 
 st.subheader("🌍 Worldwide Gross Revenue")
-fig_gross = px.bar(gross_df, x="title", y="gross", title="Global Box Office (Billion USD)", labels={"gross": "Billions USD"})
-fig_gross.update_layout(xaxis_tickangle=-45, height=600)
-st.plotly_chart(fig_gross, use_container_width=True)
-
-
-# Load data
-reviews_df = pd.read_csv("analyzed_reviews_with_id.csv")
-
-
-# Ensure id columns are strings for safe matching
-reviews_df['id'] = reviews_df['id'].astype(str)
-df_info['id'] = df_info['id'].astype(str)
-
-# Count positive and negative sentiments by movie id
-positive_counts = reviews_df[reviews_df['sentiment_label'] == 'Positive'].groupby('id').size()
-negative_counts = reviews_df[reviews_df['sentiment_label'] == 'Negative'].groupby('id').size()
-
-# Find movie id with highest positive count and highest negative count
-most_positive_id = positive_counts.idxmax()
-most_negative_id = negative_counts.idxmax()
-
-# Sample one positive review from the most positive movie
-sample_positive_review = reviews_df[(reviews_df['id'] == most_positive_id) & (reviews_df['sentiment_label'] == 'Positive')].iloc[0]
-
-# Sample one negative review from the most negative movie
-sample_negative_review = reviews_df[(reviews_df['id'] == most_negative_id) & (reviews_df['sentiment_label'] == 'Negative')].iloc[0]
-
-# Get movie metadata
-most_positive_movie = df_info[df_info['id'] == most_positive_id].iloc[0]
-most_negative_movie = df_info[df_info['id'] == most_negative_id].iloc[0]
+if gross_df.empty:
+    st.info("No box-office data in the movie info yet. Re-run TMDB_API.py to fetch it.")
+else:
+    if movie_count > TOP_GROSS:
+        st.caption(f"Top {TOP_GROSS} of {movie_count:,} movies")
+    fig_gross = px.bar(gross_df, x="title", y="gross", title="Global Box Office (Billion USD)", labels={"gross": "Billions USD"})
+    fig_gross.update_layout(xaxis_tickangle=-45, height=600)
+    with perf.section("plotly charts"):
+        st.plotly_chart(fig_gross, use_container_width=True)
+
+
+def top_label_movie(sentiment_label):
+    """
+    (movie id, review count) of the movie with the most reviews of a label, or None:
+    one index lookup in the store, or counted from the bitmaps when filtered.
+    """
+    if not filters:
+        return store.top_label_movie(sentiment_label)
+    counts = load_review_bitmaps().movie_counts(filters, sentiment_label)
+    if not counts.any():
+        return None
+    return counts.index[counts.argmax()], int(counts.max())
+
+
+with perf.section("most positive/negative lookup"):
+    most_positive = top_label_movie('Positive')
+    most_negative = top_label_movie('Negative')
 
 # Display in Streamlit side by side
 col1, col2 = st.columns(2)
 
-with col1:
-    st.markdown("### 🟢 Movie with Most Positive Reviews")
-    st.image(most_positive_movie['poster_url'], width=300)
-    st.markdown(f"**{most_positive_movie['title']}**")
-    st.markdown(f"**Director:** {most_positive_movie['director']}")
-    st.markdown(f"**Number of Positive Reviews:** {positive_counts[most_positive_id]}")
-    st.markdown("**Sample Positive Review:**")
-    st.success(sample_positive_review['review'])
-
-with col2:
-    st.markdown("### 🔴 Movie with Most Negative Reviews")
-    st.image(most_negative_movie['poster_url'], width=300)
-    st.markdown(f"**{most_negative_movie['title']}**")
-    st.markdown(f"**Director:** {most_negative_movie['director']}")
-    st.markdown(f"**Number of Negative Reviews:** {negative_counts[most_negative_id]}")
-    st.markdown("**Sample Negative Review:**")
-    st.error(sample_negative_review['review'])
+for column, label, top, show in [(col1, 'Positive', most_positive, st.success),
+                                 (col2, 'Negative', most_negative, st.error)]:
+    with column:
+        st.markdown(f"### {'🟢' if label == 'Positive' else '🔴'} Movie with Most {label} Reviews")
+        if top is None:
+            st.write(f"No {label.lower()} reviews match the filters.")
+            continue
+        # The movie's metadata and one sample review
+        movie_id, n_reviews = top
+        movie = store.movie(movie_id)
+        if filters:
+            # The first review behind the filtered count, not the movie's first overall
+            row = load_review_bitmaps().first_row(movie_id, filters, label)
+            sample_text = store.texts.text(row) if row is not None else None
+        else:
+            sample_text = store.first_review(movie_id, label)['review']
+        st.image(movie['poster_url'], width=300)
+        st.markdown(f"**{movie['title']}**")
+        st.markdown(f"**Director:** {movie['director']}")
+        st.markdown(f"**Number of {label} Reviews:** {n_reviews}")
+        st.markdown(f"**Sample {label} Review:**")
+        show(sample_text)
+
+perf.finish_run()
@@ -1,15 +1,18 @@
-
 import streamlit as st
 import pandas as pd
-import requests
-from io import BytesIO
-from PIL import Image
-import plotly.express as px
-from wordcloud import WordCloud
-import numpy as np
-import ast
 import os
 
+import perf
+from cross_filter import render_filter_panel
+from movie_charts import (DEFAULT_GRAIN, GRAIN_LABELS, MAX_COMPARE, build_filtered_comparison_figures,
+                          build_filtered_movie_figures, get_comparison_figures, get_movie_figures, get_trend_figure,
+                          start_warm_up)
+from movie_data import (data_available, data_version, get_review_store, load_review_bitmaps, load_title_index,
+                        render_filtered_wordcloud, render_wordcloud)
+from review_store import REVIEW_PAGE_SIZE
+
+perf.start_run("Movie Dashboard")
+
 # Logo setup
 image_path = r"pages/images/TMBDLogo.png"
 if os.path.exists(image_path):
@@ -19,52 +22,137 @@ else:
     st.sidebar.warning("Logo not found.")
 st.sidebar.markdown("<b>Copyright to  <br> TMBD <br> Samira Jawish <br> Batoul Hamieh <br> Mohammad Sayyour</b>", unsafe_allow_html=True)
 
-@st.cache_data
-def load_movie_info():
-    df = pd.read_csv("movie_info_1.csv")
-    df['id'] = df['id'].astype(str)
-    df['title'] = df['title'].str.strip()
-    return df
+WORDCLOUD_SIZE = (600, 400)
+PICKER_LIMIT = 50  # Most titles a movie picker lists at once
+FILTERED_CAPTION = "Charts and reviews below only count the reviews that match the cross-filter."
+
+
+def plotly_chart(fig):
+    with perf.section("plotly charts"):
+        st.plotly_chart(fig, use_container_width=True)
 
-@st.cache_data
-def load_reviews():
-    df = pd.read_csv("analyzed_reviews_with_id.csv", parse_dates=['date'])
-    df['id'] = df['id'].astype(str)
-    return df
 
 # === File Check ===
-if not os.path.exists("movie_info_1.csv") or not os.path.exists("analyzed_reviews_with_id.csv"):
+if not data_available():
     st.error("Required files missing.")
     st.stop()
 
 # === Load Data ===
-df = load_movie_info()
-reviews_df = load_reviews()
+store = get_review_store()
+start_warm_up(store, data_version())
+
+# === Movie Title Index (maps titles to IDs, searched by prefix) ===
+title_index = load_title_index()
+
+# === Cross-filter (sidebar) ===
+bitmaps = load_review_bitmaps()
+filters = render_filter_panel(bitmaps)
+# Movies with reviews matching the filters, most matches first (None when nothing is filtered)
+filtered_counts = None
+if filters:
+    with perf.section("cross-filter movies"):
+        filtered_counts = bitmaps.movie_counts(filters)
+        filtered_counts = filtered_counts[filtered_counts > 0].sort_values(ascending=False, kind='stable')
+
+
+def picker_options(label, keep):
+    """
+    Titles to offer in a movie picker. Small catalogs list every title; larger
+    ones get a search box and offer its matches (or the most reviewed movies
+    while it is empty), so a picker never holds more than PICKER_LIMIT titles.
+    Movies without reviews matching the cross-filter are left out.
+    Args:
+        label (str): Label of the search box
+        keep (list): Selected titles, kept in the options so the selection survives a new search
+    Returns:
+        list: Titles to offer
+    """
+    def allowed(titles):
+        if filtered_counts is None:
+            return titles
+        return [title for title in titles if title_index.id_for_title[title] in filtered_counts.index]
+
+    if len(title_index) <= PICKER_LIMIT:
+        return list(dict.fromkeys([*keep, *allowed(title_index.titles)]))
+    query = st.text_input(label, placeholder="Type part of a title")
+    with perf.section("title search"):
+        if query.strip():
+            matches = allowed(title_index.search(query, None if filters else PICKER_LIMIT))[:PICKER_LIMIT]
+        else:
+            top_ids = filtered_counts.index[:PICKER_LIMIT] if filters else store.most_reviewed_movies(PICKER_LIMIT)
+            matches = [title_index.title_for_id[movie_id] for movie_id in top_ids
+                       if movie_id in title_index.title_for_id]
+    if query.strip() and not matches:
+        st.caption("No movie title matches your search.")
+    return list(dict.fromkeys([*keep, *matches]))
 
-# === Movie Title Selector (uses ID internally) ===
-movie_dict = {row['title']: row['id'] for _, row in df.iterrows()}
 
 # Add a title and description above the dropdown list
 st.title("Movie's Sentiment Visualizer")
 st.markdown("This Web app aims to display the sentiment analysis of the top 50 highest-grossing movies of all time through the audience reviews.")
 
-movie_titles = ["Select a movie"] + list(movie_dict.keys())
-selected_title = st.selectbox("🎬 Select a Movie", movie_titles)
+mode = st.radio("View", ["Single movie", "Compare movies"], horizontal=True, label_visibility="collapsed")
+
+# === Compare Mode ===
+if mode == "Compare movies":
+    selected = st.session_state.get("compare_titles", [])
+    options = picker_options("🔎 Find movies to compare", selected)
+    compare_titles = st.multiselect(f"🎬 Select up to {MAX_COMPARE} movies", options, default=selected,
+                                    max_selections=MAX_COMPARE)
+    st.session_state["compare_titles"] = compare_titles
+    if len(compare_titles) < 2:
+        st.warning("Please select at least two movies.")
+        perf.finish_run()
+        st.stop()
+
+    compare_ids = [title_index.id_for_title[title] for title in compare_titles]
+    titles = {movie_id: title_index.title_for_id[movie_id] for movie_id in compare_ids}
+    if filters:
+        # Built from the matching reviews on every rerun; the cached figures cover every review
+        with perf.section("cross-filter figures"):
+            figures = build_filtered_comparison_figures(store, bitmaps, filters, compare_ids, titles)
+        st.caption(FILTERED_CAPTION)
+    else:
+        figures = get_comparison_figures(store, compare_ids, titles, data_version())
+
+    st.subheader("📈 Yearly Sentiment Trends")
+    if figures['trend'] is not None:
+        plotly_chart(figures['trend'])
+
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        st.subheader("🥧 Sentiment Distribution")
+        if figures['distribution'] is not None:
+            plotly_chart(figures['distribution'])
+    with col2:
+        st.subheader("📊 Average Sentiment")
+        if figures['mean'] is not None:
+            plotly_chart(figures['mean'])
+    perf.finish_run()
+    st.stop()
+
+previous_title = st.session_state.get("selected_title")
+options = picker_options("🔎 Find a movie", [previous_title] if previous_title else [])
+movie_titles = ["Select a movie"] + [title for title in options if title != "Select a movie"]
+selected_title = st.selectbox("🎬 Select a Movie", movie_titles,
+                              index=movie_titles.index(previous_title) if previous_title in movie_titles else 0)
+st.session_state["selected_title"] = selected_title if selected_title != "Select a movie" else None
 
 if selected_title == "Select a movie":
     st.warning("Please select a movie.")
+    perf.finish_run()
     st.stop()
 
-selected_id = movie_dict[selected_title]
+selected_id = title_index.id_for_title[selected_title]
 
-# === Filter Movie Info by ID ===
-movie_row = df[df['id'] == selected_id]
-if movie_row.empty:
+# === Look Up Movie Info by ID ===
+with perf.section("movie metadata"):
+    movie = store.movie(selected_id)
+if movie is None:
     st.error("Movie data not found.")
+    perf.finish_run()
     st.stop()
 
-movie = movie_row.iloc[0]
-
 # === Display Metadata ===
 col1, col2 = st.columns([2, 1])
 with col1:
@@ -72,8 +160,8 @@ with col1:
     st.markdown(f"**Release Year:** {movie.get('release_year', 'N/A')}")
     st.markdown(f"**Runtime:** {movie.get('runtime', 'N/A')} minutes")
     
-    genres = ast.literal_eval(movie['genres']) if isinstance(movie['genres'], str) else movie['genres']
-    st.markdown(f"**Genres:** {', '.join(genres) if genres else 'N/A'}")
+    # Decoded into a list by the store
+    st.markdown(f"**Genres:** {', '.join(movie['genres']) if movie['genres'] else 'N/A'}")
     
     st.markdown(f"**Director:** {movie.get('director', 'N/A')}")
     st.markdown(f"**User Score:** {movie.get('user_score', 'N/A')}")
@@ -82,87 +170,153 @@ with col1:
     st.markdown(movie.get('overview', 'N/A'))
 with col2:
     if pd.notnull(movie['poster_url']):
-        try:
-            response = requests.get(movie['poster_url'], timeout=5)
-            img = Image.open(BytesIO(response.content))
-            st.image(img, width=400)
-        except:
-            st.write("Poster could not be loaded.")
+        # Only needed for the poster, so imported here to keep startup light
+        import requests
+        from io import BytesIO
+        from PIL import Image
+        with perf.section("poster"):
+            try:
+                response = requests.get(movie['poster_url'], timeout=5)
+                img = Image.open(BytesIO(response.content))
+                st.image(img, width=400)
+            except:
+                st.write("Poster could not be loaded.")
     else:
         st.write("Poster not available.")
 
-# === Filter Reviews by ID ===
-movie_reviews = reviews_df[reviews_df['id'] == selected_id]
-
+# === Word Cloud ===
+if filters:
+    wordcloud_image = render_filtered_wordcloud(selected_id, filters, *WORDCLOUD_SIZE)
+else:
+    wordcloud_image = render_wordcloud(selected_id, *WORDCLOUD_SIZE)
 
-# === Sentiment Counts ===
-sentiment_counts = movie_reviews['sentiment_label'].value_counts() if 'sentiment_label' in movie_reviews else pd.Series()
+if filters:
+    st.caption(FILTERED_CAPTION)
+st.subheader("📈 Sentiment Trend")
+col1, col2 = st.columns([2, 1])
+with col1:
+    grain = st.radio("Granularity", list(GRAIN_LABELS), index=list(GRAIN_LABELS).index(DEFAULT_GRAIN),
+                     format_func=GRAIN_LABELS.get, horizontal=True)
+with col2:
+    window = st.slider("Rolling window (periods)", min_value=1, max_value=12, value=1)
+if filters:
+    # Built from the matching reviews on every rerun; the cached figures cover every review
+    with perf.section("cross-filter figures"):
+        figures = build_filtered_movie_figures(store, bitmaps, filters, selected_id, grain, window)
+    trend_figure = figures['trend']
+else:
+    # === Charts (cached per movie and data version) ===
+    figures = get_movie_figures(store, selected_id, data_version())
+    # Read from the precomputed series; only the smoothing is done here
+    trend_figure = get_trend_figure(store, selected_id, grain, window, data_version())
+if trend_figure is not None:
+    plotly_chart(trend_figure)
 
-# === Word Cloud ===
-if not movie_reviews['review'].empty:
-    wordcloud = WordCloud(width=600, height=400, background_color='white').generate(" ".join(movie_reviews['review']))
-
-# === Radar Chart Data ===
-emotion_cols = ['joy', 'anger', 'fear', 'sadness', 'surprise', 'love']
-for col in emotion_cols:
-    if col not in movie_reviews.columns:
-        movie_reviews[col] = np.random.uniform(0, 1, len(movie_reviews))
-
-radar_df = movie_reviews[emotion_cols].mean().reset_index()
-radar_df.columns = ['emotion', 'value']
-radar_df = pd.concat([radar_df, radar_df.iloc[0:1]])
-
-# === Time-based Sentiment (Yearly View) ===
-movie_reviews['date'] = pd.to_datetime(movie_reviews['date'], errors='coerce')
-movie_reviews['year'] = movie_reviews['date'].dt.to_period('Y').dt.to_timestamp()
-time_sentiment = movie_reviews.groupby('year')['sentiment_score'].mean().reset_index()
-
-st.subheader("📈 Yearly Sentiment Trend")
-if 'sentiment_score' in movie_reviews:
-    import plotly.express as px
-    fig = px.line(
-        time_sentiment,
-        x='year',
-        y='sentiment_score',
-        title='Yearly Sentiment Trend',
-        labels={'sentiment_score': 'Average Sentiment Score', 'year': 'Year'}
-    )
-    fig.update_layout(xaxis_tickformat="%Y")  # Only show year
-    st.plotly_chart(fig, use_container_width=True)
+if filters:
+    st.subheader("📅 Matching Reviews per Year")
+    if figures['years'] is not None:
+        plotly_chart(figures['years'])
+    else:
+        st.write("No review of this movie matches the cross-filter.")
 
 col1, col2 = st.columns([1, 1])
 with col1:
     st.subheader("☁️ Word Cloud")
-    if 'wordcloud' in locals():
-        st.image(wordcloud.to_array(), use_container_width=True)
+    if wordcloud_image is not None:
+        st.image(wordcloud_image, use_container_width=True)
     else:
         st.write("No reviews to display.")
 with col2:
     st.subheader("🥧 Sentiment Distribution")
-    if not sentiment_counts.empty:
-        fig = px.pie(values=sentiment_counts.values, names=sentiment_counts.index)
-        st.plotly_chart(fig, use_container_width=True)
+    if figures['pie'] is not None:
+        plotly_chart(figures['pie'])
 
 col3, col4 = st.columns([1, 1])
 with col3:
     st.subheader("📊 Emotion Radar")
-    fig = px.line_polar(radar_df, r='value', theta='emotion', line_close=True, markers=True)
-    st.plotly_chart(fig, use_container_width=True)
+    if figures['radar'] is not None:
+        plotly_chart(figures['radar'])
 with col4:
     st.subheader("📊 Average Sentiment per Label")
-    if 'sentiment_score' in movie_reviews:
-        avg_df = movie_reviews.groupby('sentiment_label')['sentiment_score'].mean().reset_index()
-        fig = px.bar(avg_df, x='sentiment_label', y='sentiment_score')
-        st.plotly_chart(fig, use_container_width=True)
+    if figures['labels'] is not None:
+        plotly_chart(figures['labels'])
 
 st.markdown("---")
-st.subheader("💬 Sample Reviews")
-# Update the review numbering to count based on the ID repetitions
-if len(movie_reviews) >= 3:
-    for i, (index, row) in enumerate(movie_reviews.sample(3).iterrows(), start=1):
-        review_number = movie_reviews.index.get_loc(index) + 1  # Get the position of the review within the filtered DataFrame
-        with st.expander(f"Review {review_number}"):
+st.subheader("💬 Reviews")
+SORT_OPTIONS = {
+    "Newest first": ('date', True),
+    "Oldest first": ('date', False),
+    "Highest score": ('score', True),
+    "Lowest score": ('score', False),
+}
+sort_by = st.selectbox("Sort reviews by", list(SORT_OPTIONS))
+order, descending = SORT_OPTIONS[sort_by]
+
+# Each page is fetched on its own with a keyset query; the cursors of the pages
+# visited so far are kept so "Previous" can step back
+browser = st.session_state.setdefault('review_browser', {})
+browser_key = (selected_id, sort_by, repr(sorted(filters.items())))
+if browser.get('key') != browser_key:
+    browser.update(key=browser_key, cursors=[None])
+cursors = browser['cursors']
+
+first_row, end_row = store.texts.movie_rows(selected_id)
+# Under a cross-filter only the matching reviews are paged through
+matching_rows = bitmaps.matching_rows(selected_id, filters) if filters else None
+with perf.section("review page"):
+    page, next_cursor = store.review_page(selected_id, order, descending, after=cursors[-1], limit=REVIEW_PAGE_SIZE,
+                                          rows=matching_rows)
+n_reviews = len(matching_rows) if filters else end_row - first_row
+total_pages = max(1, -(-n_reviews // REVIEW_PAGE_SIZE))
+
+if page.empty:
+    st.warning("No reviews available.")
+else:
+    for _, row in page.iterrows():
+        # Rows are numbered by date within a movie, so this is the review's chronological number
+        with st.expander(f"Review {row['row'] - first_row + 1}"):
             st.write(f"**Sentiment:** {row['sentiment_label']} (Score: {row['sentiment_score']:.2f})")
             st.write(row['review'])
-else:
-    st.warning("Not enough reviews available.")
+
+col1, col2, col3 = st.columns([1, 2, 1])
+with col1:
+    st.button("⬅️ Previous", disabled=len(cursors) == 1, on_click=cursors.pop)
+with col2:
+    st.markdown(f"<div style='text-align: center'>Page {len(cursors)} of {total_pages}</div>", unsafe_allow_html=True)
+with col3:
+    st.button("Next ➡️", disabled=next_cursor is None, on_click=cursors.append, args=(next_cursor,))
+
+st.markdown("---")
+st.subheader("🔎 Search Reviews")
+search_text = st.text_input("Search review text", placeholder='e.g. "special effects" boring')
+col1, col2, col3, col4 = st.columns([1, 2, 1, 1])
+with col1:
+    scope = st.radio("Search in", ["This movie", "All movies"])
+with col2:
+    search_labels = st.multiselect("Sentiment", ["Positive", "Neutral", "Negative"])
+with col3:
+    search_start = st.date_input("From", value=None)
+with col4:
+    search_end = st.date_input("To", value=None)
+
+if search_text.strip():
+    # Answered by the full-text index built with the review store
+    with perf.section("review search"):
+        results = store.search_reviews(
+            search_text,
+            movie_id=selected_id if scope == "This movie" else None,
+            sentiment_labels=search_labels,
+            start=search_start.isoformat() if search_start else None,
+            end=search_end.isoformat() if search_end else None,
+        )
+    if results.empty:
+        st.write("No matching reviews.")
+    else:
+        st.caption(f"Showing the {len(results)} best matches.")
+        for _, row in results.iterrows():
+            date = row['date'].strftime('%Y-%m-%d') if pd.notnull(row['date']) else 'unknown date'
+            with st.expander(f"{title_index.title_for_id.get(row['id'], row['id'])} · {row['sentiment_label']} · {date}"):
+                st.write(f"**Sentiment:** {row['sentiment_label']} (Score: {row['sentiment_score']:.2f})")
+                st.write(row['review'])
+
+perf.finish_run()
@@ -0,0 +1,96 @@
+
+import streamlit as st
+import os
+
+import perf
+from movie_charts import DEFAULT_GRAIN, GRAIN_LABELS, get_genre_figures, get_genre_trend_figure, start_warm_up
+from movie_data import data_available, data_version, get_review_store
+
+perf.start_run("Genre Analytics")
+
+# Logo setup
+image_path = r"pages/images/TMBDLogo.png"
+if os.path.exists(image_path):
+    with st.sidebar:
+        st.image(image_path, width=150)
+else:
+    st.sidebar.warning("Logo not found.")
+st.sidebar.markdown("<b>Copyright to  <br> TMBD <br> Samira Jawish <br> Batoul Hamieh <br> Mohammad Sayyour</b>", unsafe_allow_html=True)
+
+DEFAULT_TREND_GENRES = 3
+
+
+def plotly_chart(fig):
+    with perf.section("plotly charts"):
+        st.plotly_chart(fig, use_container_width=True)
+
+
+# === File Check ===
+if not data_available():
+    st.error("Required files missing.")
+    st.stop()
+
+# === Load Data ===
+store = get_review_store()
+start_warm_up(store, data_version())
+
+st.title("🎭 Sentiment by Genre")
+st.markdown("How audiences feel about each genre. A movie counts towards every genre it is tagged with.")
+
+with perf.section("genre list"):
+    genres = store.genres()
+if genres.empty:
+    st.warning("No genre data in the movie info.")
+    perf.finish_run()
+    st.stop()
+
+# === Whole-catalog charts (precomputed per genre) ===
+figures = get_genre_figures(store, data_version())
+col1, col2 = st.columns([1, 1])
+with col1:
+    st.subheader("🥧 Sentiment Distribution")
+    if figures['distribution'] is not None:
+        plotly_chart(figures['distribution'])
+with col2:
+    st.subheader("📊 Average Sentiment")
+    if figures['mean'] is not None:
+        plotly_chart(figures['mean'])
+
+# === Trends for selected genres ===
+st.subheader("📈 Sentiment Trend")
+by_size = genres.sort_values('movies', ascending=False)['name'].tolist()
+selected = st.multiselect("Genres", genres['name'].tolist(), default=by_size[:DEFAULT_TREND_GENRES])
+col1, col2 = st.columns([2, 1])
+with col1:
+    grain = st.radio("Granularity", list(GRAIN_LABELS), index=list(GRAIN_LABELS).index(DEFAULT_GRAIN),
+                     format_func=GRAIN_LABELS.get, horizontal=True)
+with col2:
+    window = st.slider("Rolling window (periods)", min_value=1, max_value=12, value=1)
+
+if not selected:
+    st.info("Select at least one genre.")
+else:
+    trend_fig = get_genre_trend_figure(store, selected, grain, window, data_version())
+    if trend_fig is not None:
+        plotly_chart(trend_fig)
+    else:
+        st.write("No dated reviews for these genres.")
+
+    # === Movies in the selected genres (bitmask match) ===
+    st.subheader("🎬 Movies")
+    match_all = st.radio("Match", ["All selected genres", "Any selected genre"], horizontal=True) == "All selected genres"
+    with perf.section("genre movies"):
+        movies = store.movies_with_genres(store.genre_mask(selected), match_all=match_all)
+    if movies.empty:
+        st.write("No movie matches these genres.")
+    else:
+        st.caption(f"{len(movies)} movies")
+        st.dataframe(
+            movies.drop(columns='id').rename(columns={
+                'title': 'Movie', 'release_year': 'Release Year', 'user_score': 'User Score',
+                'n': 'Reviews', 'mean_score': 'Average Sentiment'
+            }),
+            hide_index=True, use_container_width=True
+        )
+
+perf.finish_run()
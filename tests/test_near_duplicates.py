@@ -0,0 +1,36 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Preprocessing"))
+from NearDuplicates import find_near_duplicates  # noqa: E402
+
+REVIEW = "this movie was an absolute masterpiece of modern cinema and i loved every minute of it"
+OTHER = "the plot dragged badly in the middle and the ending made no sense to anyone watching"
+
+
+def test_nothing_to_shingle():
+    # No review reaches MIN_TOKENS words, or there are no reviews at all
+    canonical, similarity = find_near_duplicates(["great movie", "loved it", "meh"])
+    assert canonical.tolist() == [0, 1, 2]
+    assert similarity.tolist() == [1.0, 1.0, 1.0]
+
+    canonical, similarity = find_near_duplicates([])
+    assert len(canonical) == 0 and len(similarity) == 0
+
+
+def test_single_review():
+    canonical, _ = find_near_duplicates([REVIEW])
+    assert canonical.tolist() == [0]
+
+
+def test_duplicate_points_at_first_copy():
+    canonical, similarity = find_near_duplicates([REVIEW, OTHER, REVIEW + " !"])
+    assert canonical.tolist() == [0, 1, 0]
+    assert similarity[2] == 1.0
+
+
+def test_groups_keep_copies_apart():
+    canonical, _ = find_near_duplicates([REVIEW, REVIEW], groups=np.array([0, 1]))
+    assert canonical.tolist() == [0, 1]
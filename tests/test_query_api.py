@@ -0,0 +1,57 @@
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "API"))
+from QueryAPI import QueryService  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def service(tmp_path_factory):
+    """A service over a copy of the bundled data where the first movie has no scores."""
+    workdir = tmp_path_factory.mktemp("api")
+    reviews = pd.read_csv(os.path.join(REPO_ROOT, "data", "analyzed_reviews_with_id.csv"))
+    movie_id = str(reviews['id'].iloc[0])
+    reviews.loc[reviews['id'].astype(str) == movie_id, 'sentiment_score'] = np.nan
+    reviews.to_csv(workdir / "analyzed_reviews_with_id.csv", index=False)
+    pd.read_csv(os.path.join(REPO_ROOT, "data", "movie_info_1.csv")).to_csv(workdir / "movie_info_1.csv", index=False)
+
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        yield QueryService(), movie_id, int((reviews['id'].astype(str) == movie_id).sum())
+    finally:
+        os.chdir(cwd)
+
+
+def get(service, target):
+    status, body, _ = service.handle(target)
+    return status, json.loads(body)
+
+
+@pytest.mark.parametrize("order", ["date", "score"])
+@pytest.mark.parametrize("descending", ["0", "1"])
+def test_next_cursor_round_trips(service, order, descending):
+    service, movie_id, n_reviews = service
+    target = f"/movies/{movie_id}/reviews?order={order}&descending={descending}&limit=7"
+    rows, cursor = [], None
+    while True:
+        status, body = get(service, target + (f"&after={cursor}" if cursor else ""))
+        assert status == 200, body
+        rows += [review['row'] for review in body['reviews']]
+        cursor = body['next']
+        if cursor is None:
+            break
+    assert len(rows) == len(set(rows)) == n_reviews
+
+
+def test_bad_cursor_is_rejected(service):
+    service, movie_id, _ = service
+    for cursor in ["not-a-cursor", "WzFd", "-1e+308,5"]:
+        status, _ = get(service, f"/movies/{movie_id}/reviews?order=score&after={cursor}")
+        assert status == 400